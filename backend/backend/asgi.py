@@ -3,6 +3,9 @@ ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+uvicorn 워커로 실행합니다. (비동기 뷰: services/async_views.py, users/async_views.py)
+    gunicorn backend.asgi:application -k uvicorn.workers.UvicornWorker -b 0.0.0.0:8000 --workers 3
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -14,3 +17,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_asgi_application()
+
+# backend/wsgi.py 와 같이 워커 시작 시 색인/블룸 필터를 미리 만들어 둡니다.
+from services.suggest import warm_up  # noqa: E402
+from users.blacklist import warm_up as warm_up_blacklist  # noqa: E402
+
+warm_up()
+warm_up_blacklist()
@@ -0,0 +1,51 @@
+# backend/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+# 캐시에 None 자체가 저장될 수 있으므로 "없음"을 구분하기 위한 표식
+MISSING = object()
+
+
+class LocalLRUCache:
+    """
+    워커(프로세스) 안에서만 쓰는 작은 LRU + TTL 캐시입니다.
+    gunicorn 워커마다 따로 존재하므로, 워커 간 일관성은 공유 캐시의 버전 키로 맞춥니다.
+    """
+
+    def __init__(self, maxsize=256, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
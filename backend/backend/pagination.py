@@ -0,0 +1,154 @@
+# backend/pagination.py
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import reduce
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _encode_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class KeysetPagination(BasePagination):
+    """
+    OFFSET/COUNT(*) 없이 "마지막으로 본 행의 정렬 키 다음부터" 가져오는 키셋(커서) 페이지네이션입니다.
+
+    - 정렬 순서는 쿼리셋의 order_by(예: ServiceFilter의 sort)를 그대로 따르고,
+      같은 값이 있어도 순서가 흔들리지 않도록 항상 pk를 마지막 정렬 키로 붙입니다.
+    - 커서는 정렬 필드와 마지막 행의 값을 base64로 감싼 불투명 문자열입니다.
+    - 기존 클라이언트 호환을 위해 ?cursor= 또는 ?page_size= 가 있을 때만 페이지를 나눕니다.
+    - 앞으로(next) 방향만 지원합니다. 정렬 키 값은 NULL이 아니어야 합니다.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 20
+    max_page_size = 100
+    invalid_cursor_message = '유효하지 않은 커서입니다.'
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """[(필드명, 내림차순 여부), ...] 형태로 정렬 키를 반환합니다."""
+        order_by = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        ordering = []
+        for field in order_by:
+            if not isinstance(field, str):
+                raise TypeError("KeysetPagination은 문자열 필드 정렬만 지원합니다.")
+            ordering.append((field.lstrip('-'), field.startswith('-')))
+
+        pk_name = queryset.model._meta.pk.name
+        if not any(name in (pk_name, 'pk') for name, _ in ordering):
+            ordering.append((pk_name, ordering[0][1] if ordering else False))
+        return ordering
+
+    def encode_cursor(self, ordering, row):
+        values = [_encode_value(reduce(getattr, name.split('__'), row)) for name, _ in ordering]
+        payload = {'o': [('-' if desc else '') + name for name, desc in ordering], 'v': values}
+        raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request, ordering):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            payload = json.loads(raw.decode('utf-8'))
+            signature = [('-' if desc else '') + name for name, desc in ordering]
+            if payload['o'] != signature or len(payload['v']) != len(ordering):
+                raise ValueError
+            return payload['v']
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def build_keyset_filter(self, ordering, values):
+        """(a, b, pk) > (va, vb, vpk) 를 방향을 고려해 Q 객체로 펼칩니다."""
+        condition = Q()
+        equal_prefix = Q()
+        for (name, desc), value in zip(ordering, values):
+            lookup = f'{name}__lt' if desc else f'{name}__gt'
+            condition |= equal_prefix & Q(**{lookup: value})
+            equal_prefix &= Q(**{name: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = self.get_ordering(queryset)
+        values = self.decode_cursor(request, ordering)
+
+        if values is not None:
+            queryset = queryset.filter(self.build_keyset_filter(ordering, values))
+        queryset = queryset.order_by(*[('-' if desc else '') + name for name, desc in ordering])
+
+        # 한 행을 더 가져와 다음 페이지 존재 여부를 COUNT 없이 판단합니다.
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        page = rows[:page_size]
+        self.next_cursor = self.encode_cursor(ordering, page[-1]) if self.has_next else None
+        return page
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': '이전 응답의 next 링크에 포함된 커서 값',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'페이지 크기 (최대 {self.max_page_size})',
+                'schema': {'type': 'integer'},
+            },
+        ]
@@ -63,7 +63,8 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # simplejwt JWTAuthentication + 워커별 사용자 캐시 (users/authentication.py)
+        "users.authentication.CachedJWTAuthentication",
     ),
     # 프로젝트 기본 권한 : AllowAny (필요 시 수정 해주세요.)
     "DEFAULT_PERMISSION_CLASSES": (
@@ -98,6 +99,10 @@ SIMPLE_JWT = {
     "UPDATE_LAST_LOGIN": False,
     'USER_ID_FIELD': 'user_id',
     'USER_ID_CLAIM': 'user_id',
+    # 블랙리스트를 블룸 필터 + 공유 캐시로 확인하는 refresh 직렬화기 (users/blacklist.py)
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.TokenRefreshSerializer',
+    # 토큰 발급 시간까지 로그인 단계별로 측정하는 로그인 직렬화기 (users/metrics.py)
+    'TOKEN_OBTAIN_SERIALIZER': 'users.serializers.TokenObtainPairSerializer',
 }
 
 MIDDLEWARE = [
@@ -164,6 +169,107 @@ DATABASES = {
 }
 
 
+# Cache
+# REDIS_URL이 있으면 워커들이 함께 쓰는 Redis 캐시, 없으면(로컬/테스트) 프로세스 메모리 캐시
+REDIS_URL = os.getenv("REDIS_URL")
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'guava',
+    }
+}
+
+# 카탈로그(서비스/요금제/카드/통신사) 읽기 API 캐시 설정 (services/cache.py)
+CATALOG_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 60 * 10,      # 공유 캐시 보관 시간(초)
+    'LOCAL_MAXSIZE': 256,    # 워커 내부 LRU 최대 항목 수
+    'LOCAL_TTL': 30,         # 워커 내부 LRU 보관 시간(초)
+}
+
+
+# JWT 인증 사용자 캐시 (users/authentication.py). 사용자 변경/로그아웃 시 버전 키로 즉시 무효화됩니다.
+AUTH_USER_CACHE = {
+    'LOCAL_MAXSIZE': 1024,   # 워커 내부 LRU 최대 사용자 수
+    'LOCAL_TTL': 60,         # 워커 내부 보관 시간(초)
+}
+
+
+# refresh 토큰 블랙리스트 조회 캐시 (users/blacklist.py)
+TOKEN_BLACKLIST_CACHE = {
+    'BLOOM_CAPACITY': 100_000,   # 워커별 블룸 필터 최소 크기(JTI 수)
+    'ERROR_RATE': 0.001,         # 블룸 필터 오탐률 (오탐이면 공유 캐시/DB로 확인)
+    # 캐시가 모든 워커에 공유되는지. None이면 백엔드로 판단 (LocMemCache면 블룸 필터 없이 매번 DB 확인)
+    'SHARED_CACHE': None,
+}
+
+
+# 소셜 로그인 제공자 호출 설정 (users/social_providers.py). 주소는 기본값(실제 제공자)을 그대로 씁니다.
+SOCIAL_AUTH = {
+    'GOOGLE_CLIENT_IDS': [v for v in os.getenv("GOOGLE_CLIENT_IDS", "").split(",") if v],  # id_token aud 검증 (비어 있으면 Google 로그인 거부)
+    'CONNECT_TIMEOUT': 3,     # 초
+    'READ_TIMEOUT': 5,        # 초
+    'RETRIES': 2,             # 연결 오류/502/503/504 재시도 횟수 (지수 백오프)
+    'BACKOFF_FACTOR': 0.3,
+    'POOL_MAXSIZE': 10,       # 제공자 호스트당 유지하는 연결 수
+}
+
+
+# PDF 리포트 비동기 생성 설정 (subscriptions/reports.py)
+SUBSCRIPTION_REPORTS = {
+    # 구독 상태 해시로 저장되는 PDF 캐시 위치 (nginx가 공개하는 media 밖에 둡니다)
+    'DIR': BASE_DIR / 'var' / 'reports',
+    'MAX_WORKERS': 2,                       # gunicorn 워커당 렌더링 프로세스 수
+    'WAIT_SECONDS': 1,                      # export_pdf가 렌더링 완료를 기다리는 최대 시간 (1초 이하)
+}
+
+
+# 메일 발송 (결제 예정 알림). 운영에서는 EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "True").lower() == "true"
+EMAIL_TIMEOUT = 10
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "Guava <no-reply@guava.local>")
+
+# 결제 예정 알림 설정 (subscriptions/notifications.py, manage.py send_payment_notifications)
+SUBSCRIPTION_NOTIFICATIONS = {
+    'DAYS_AHEAD': 3,        # 오늘부터 며칠 안의 결제일을 알릴지
+    'BATCH_SIZE': 500,      # 한 번에 읽고 발송하는 사용자 수
+    'MAX_WORKERS': 4,       # 동시에 메일을 보내는 스레드 수
+}
+
+
+# 비밀번호 해시 (users/hashers.py, users/passwords.py)
+# PASSWORD_HASHER=argon2(기본) 또는 scrypt. 나머지 해셔는 기존 해시 검증용이며, 로그인 성공 시 기본 해셔로 다시 해시합니다.
+PASSWORD_HASHING = {
+    'ALGORITHM': os.getenv("PASSWORD_HASHER", "argon2"),
+    'ARGON2_TIME_COST': 2,
+    'ARGON2_MEMORY_COST': 64 * 1024,   # KiB (해시 1회당 64MB)
+    'ARGON2_PARALLELISM': 2,
+    'SCRYPT_WORK_FACTOR': 2 ** 14,
+    'MAX_CONCURRENT': 2,               # 프로세스당 동시에 계산하는 해시 수 (sync 워커는 워커 수가 상한)
+    'ACQUIRE_TIMEOUT': 0.5,            # 해시 차례를 기다리는 최대 시간(초). 넘으면 계산하지 않고 429
+}
+
+_PREFERRED_HASHERS = {
+    'argon2': 'users.hashers.TunedArgon2PasswordHasher',
+    'scrypt': 'users.hashers.TunedScryptPasswordHasher',
+}
+PASSWORD_HASHERS = [_PREFERRED_HASHERS[PASSWORD_HASHING['ALGORITHM']]] + [
+    hasher for hasher in _PREFERRED_HASHERS.values() if hasher != _PREFERRED_HASHERS[PASSWORD_HASHING['ALGORITHM']]
+] + [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
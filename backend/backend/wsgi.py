@@ -14,3 +14,13 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# 워커마다 자동완성 색인을 미리 메모리에 올려 둡니다. (services/suggest.py)
+from services.suggest import warm_up  # noqa: E402
+
+warm_up()
+
+# 토큰 블랙리스트 블룸 필터도 워커 시작 시 만들어 둡니다. (users/blacklist.py)
+from users.blacklist import warm_up as warm_up_blacklist  # noqa: E402
+
+warm_up_blacklist()
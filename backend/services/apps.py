@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'services'
+
+    def ready(self):
+        # Plan 변경 시 요금 요약을 갱신하는 시그널 등록
+        from . import signals  # noqa: F401
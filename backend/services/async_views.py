@@ -0,0 +1,68 @@
+# services/async_views.py
+"""
+I/O 대기가 대부분인 카탈로그/비교 조회의 비동기 뷰 (ASGI, uvicorn 워커에서 실행)
+
+- 동기 뷰(services/views.py)와 같은 파라미터, 같은 응답 형식, 같은 캐시 키/ETag를 씁니다.
+  어느 쪽이 먼저 채운 캐시든 함께 쓰고, 캐시 조회(Redis)와 DB 조회는 이벤트 루프를 막지 않습니다.
+- DRF는 비동기 뷰를 지원하지 않으므로 일반 Django 비동기 뷰입니다. 조회 전용·AllowAny라 인증은 필요 없지만
+  DRF 쓰로틀은 적용되지 않으니, 운영에서는 프록시(nginx limit_req 등)에서 요청 수를 제한합니다.
+- WSGI(runserver/gunicorn sync)에서도 동작은 하지만 요청마다 스레드를 오가므로 이득이 없습니다.
+"""
+from django.views.decorators.http import require_GET
+
+from .cache import aconditional_cached_response, json_response
+from .comparison import build_matrix, compare_request_ids, matrix_request_ids, services_queryset
+from .models import Service, Card, Telecom
+from .serializers import ServiceDetailSerializer, CardSerializer, TelecomSerializer
+
+
+async def _fetch(queryset):
+    return [obj async for obj in queryset]
+
+
+@require_GET
+async def comparison(request):
+    """ComparisonView의 비동기 버전. URL: /api/async/services/compare/"""
+    try:
+        service_ids = compare_request_ids(request.GET)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status=400)
+
+    async def render():
+        services = await _fetch(Service.objects.filter(pk__in=service_ids).prefetch_related('plans'))
+        return ServiceDetailSerializer(services, many=True).data
+
+    params = {'ids': ','.join(str(i) for i in service_ids)}
+    return await aconditional_cached_response(request, 'compare', params, None, render)
+
+
+@require_GET
+async def comparison_matrix(request):
+    """ComparisonMatrixView의 비동기 버전. URL: /api/async/services/compare/matrix/"""
+    try:
+        kind, ids = matrix_request_ids(request.GET)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status=400)
+
+    async def render():
+        return build_matrix(await _fetch(services_queryset(**{kind: ids})))
+
+    params = {kind: ','.join(str(i) for i in ids)}
+    return await aconditional_cached_response(request, 'compare:matrix', params, None, render)
+
+
+def _catalog_list(scope, model, serializer_class):
+    """CatalogCacheMixin.list와 같은 키(scope:list + 쿼리 파라미터)로 캐시하는 목록 뷰를 만듭니다."""
+
+    @require_GET
+    async def view(request):
+        async def render():
+            return serializer_class(await _fetch(model.objects.all()), many=True).data
+
+        return await aconditional_cached_response(request, f'{scope}:list', request.GET, {}, render)
+
+    return view
+
+
+card_list = _catalog_list('cards', Card, CardSerializer)
+telecom_list = _catalog_list('telecoms', Telecom, TelecomSerializer)
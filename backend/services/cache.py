@@ -0,0 +1,207 @@
+# services/cache.py
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from backend.cache import LocalLRUCache, MISSING
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+_config = getattr(settings, 'CATALOG_CACHE', {})
+# 1차: 워커 내부 LRU / 2차: 모든 워커가 함께 쓰는 Django 캐시(운영은 Redis)
+local_cache = LocalLRUCache(
+    maxsize=_config.get('LOCAL_MAXSIZE', 256),
+    ttl=_config.get('LOCAL_TTL', 30),
+)
+
+
+def shared_cache():
+    return caches[_config.get('ALIAS', 'default')]
+
+
+def get_catalog_version():
+    """
+    현재 카탈로그 버전을 반환합니다.
+    버전은 마지막 변경 시각(밀리초)이므로 Last-Modified 계산에도 그대로 쓸 수 있습니다.
+    """
+    cache = shared_cache()
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+async def aget_catalog_version():
+    """get_catalog_version()의 비동기 버전 (비동기 뷰용)"""
+    cache = shared_cache()
+    version = await cache.aget(CATALOG_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CATALOG_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = await cache.aget(CATALOG_VERSION_KEY)
+    return version
+
+
+def _bump():
+    cache = shared_cache()
+    current = cache.get(CATALOG_VERSION_KEY) or 0
+    cache.set(CATALOG_VERSION_KEY, max(int(time.time() * 1000), current + 1), timeout=None)
+
+
+def bump_catalog_version():
+    """
+    Service/Plan/Card/Telecom이 바뀌면 호출합니다. 버전이 바뀌면 모든 워커의 캐시 키가 달라집니다.
+    커밋 전에 다른 요청이 옛 데이터를 새 버전으로 다시 채우지 않도록 커밋 후에 한 번 더 올립니다.
+    """
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def catalog_cache_key(scope, params=None, kwargs=None, version=None):
+    """쿼리 파라미터 순서/중복과 상관없이 같은 요청이면 같은 키가 나오도록 정규화합니다."""
+    if version is None:
+        version = get_catalog_version()
+    parts = [scope]
+    if kwargs:
+        parts += [f'{k}={v}' for k, v in sorted(kwargs.items())]
+    if params:
+        for name in sorted(params.keys()):
+            values = params.getlist(name) if hasattr(params, 'getlist') else [params[name]]
+            parts.append(f"{name}={','.join(sorted(str(v) for v in values))}")
+    digest = hashlib.sha1('&'.join(parts).encode('utf-8')).hexdigest()
+    return f'catalog:{version}:{scope}:{digest}'
+
+
+def get_cached(key):
+    value = local_cache.get(key)
+    if value is not MISSING:
+        return value
+    value = shared_cache().get(key, MISSING)
+    if value is not MISSING:
+        local_cache.set(key, value)
+    return value
+
+
+def set_cached(key, value):
+    local_cache.set(key, value)
+    shared_cache().set(key, value, timeout=_config.get('TIMEOUT', 600))
+
+
+async def aget_cached(key):
+    value = local_cache.get(key)
+    if value is not MISSING:
+        return value
+    value = await shared_cache().aget(key, MISSING)
+    if value is not MISSING:
+        local_cache.set(key, value)
+    return value
+
+
+async def aset_cached(key, value):
+    local_cache.set(key, value)
+    await shared_cache().aset(key, value, timeout=_config.get('TIMEOUT', 600))
+
+
+def catalog_validators(request, cache_key, version, media_type=None):
+    """
+    카탈로그 버전으로 ETag/Last-Modified를 만듭니다. DB를 조회하지 않습니다.
+    같은 URL이라도 응답 형식(JSON/브라우저블 API)이 다르면 ETag도 달라야 하므로 미디어 타입을 포함합니다.
+    """
+    if media_type is None:
+        media_type = getattr(request, 'accepted_media_type', '') or ''
+    etag = quote_etag(hashlib.sha1(f'{cache_key}:{media_type}'.encode('utf-8')).hexdigest())
+    return f'W/{etag}', version // 1000
+
+
+def not_modified_or_none(request, etag, last_modified):
+    """If-None-Match / If-Modified-Since가 일치하면 304 응답을, 아니면 None을 반환합니다."""
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    # 브라우저가 캐시된 응답을 쓰기 전에 항상 재검증(304)하도록 합니다.
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def conditional_cached_response(request, scope, params, kwargs, render):
+    """
+    조건부 요청 확인 → 캐시 조회 → 직렬화 순서로 처리합니다.
+    render()는 캐시에 넣을 응답 데이터를 반환하는 함수입니다. (Response를 반환하면 그대로 사용)
+    """
+    version = get_catalog_version()
+    key = catalog_cache_key(scope, params, kwargs, version=version)
+    etag, last_modified = catalog_validators(request, key, version)
+
+    not_modified = not_modified_or_none(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    data = get_cached(key)
+    if data is not MISSING:
+        return set_validators(Response(data), etag, last_modified)
+
+    response = render()
+    if not isinstance(response, Response):
+        response = Response(response)
+    if response.status_code == 200:
+        set_cached(key, response.data)
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def json_response(data, status=200):
+    """DRF JSONRenderer와 같은 형식(한글 그대로, 공백 없는 구분자)의 JSON 응답 (비동기 뷰용)"""
+    return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder,
+                        json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')})
+
+
+async def aconditional_cached_response(request, scope, params, kwargs, render):
+    """
+    conditional_cached_response()의 비동기 버전입니다. 동기 뷰와 같은 캐시 키/ETag를 쓰므로 캐시를 함께 씁니다.
+    render()는 캐시에 넣을 데이터를 반환하는 코루틴 함수이고, HttpResponse를 반환하면 캐시하지 않고 그대로 돌려줍니다.
+    """
+    version = await aget_catalog_version()
+    key = catalog_cache_key(scope, params, kwargs, version=version)
+    etag, last_modified = catalog_validators(request, key, version, media_type='application/json')
+
+    not_modified = not_modified_or_none(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    data = await aget_cached(key)
+    if data is MISSING:
+        data = await render()
+        if isinstance(data, HttpResponse):
+            return data
+        await aset_cached(key, data)
+    return set_validators(json_response(data), etag, last_modified)
+
+
+class CatalogCacheMixin:
+    """
+    읽기 전용 카탈로그 ViewSet의 list/retrieve 응답 데이터를 캐시하고
+    ETag/Last-Modified 조건부 요청(304)을 처리합니다.
+    catalog_cache_scope를 지정해 뷰마다 키 공간을 나눕니다.
+    """
+    catalog_cache_scope = None
+
+    def cached_response(self, request, action, render):
+        return conditional_cached_response(
+            request, f'{self.catalog_cache_scope}:{action}', request.query_params, self.kwargs, render)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, 'list', lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, 'retrieve', lambda: super(CatalogCacheMixin, self).retrieve(request, *args, **kwargs))
@@ -0,0 +1,147 @@
+# services/comparison.py
+"""
+서비스/요금제 비교 매트릭스를 만듭니다.
+
+- 서비스 id 또는 요금제 id를 명시적으로 받아, 요금제는 prefetch 한 번으로 함께 가져옵니다.
+- 요금제마다 월 환산 가격, 서비스별 최저가 요금제, 전체 최저가, 혜택(benefits) 겹침을 미리 계산해 둡니다.
+- 결과는 정렬된 id 집합을 키로 카탈로그 캐시(services/cache.py)에 저장됩니다.
+"""
+import re
+
+from django.db.models import Prefetch
+
+from .models import Service, Plan
+from .pricing import monthly_price
+
+MAX_SERVICES = 5
+MAX_PLANS = 10
+
+_benefit_split_re = re.compile(r'[,\n·]')
+
+
+class TooManyIdsError(ValueError):
+    """비교 대상이 최대 개수를 넘는 요청. 뷰에서 다른 ValueError와 같이 400 응답으로 바뀝니다."""
+
+
+def parse_ids(raw, limit):
+    """
+    '3,1,3' → [1, 3] (중복 제거/정렬). 숫자가 아니면 ValueError,
+    중복을 뺀 id가 limit개를 넘으면 잘라내지 않고 TooManyIdsError
+    """
+    try:
+        ids = {int(value) for value in raw.split(',') if value.strip()}
+    except ValueError:
+        raise ValueError("Invalid ID format")
+    if len(ids) > limit:
+        raise TooManyIdsError(f"최대 {limit}개까지 비교할 수 있습니다. (요청 {len(ids)}개)")
+    return sorted(ids)
+
+
+def compare_request_ids(query_params):
+    """
+    /services/compare/ 파라미터에서 서비스 id 목록을 꺼냅니다. 잘못된 요청이면 응답 메시지를 담은 ValueError
+    프론트는 서비스 id를 plan_id/ids 두 이름으로 함께 보내므로 모두 서비스 id로 받습니다.
+    """
+    ids_str = (query_params.get('service_ids') or query_params.get('ids')
+               or query_params.get('plan_id', ''))
+    if not ids_str:
+        raise ValueError("No service IDs provided")
+    return parse_ids(ids_str, MAX_SERVICES)
+
+
+def matrix_request_ids(query_params):
+    """/services/compare/matrix/ 파라미터 → ('service_ids' 또는 'plan_ids', id 목록). 잘못된 요청이면 ValueError"""
+    service_ids_str = query_params.get('service_ids', '')
+    plan_ids_str = query_params.get('plan_ids', '')
+    if bool(service_ids_str) == bool(plan_ids_str):
+        raise ValueError("service_ids 또는 plan_ids 중 하나만 보내주세요.")
+    if plan_ids_str:
+        return 'plan_ids', parse_ids(plan_ids_str, MAX_PLANS)
+    return 'service_ids', parse_ids(service_ids_str, MAX_SERVICES)
+
+
+def split_benefits(text):
+    """혜택 문자열("광고 없음, 4K 화질")을 항목 목록으로 나눕니다. (프론트와 같은 쉼표 기준 + 줄바꿈)"""
+    return [item.strip() for item in _benefit_split_re.split(text or '') if item.strip()]
+
+
+def load_services(service_ids=None, plan_ids=None):
+    """
+    비교 대상 서비스와 요금제를 쿼리 2번(서비스 1 + 요금제 prefetch 1)으로 가져옵니다.
+    plan_ids가 있으면 해당 요금제와 그 요금제가 속한 서비스만 대상으로 합니다.
+    """
+    return list(services_queryset(service_ids, plan_ids))
+
+
+def services_queryset(service_ids=None, plan_ids=None):
+    """load_services()의 쿼리셋. 비동기 뷰는 [s async for s in qs]로 같은 쿼리를 실행합니다."""
+    plans = Plan.objects.order_by('price', 'pk')
+    if plan_ids is not None:
+        plans = plans.filter(pk__in=plan_ids)
+        services = Service.objects.filter(pk__in=Plan.objects.filter(pk__in=plan_ids).values('service_id'))
+    else:
+        services = Service.objects.filter(pk__in=service_ids)
+    return services.order_by('pk').prefetch_related(Prefetch('plans', queryset=plans))
+
+
+def build_matrix(services):
+    plan_rows = []
+    service_rows = []
+    for service in services:
+        plans = []
+        for plan in service.plans.all():
+            row = {
+                'id': plan.id,
+                'service_id': service.id,
+                'plan_name': plan.plan_name,
+                'billing_cycle': plan.billing_cycle,
+                'price': plan.price,
+                'monthly_price': monthly_price(plan.price, plan.billing_cycle),
+                'benefits': split_benefits(plan.benefits),
+            }
+            plans.append(row)
+        cheapest = min(plans, key=lambda row: (row['monthly_price'], row['id']), default=None)
+        service_rows.append({
+            'id': service.id,
+            'name': service.name,
+            'category': service.category,
+            'official_link': service.official_link,
+            'cheapest_plan_id': cheapest and cheapest['id'],
+            'min_monthly_price': cheapest and cheapest['monthly_price'],
+            'plans': plans,
+        })
+        plan_rows += plans
+
+    overall = min(plan_rows, key=lambda row: (row['monthly_price'], row['id']), default=None)
+    return {
+        'services': service_rows,
+        'cheapest': overall and {
+            'service_id': overall['service_id'],
+            'plan_id': overall['id'],
+            'monthly_price': overall['monthly_price'],
+        },
+        **_benefit_overlap(plan_rows),
+    }
+
+
+def _benefit_overlap(plan_rows):
+    """
+    혜택 항목별로 어떤 요금제/서비스가 제공하는지 묶습니다. (대소문자/공백 차이는 같은 항목으로 봄)
+    common_benefits: 비교한 모든 요금제가 제공하는 항목
+    """
+    benefits = {}
+    for row in plan_rows:
+        for name in row['benefits']:
+            key = ' '.join(name.casefold().split())
+            entry = benefits.setdefault(key, {'name': name, 'plan_ids': [], 'service_ids': []})
+            if row['id'] not in entry['plan_ids']:
+                entry['plan_ids'].append(row['id'])
+            if row['service_id'] not in entry['service_ids']:
+                entry['service_ids'].append(row['service_id'])
+
+    rows = sorted(benefits.values(), key=lambda entry: (-len(entry['plan_ids']), entry['name']))
+    return {
+        'benefits': rows,
+        'common_benefits': [entry['name'] for entry in rows
+                            if plan_rows and len(entry['plan_ids']) == len(plan_rows)],
+    }
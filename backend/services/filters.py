@@ -1,15 +1,49 @@
 # services/filters.py
-from django.db.models import Q
+from django.db.models import Q, Case, When, Value, IntegerField, Exists, OuterRef
 from django_filters import rest_framework as filters
-from .models import Service
+from .models import Service, Plan
+from .search import normalize_words, search_services
+
+
+def plans_in_price_range(min_price=None, max_price=None):
+    """
+    월 환산 가격이 [min_price, max_price] 안에 드는 요금제 조건.
+    연간 요금제는 price를 12로 나누는 대신 경계값에 12를 곱해 비교하므로 (service_id, price) 인덱스를 탈 수 있습니다.
+    """
+    monthly_q = ~Q(billing_cycle='year')
+    yearly_q = Q(billing_cycle='year')
+    if min_price is not None:
+        monthly_q &= Q(price__gte=min_price)
+        yearly_q &= Q(price__gte=min_price * 12)  # 연간 가격으로 환산
+    if max_price is not None:
+        monthly_q &= Q(price__lte=max_price)
+        yearly_q &= Q(price__lte=max_price * 12)  # 연간 가격으로 환산
+    return monthly_q | yearly_q
+
+
+def filter_by_price_range(queryset, min_price=None, max_price=None):
+    """
+    plans를 JOIN 하면 서비스 행이 요금제 수만큼 늘어나 DISTINCT가 필요하므로,
+    EXISTS 서브쿼리로 "조건에 맞는 요금제가 하나라도 있는 서비스"만 남깁니다.
+    service_price_summary(서비스당 1행)의 최소/최대값으로 범위가 겹치지 않는 서비스는 먼저 걸러냅니다.
+    요약 행이 아직 없는 서비스(새로 넣었거나 시그널 없이 저장된 경우)는 거르지 않고 EXISTS로만 판단합니다.
+    """
+    if min_price is None and max_price is None:
+        return queryset
+    summary_q = Q()
+    if min_price is not None:
+        summary_q &= Q(price_summary__max_monthly_price__gte=min_price)
+    if max_price is not None:
+        summary_q &= Q(price_summary__min_monthly_price__lte=max_price)
+    matching_plans = Plan.objects.filter(plans_in_price_range(min_price, max_price), service=OuterRef('pk'))
+    return queryset.filter(Q(price_summary__isnull=True) | summary_q, Exists(matching_plans))
 
 
 class ServiceFilter(filters.FilterSet):
-    # 1. 'q' 파라미터를 'name' 필드 검색에 사용하도록 연결
-    q = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    # 1. 'q' 파라미터: 서비스 이름/설명, 요금제 이름/혜택을 n-gram 색인으로 검색 (services/search.py)
+    q = filters.CharFilter(method='filter_by_search')
     categories = filters.BaseInFilter(method='filter_by_categories')
-    # 2. 'min_price'와 'max_price' 파라미터로 가격 범위 필터링
-    #    field_name="plans__price"는 Service 모델과 연결된 Plan 모델의 price 필드를 의미
+    # 2. 'min_price'와 'max_price' 파라미터로 월 환산 가격 범위 필터링 (EXISTS 서브쿼리, DISTINCT 없음)
     min_price = filters.NumberFilter(method='filter_by_monthly_price')
     max_price = filters.NumberFilter(method='filter_by_monthly_price')
 
@@ -18,33 +52,33 @@ class ServiceFilter(filters.FilterSet):
         # 프론트엔드에서 사용할 정렬 옵션 정의
         # ('DB 필드명', '프론트엔드에서 사용할 이름')
         fields=(
-            ('plans__price', 'price'),  # ?sort=price 또는 ?sort=-price (오름/내림차순)
+            # 월 환산 최저가(ServiceViewSet의 min_price) 기준. 서비스당 한 행이라 중복이 생기지 않습니다.
+            ('min_price', 'price'),  # ?sort=price 또는 ?sort=-price (오름/내림차순)
             ('name', 'name'),  # ?sort=name 또는 ?sort=-name
+            ('id', 'id'),  # ?sort=id 또는 ?sort=-id
         )
     )
 
+    def filter_by_search(self, queryset, name, value):
+        if not normalize_words(value):
+            return queryset
+        # 키셋 페이지네이션이 끝까지 넘길 수 있도록 일치하는 서비스를 자르지 않고 모두 받습니다.
+        ranked = search_services(value)
+        if not ranked:
+            return queryset.none()
+        # 정렬(sort)을 따로 지정하지 않으면 관련도 순. 키셋 페이지네이션이 쓸 수 있도록 순위를 컬럼으로 둡니다.
+        rank = Case(*[When(pk=pk, then=Value(position)) for position, pk in enumerate(ranked)],
+                    output_field=IntegerField())
+        return queryset.filter(pk__in=ranked).annotate(search_rank=rank).order_by('search_rank', 'id')
+
     def filter_by_monthly_price(self, queryset, name, value):
         # 'name'은 'min_price' 또는 'max_price'가 됩니다.
-        # 'value'는 사용자가 입력한 가격입니다.
-
-        # Q 객체를 사용해 복잡한 OR 조건을 만듭니다.
-        # 조건 1: 월간 요금제(month)가 가격 범위에 맞는 경우
-        monthly_q = Q(plans__billing_cycle='month')
-
-        # 조건 2: 연간 요금제(year)의 '월 환산 가격'이 범위에 맞는 경우
-        yearly_q = Q(plans__billing_cycle='year')
-
-        if name == 'min_price':
-            monthly_q &= Q(plans__price__gte=value)
-            yearly_q &= Q(plans__price__gte=value * 12)  # 연간 가격으로 환산
-
-        elif name == 'max_price':
-            monthly_q &= Q(plans__price__lte=value)
-            yearly_q &= Q(plans__price__lte=value * 12)  # 연간 가격으로 환산
-
-        # 3. (월간 요금제가 맞거나 OR 연간 요금제가 맞거나)
-        # .distinct()로 중복된 서비스가 나오지 않게 합니다.
-        return queryset.filter(monthly_q | yearly_q).distinct()
+        # 두 값이 함께 오면 "한 요금제"가 범위 안에 들어야 하므로 min_price 쪽에서 한 번에 처리합니다.
+        min_price = self.form.cleaned_data.get('min_price')
+        max_price = self.form.cleaned_data.get('max_price')
+        if name == 'max_price' and min_price is not None:
+            return queryset
+        return filter_by_price_range(queryset, min_price, max_price)
 
     def filter_by_categories(self, queryset, name, value_list):
         # value_list는 프론트에서 보낸 ['ott', 'music'] 배열입니다.
@@ -52,11 +86,12 @@ class ServiceFilter(filters.FilterSet):
             return queryset
 
         # 💡 대소문자를 무시하는 Q 객체를 동적으로 생성하여 OR 검색
+        # category는 service 테이블 컬럼이라 JOIN이 없으므로 distinct()가 필요 없습니다.
         query = Q()
         for value in value_list:
             query |= Q(category__iexact=value)  # 'iexact'로 대소문자 무시
 
-        return queryset.filter(query).distinct()
+        return queryset.filter(query)
 
     class Meta:
         model = Service
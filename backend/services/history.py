@@ -0,0 +1,133 @@
+# services/history.py
+"""
+요금제 가격 이력 기록/조회/정리
+
+- 기록: Plan 저장 시그널과 import_catalog(bulk)가 가격 또는 결제 주기가 바뀐 요금제만 한 행씩 추가합니다.
+- 조회: 가격은 바뀐 시점에만 값이 있는 계단형 시계열이므로, 구간을 points개로 나눠
+  구간마다 마지막 값과 최소/최대값만 남기는 방식으로 다운샘플링합니다.
+- 정리: 같은 가격/결제 주기가 연달아 기록된 행은 첫 행만 남기고 지웁니다. (compact_price_history)
+"""
+from decimal import Decimal
+
+from django.utils import timezone
+
+from .models import PlanPriceHistory
+from .pricing import monthly_price
+
+DEFAULT_POINTS = 100
+MAX_POINTS = 500
+COMPACT_BATCH_SIZE = 1000
+
+
+def record_price_changes(plans, previous=None, recorded_at=None):
+    """
+    plans 중 previous({plan_id: (price, billing_cycle)})와 비교해 바뀐(또는 새로 생긴) 요금제의 이력을 추가합니다.
+    previous를 넘기지 않으면 모두 새 요금제로 보고 기록합니다.
+    """
+    previous = previous or {}
+    recorded_at = recorded_at or timezone.now()
+    rows = []
+    for plan in plans:
+        # 관리자/폼에서 저장하면 price가 문자열·정수일 수 있으므로 Decimal로 맞춰 비교
+        price = Decimal(str(plan.price))
+        if previous.get(plan.pk) != (price, plan.billing_cycle):
+            rows.append(PlanPriceHistory(plan_id=plan.pk, price=price, billing_cycle=plan.billing_cycle,
+                                         recorded_at=recorded_at))
+    if rows:
+        PlanPriceHistory.objects.bulk_create(rows)
+    return len(rows)
+
+
+def _point(recorded_at, price, billing_cycle, low=None, high=None):
+    monthly = monthly_price(price, billing_cycle)
+    return {
+        'recorded_at': recorded_at,
+        'price': price,
+        'billing_cycle': billing_cycle,
+        'monthly_price': monthly,
+        'min_monthly_price': monthly if low is None else low,
+        'max_monthly_price': monthly if high is None else high,
+    }
+
+
+def price_timeline(plan, start=None, end=None, points=DEFAULT_POINTS):
+    """
+    [start, end] 구간의 가격 시계열을 최대 points개로 반환합니다.
+    (plan, recorded_at) 인덱스로 구간 안의 행과, 구간 시작 시점에 유효했던 직전 행 하나만 읽습니다.
+    """
+    points = max(1, min(points, MAX_POINTS))
+    history = PlanPriceHistory.objects.filter(plan=plan)
+    fields = ('recorded_at', 'price', 'billing_cycle')
+
+    rows = history
+    if start is not None:
+        rows = rows.filter(recorded_at__gte=start)
+    if end is not None:
+        rows = rows.filter(recorded_at__lte=end)
+    rows = list(rows.order_by('recorded_at', 'pk').values_list(*fields))
+
+    if start is not None:
+        before = history.filter(recorded_at__lt=start).order_by('-recorded_at', '-pk').values_list(*fields).first()
+        if before is not None:
+            rows.insert(0, (start, before[1], before[2]))
+
+    if not rows and not history.exists():
+        # 이력 기능 이전부터 있던 요금제는 현재 값을 한 점으로 보여 줍니다.
+        rows = [(plan.updated_at, plan.price, plan.billing_cycle)]
+
+    if len(rows) <= points:
+        return [_point(*row) for row in rows]
+    return _downsample(rows, points)
+
+
+def _downsample(rows, points):
+    """시간 구간을 points개로 나누고 구간마다 마지막 값과 최소/최대 월 환산 가격을 남깁니다."""
+    first, last = rows[0][0], rows[-1][0]
+    width = (last - first) / points
+    buckets = {}
+    for recorded_at, price, billing_cycle in rows:
+        index = min(int((recorded_at - first) / width), points - 1) if width else 0
+        monthly = monthly_price(price, billing_cycle)
+        bucket = buckets.get(index)
+        if bucket is None:
+            buckets[index] = [recorded_at, price, billing_cycle, monthly, monthly]
+        else:
+            bucket[:3] = recorded_at, price, billing_cycle
+            bucket[3] = min(bucket[3], monthly)
+            bucket[4] = max(bucket[4], monthly)
+    return [_point(*buckets[index]) for index in sorted(buckets)]
+
+
+def compact_price_history(batch_size=COMPACT_BATCH_SIZE, dry_run=False):
+    """
+    요금제별로 같은 (가격, 결제 주기)가 연달아 기록된 행을 첫 행만 남기고 지웁니다.
+    요금제 id 순으로 batch_size개씩 끊어서 읽고 지우므로 테이블이 커도 메모리 사용량이 일정합니다.
+    반환값: (검사한 행 수, 지운 행 수)
+    """
+    scanned = deleted = 0
+    last_plan_id = 0
+    while True:
+        plan_ids = list(
+            PlanPriceHistory.objects.filter(plan_id__gt=last_plan_id).order_by('plan_id')
+            .values_list('plan_id', flat=True).distinct()[:batch_size]
+        )
+        if not plan_ids:
+            return scanned, deleted
+
+        redundant = []
+        previous = None
+        rows = (PlanPriceHistory.objects.filter(plan_id__in=plan_ids)
+                .order_by('plan_id', 'recorded_at', 'pk')
+                .values_list('pk', 'plan_id', 'price', 'billing_cycle'))
+        for pk, plan_id, price, billing_cycle in rows.iterator(chunk_size=batch_size):
+            scanned += 1
+            key = (plan_id, price, billing_cycle)
+            if key == previous:
+                redundant.append(pk)
+            previous = key
+
+        if not dry_run:
+            for start in range(0, len(redundant), batch_size):
+                PlanPriceHistory.objects.filter(pk__in=redundant[start:start + batch_size]).delete()
+        deleted += len(redundant)
+        last_plan_id = plan_ids[-1]
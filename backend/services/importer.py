@@ -0,0 +1,322 @@
+# services/importer.py
+"""
+서비스/요금제 카탈로그 일괄 가져오기 (manage.py import_catalog)
+
+- CSV(.csv) / JSON Lines(.jsonl) 는 한 줄씩 읽고, JSON(.json, 배열)은 파일 단위로 읽습니다.
+- batch_size 행씩 검증 → 기존 행과 자연 키로 비교 → bulk_create/bulk_update 를 한 트랜잭션에서 적용합니다.
+    서비스: name
+    요금제: (서비스, plan_name)  ※ 서비스는 service(이름) 또는 service_id 컬럼으로 지정
+- bulk 작업은 시그널을 보내지 않으므로 요금 요약 갱신, 카탈로그 버전 올리기, 검색 변경 기록은 끝에서 한 번에 합니다.
+"""
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_catalog_version
+from .history import record_price_changes
+from .models import Service, Plan
+from .pricing import CENT, refresh_price_summaries
+from .search import mark_services_changed
+
+BILLING_CYCLES = ('month', 'year')
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 50
+
+
+class RowError(ValueError):
+    pass
+
+
+class ImportStats:
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.invalid = 0
+        self.errors = []          # [(파일 내 행 번호, 메시지), ...] 최대 MAX_REPORTED_ERRORS개
+        self.service_ids = set()  # 요금 요약을 다시 계산해야 하는 서비스
+
+    @property
+    def changed(self):
+        return self.inserted + self.updated
+
+    def add_error(self, line, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def as_dict(self):
+        return {'inserted': self.inserted, 'updated': self.updated,
+                'unchanged': self.unchanged, 'invalid': self.invalid}
+
+
+def read_rows(path, fmt=None):
+    """(행 번호, dict)를 하나씩 내보냅니다. 행 번호는 CSV 헤더를 1행으로 센 값입니다."""
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt == 'csv':
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                yield line, row
+    elif fmt == 'jsonl':
+        with open(path, encoding='utf-8-sig') as f:
+            for line, text in enumerate(f, start=1):
+                if text.strip():
+                    yield line, json.loads(text)
+    elif fmt == 'json':
+        with open(path, encoding='utf-8-sig') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('results') or data.get('items') or []
+        for line, row in enumerate(data, start=1):
+            yield line, row
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} (csv, json, jsonl)")
+
+
+def detect_kind(row):
+    return 'plans' if 'plan_name' in row else 'services'
+
+
+def _text(row, name, max_length=None, required=False):
+    value = row.get(name)
+    value = '' if value is None else str(value).strip()
+    if required and not value:
+        raise RowError(f"{name} 값이 비어 있습니다.")
+    if max_length and len(value) > max_length:
+        raise RowError(f"{name} 값이 {max_length}자를 넘습니다.")
+    return value
+
+
+def _price(row):
+    raw = str(row.get('price') or '').replace(',', '').replace('원', '').strip()
+    try:
+        price = Decimal(raw).quantize(CENT)
+    except InvalidOperation:
+        raise RowError(f"price 값이 올바르지 않습니다: {row.get('price')!r}")
+    if price < 0 or price >= Decimal('1e8'):
+        raise RowError(f"price 값이 범위를 벗어났습니다: {price}")
+    return price
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class CatalogImporter(ABC):
+    """
+    자연 키로 기존 행을 찾아 새 행은 bulk_create, 바뀐 행은 bulk_update 합니다.
+    하위 클래스는 model, fields와 clean/natural_key/load_existing을 정의합니다.
+    """
+    model = None
+    fields = ()
+
+    def __init__(self, stats, dry_run=False):
+        self.stats = stats
+        self.dry_run = dry_run
+
+    @abstractmethod
+    def clean(self, row):
+        """검증된 {필드: 값}을 반환합니다. 잘못된 행이면 RowError"""
+
+    @abstractmethod
+    def natural_key(self, values):
+        """clean()이 반환한 값에서 자연 키(기존 행과 맞춰 볼 값)"""
+
+    @abstractmethod
+    def load_existing(self, keys):
+        """{자연 키: 기존 인스턴스}"""
+
+    def touched_services(self, instances):
+        return set()
+
+    def after_write(self, created, updated, originals):
+        """bulk 작업 직후 같은 트랜잭션 안에서 호출됩니다. (bulk 작업은 시그널을 보내지 않으므로)"""
+
+    def import_rows(self, rows, batch_size=DEFAULT_BATCH_SIZE):
+        for batch in _batches(rows, batch_size):
+            self.import_batch(batch)
+        return self.stats
+
+    def import_batch(self, batch):
+        cleaned = {}
+        for line, row in batch:
+            try:
+                values = self.clean(row)
+            except RowError as e:
+                self.stats.add_error(line, str(e))
+                continue
+            # 같은 파일 안에서 키가 겹치면 뒤에 나온 행을 사용
+            cleaned[self.natural_key(values)] = values
+
+        existing = self.load_existing(cleaned.keys())
+        to_create, to_update, changed_fields = [], [], set()
+        originals = {}  # 수정할 행의 바뀌기 전 값 {pk: {필드: 값}}
+        for key, values in cleaned.items():
+            instance = existing.get(key)
+            if instance is None:
+                to_create.append(self.model(**values))
+                continue
+            diff = [name for name in self.fields if getattr(instance, name) != values[name]]
+            if not diff:
+                self.stats.unchanged += 1
+                continue
+            originals[instance.pk] = {name: getattr(instance, name) for name in self.fields}
+            for name in diff:
+                setattr(instance, name, values[name])
+            changed_fields.update(diff)
+            to_update.append(instance)
+
+        if not self.dry_run and (to_create or to_update):
+            now = timezone.now()
+            with transaction.atomic():
+                if to_create:
+                    self.model.objects.bulk_create(to_create)
+                if to_update:
+                    # bulk_update는 auto_now를 채우지 않으므로 직접 갱신 (검색 색인 변경 감지에 사용)
+                    for instance in to_update:
+                        instance.updated_at = now
+                    self.model.objects.bulk_update(to_update, sorted(changed_fields) + ['updated_at'])
+                self.after_write(to_create, to_update, originals)
+            self.stats.service_ids |= self.touched_services(to_create + to_update)
+
+        self.stats.inserted += len(to_create)
+        self.stats.updated += len(to_update)
+
+
+class ServiceImporter(CatalogImporter):
+    model = Service
+    fields = ('category', 'description', 'official_link')
+
+    def clean(self, row):
+        return {
+            'name': _text(row, 'name', max_length=120, required=True),
+            'category': _text(row, 'category', max_length=40) or None,
+            'description': _text(row, 'description') or None,
+            'official_link': _text(row, 'official_link', max_length=255) or None,
+        }
+
+    def natural_key(self, values):
+        return values['name']
+
+    def load_existing(self, keys):
+        return {service.name: service for service in Service.objects.filter(name__in=list(keys))}
+
+    def touched_services(self, instances):
+        # 새 서비스도 요금 요약(요금제 0개) 행을 만들어 둡니다.
+        names = [instance.name for instance in instances]
+        return set(Service.objects.filter(name__in=names).values_list('pk', flat=True))
+
+
+class PlanImporter(CatalogImporter):
+    model = Plan
+    fields = ('billing_cycle', 'price', 'benefits')
+
+    def __init__(self, stats, dry_run=False):
+        super().__init__(stats, dry_run=dry_run)
+        self.service_ids = {}  # 서비스 이름 → id (배치 간 재사용)
+        self.known_ids = set()  # service_id 컬럼으로 지정된 서비스 중 실제로 있는 id
+
+    def import_batch(self, batch):
+        """행을 검증하기 전에 배치에 나온 서비스(이름/id)를 한 번에 조회해 둡니다."""
+        names = {_text(row, 'service') for _, row in batch if not row.get('service_id')} - {''}
+        missing = names - self.service_ids.keys()
+        if missing:
+            self.service_ids.update(Service.objects.filter(name__in=missing).values_list('name', 'pk'))
+        ids = {_int_or_none(row.get('service_id')) for _, row in batch} - {None} - self.known_ids
+        if ids:
+            self.known_ids.update(Service.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        super().import_batch(batch)
+
+    def clean(self, row):
+        service_id = _int_or_none(row.get('service_id'))
+        if service_id is None:
+            name = _text(row, 'service', required=True)
+            service_id = self.service_ids.get(name)
+            if service_id is None:
+                raise RowError(f"서비스를 찾을 수 없습니다: {name}")
+        elif service_id not in self.known_ids:
+            raise RowError(f"서비스를 찾을 수 없습니다: service_id={service_id}")
+
+        billing_cycle = _text(row, 'billing_cycle') or 'month'
+        if billing_cycle not in BILLING_CYCLES:
+            raise RowError(f"billing_cycle 값은 {', '.join(BILLING_CYCLES)} 중 하나여야 합니다: {billing_cycle}")
+        return {
+            'service_id': service_id,
+            'plan_name': _text(row, 'plan_name', max_length=100, required=True),
+            'billing_cycle': billing_cycle,
+            'price': _price(row),
+            'benefits': _text(row, 'benefits'),
+        }
+
+    def natural_key(self, values):
+        return values['service_id'], values['plan_name']
+
+    def load_existing(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        plans = Plan.objects.filter(service_id__in={service_id for service_id, _ in keys},
+                                    plan_name__in={plan_name for _, plan_name in keys})
+        wanted = set(keys)
+        return {key: plan for plan in plans if (key := (plan.service_id, plan.plan_name)) in wanted}
+
+    def touched_services(self, instances):
+        return {instance.service_id for instance in instances}
+
+    def after_write(self, created, updated, originals):
+        """가격/결제 주기가 바뀐 요금제와 새 요금제의 가격 이력을 남깁니다."""
+        if created and created[0].pk is None:
+            # bulk_create가 pk를 돌려주지 않는 DB에서는 자연 키로 다시 읽습니다.
+            created = list(self.load_existing([self.natural_key(vars(plan)) for plan in created]).values())
+        record_price_changes(created + updated, previous={
+            pk: (values['price'], values['billing_cycle']) for pk, values in originals.items()
+        })
+
+
+def _int_or_none(value):
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+IMPORTERS = {'services': ServiceImporter, 'plans': PlanImporter}
+
+
+def import_catalog(path, kind=None, fmt=None, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    파일 하나를 가져오고 (종류, ImportStats)를 반환합니다.
+    kind를 지정하지 않으면 첫 행에 plan_name 컬럼이 있는지로 판단합니다.
+    """
+    rows = read_rows(path, fmt)
+    first = next(rows, None)
+    stats = ImportStats()
+    if first is None:
+        return kind or 'services', stats
+    kind = kind or detect_kind(first[1])
+
+    def all_rows():
+        yield first
+        yield from rows
+
+    IMPORTERS[kind](stats, dry_run=dry_run).import_rows(all_rows(), batch_size=batch_size)
+    if stats.changed and not dry_run:
+        service_ids = sorted(stats.service_ids)
+        for start in range(0, len(service_ids), batch_size):
+            refresh_price_summaries(service_ids[start:start + batch_size])
+        bump_catalog_version()
+        mark_services_changed(service_ids)
+    return kind, stats
@@ -0,0 +1,133 @@
+import random
+import statistics
+from decimal import Decimal
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q, Min, Max, Case, When, F, Value, DecimalField
+from django.db.models.functions import Coalesce
+
+from services.filters import filter_by_price_range
+from services.models import Service, Plan
+from services.pricing import rebuild_all_price_summaries
+from services.views import ServiceViewSet
+
+CATEGORIES = ['video', 'music', 'book', 'game', 'cloud', 'news', 'food', 'shopping']
+PRICE_FIELD = DecimalField(max_digits=10, decimal_places=2)
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_queryset(min_price, max_price, categories):
+    """예전 방식: plans JOIN + GROUP BY 집계 + 필터마다 JOIN + DISTINCT"""
+    monthly = Case(When(plans__billing_cycle='year', then=F('plans__price') / 12),
+                   default=F('plans__price'), output_field=PRICE_FIELD)
+    queryset = Service.objects.annotate(
+        min_price=Coalesce(Min(monthly), Value(0, output_field=PRICE_FIELD)),
+        max_price=Coalesce(Max(monthly), Value(0, output_field=PRICE_FIELD)),
+    )
+    category_q = Q()
+    for value in categories:
+        category_q |= Q(category__iexact=value)
+    queryset = queryset.filter(category_q).distinct()
+    queryset = queryset.filter(Q(plans__billing_cycle='month', plans__price__gte=min_price)
+                               | Q(plans__billing_cycle='year', plans__price__gte=min_price * 12)).distinct()
+    queryset = queryset.filter(Q(plans__billing_cycle='month', plans__price__lte=max_price)
+                               | Q(plans__billing_cycle='year', plans__price__lte=max_price * 12)).distinct()
+    return queryset.order_by('plans__price')
+
+
+def current_queryset(min_price, max_price, categories):
+    """현재 방식: service_price_summary 1:1 JOIN + EXISTS, DISTINCT 없음"""
+    category_q = Q()
+    for value in categories:
+        category_q |= Q(category__iexact=value)
+    queryset = ServiceViewSet.queryset.filter(category_q)
+    return filter_by_price_range(queryset, min_price, max_price).order_by('min_price', 'id')
+
+
+class Command(BaseCommand):
+    help = (
+        "합성 카탈로그(기본 요금제 10만 건)를 만들어 서비스 목록 필터의 예전/현재 쿼리를 "
+        "EXPLAIN 및 실행 시간으로 비교합니다. 기본적으로 끝나면 모두 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--plans', type=int, default=100_000, help="만들 요금제 수 (기본 100000)")
+        parser.add_argument('--plans-per-service', type=int, default=5, help="서비스당 요금제 수 (기본 5)")
+        parser.add_argument('--repeat', type=int, default=5, help="쿼리별 반복 실행 횟수 (기본 5)")
+        parser.add_argument('--batch-size', type=int, default=2000, help="bulk_create 배치 크기 (기본 2000)")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true', help="합성 데이터를 롤백하지 않고 남겨 둡니다.")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.populate(options)
+                self.compare(options['repeat'])
+                if not options['keep']:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("합성 데이터를 롤백했습니다.")
+
+    def populate(self, options):
+        rng = random.Random(options['seed'])
+        per_service = max(1, options['plans_per_service'])
+        service_count = max(1, options['plans'] // per_service)
+        batch_size = options['batch_size']
+
+        started = perf_counter()
+        services = [
+            Service(name=f'bench-{i}', category=rng.choice(CATEGORIES), description='benchmark')
+            for i in range(service_count)
+        ]
+        Service.objects.bulk_create(services, batch_size=batch_size)
+        # bulk_create가 pk를 돌려주지 않는 DB(MariaDB 구버전)도 있으므로 다시 읽습니다.
+        service_ids = list(Service.objects.filter(name__startswith='bench-').values_list('pk', flat=True))
+
+        plans = []
+        for service_id in service_ids:
+            for j in range(per_service):
+                yearly = rng.random() < 0.25
+                monthly = Decimal(rng.randrange(10, 300) * 100)
+                plans.append(Plan(service_id=service_id, plan_name=f'plan-{j}', benefits='',
+                                  billing_cycle='year' if yearly else 'month',
+                                  price=monthly * 10 if yearly else monthly))
+                if len(plans) >= batch_size:
+                    Plan.objects.bulk_create(plans)
+                    plans = []
+        if plans:
+            Plan.objects.bulk_create(plans)
+
+        rebuild_all_price_summaries()
+        self.stdout.write(
+            f"서비스 {len(service_ids)}건 / 요금제 {len(service_ids) * per_service}건 생성 "
+            f"({perf_counter() - started:.1f}s)")
+
+    def _measure(self, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = perf_counter()
+            rows = len(list(queryset.values_list('pk', flat=True)[:100]))
+            timings.append((perf_counter() - started) * 1000)
+        return rows, statistics.median(timings)
+
+    def compare(self, repeat):
+        cases = [
+            ('가격 범위', (Decimal('5000'), Decimal('9000'), [])),
+            ('가격 범위 + 카테고리', (Decimal('5000'), Decimal('9000'), ['video', 'music'])),
+            ('넓은 가격 범위 + 카테고리', (Decimal('1000'), Decimal('30000'), ['book'])),
+        ]
+        for label, params in cases:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label} =="))
+            for name, build in (('legacy', legacy_queryset), ('current', current_queryset)):
+                queryset = build(*params)
+                rows, median_ms = self._measure(queryset, repeat)
+                sql = str(queryset.query)
+                self.stdout.write(
+                    f"[{name}] rows={rows} median={median_ms:.1f}ms "
+                    f"distinct={'DISTINCT' in sql.upper()} vendor={connection.vendor}")
+                self.stdout.write(queryset.explain())
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from services.history import COMPACT_BATCH_SIZE, compact_price_history
+
+
+class Command(BaseCommand):
+    help = "요금제 가격 이력에서 같은 가격/결제 주기가 연달아 기록된 행을 첫 행만 남기고 정리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=COMPACT_BATCH_SIZE,
+                            help=f"한 번에 처리할 요금제 수 / 삭제 단위 (기본 {COMPACT_BATCH_SIZE})")
+        parser.add_argument('--dry-run', action='store_true', help="지우지 않고 지울 행 수만 확인합니다.")
+
+    def handle(self, *args, **options):
+        scanned, deleted = compact_price_history(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(f"{prefix}이력 {scanned}행 중 {deleted}행을 정리했습니다."))
@@ -0,0 +1,45 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.importer import DEFAULT_BATCH_SIZE, IMPORTERS, import_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "서비스/요금제 CSV·JSON 파일을 가져옵니다. 자연 키(서비스 이름, 서비스+요금제 이름)로 "
+        "기존 행과 비교해 새 행은 추가하고 바뀐 행만 수정합니다. "
+        "예) python manage.py import_catalog Service.csv plans.csv"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help="가져올 파일 (.csv, .json, .jsonl)")
+        parser.add_argument('--kind', choices=sorted(IMPORTERS),
+                            help="파일 종류 (기본: plan_name 컬럼이 있으면 plans, 없으면 services)")
+        parser.add_argument('--format', dest='fmt', choices=['csv', 'json', 'jsonl'],
+                            help="파일 형식 (기본: 확장자로 판단)")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f"한 트랜잭션에서 처리할 행 수 (기본 {DEFAULT_BATCH_SIZE})")
+        parser.add_argument('--dry-run', action='store_true', help="DB에 쓰지 않고 결과만 확인합니다.")
+        parser.add_argument('--strict', action='store_true', help="잘못된 행이 있으면 실패로 종료합니다.")
+
+    def handle(self, *args, **options):
+        invalid = 0
+        for path in options['paths']:
+            started = perf_counter()
+            try:
+                kind, stats = import_catalog(path, kind=options['kind'], fmt=options['fmt'],
+                                             batch_size=options['batch_size'], dry_run=options['dry_run'])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"{path}: {e}")
+
+            for line, message in stats.errors:
+                self.stderr.write(f"{path}:{line}: {message}")
+            counts = ' '.join(f'{name}={count}' for name, count in stats.as_dict().items())
+            prefix = '[dry-run] ' if options['dry_run'] else ''
+            self.stdout.write(self.style.SUCCESS(
+                f"{prefix}{path} ({kind}): {counts} ({perf_counter() - started:.2f}s)"))
+            invalid += stats.invalid
+
+        if invalid and options['strict']:
+            raise CommandError(f"잘못된 행 {invalid}건이 있습니다.")
@@ -0,0 +1,96 @@
+import asyncio
+import statistics
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(sorted_values, ratio):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(ratio * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_load(url, concurrency, total, timeout, headers=None):
+    """
+    url에 동시 concurrency개씩 총 total번 GET을 보내고 (응답 시간 목록(ms), 오류 수, 걸린 시간(s))을 반환합니다.
+    연결 재사용은 실제 브라우저/프록시처럼 켜 둡니다.
+    """
+    import httpx
+
+    timings, errors = [], 0
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=timeout, headers=headers) as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = perf_counter()
+                try:
+                    response = await client.get(url)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                timings.append((perf_counter() - started) * 1000)
+                errors += failed
+
+        started = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = perf_counter() - started
+    return sorted(timings), errors, elapsed
+
+
+class Command(BaseCommand):
+    help = (
+        "실행 중인 서버에 동시 요청을 보내 처리량(req/s)과 지연 시간(p50/p95/p99)을 잽니다. "
+        "같은 조회의 동기(/api/...)·비동기(/api/async/...) 엔드포인트나 WSGI/ASGI 배포를 비교할 때 씁니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', action='append', required=True,
+                            help="측정할 주소. 이름=주소 형식으로 여러 번 지정 "
+                                 "(예: --url sync=http://localhost:8000/api/services/compare/?ids=1,2)")
+        parser.add_argument('--concurrency', type=int, default=50, help="동시 요청 수 (기본 50)")
+        parser.add_argument('--requests', type=int, default=1000, help="주소별 총 요청 수 (기본 1000)")
+        parser.add_argument('--warmup', type=int, default=20, help="측정 전 캐시/연결 준비용 요청 수 (기본 20)")
+        parser.add_argument('--timeout', type=float, default=10, help="요청 타임아웃(초, 기본 10)")
+        parser.add_argument('--header', action='append', default=[],
+                            help="추가 요청 헤더 (예: --header 'Authorization: Bearer <token>')")
+
+    def handle(self, *args, **options):
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            raise CommandError("httpx가 필요합니다. (pip install httpx)")
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError("--concurrency, --requests는 1 이상이어야 합니다.")
+
+        headers = {}
+        for header in options['header']:
+            name, sep, value = header.partition(':')
+            if not sep:
+                raise CommandError(f"헤더 형식이 올바르지 않습니다: {header}")
+            headers[name.strip()] = value.strip()
+
+        targets = []
+        for index, value in enumerate(options['url'], start=1):
+            name, sep, url = value.partition('=')
+            if not sep or not url.startswith('http'):
+                name, url = f'url{index}', value
+            targets.append((name, url))
+
+        for name, url in targets:
+            if options['warmup']:
+                asyncio.run(run_load(url, min(options['concurrency'], options['warmup']),
+                                     options['warmup'], options['timeout'], headers))
+            timings, errors, elapsed = asyncio.run(
+                run_load(url, options['concurrency'], options['requests'], options['timeout'], headers))
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {name} ({url}) =="))
+            self.stdout.write(
+                f"요청 {len(timings)}건 / 오류 {errors}건 / 동시 {options['concurrency']} / {elapsed:.2f}s\n"
+                f"처리량 {len(timings) / elapsed:.1f} req/s\n"
+                f"지연 평균 {statistics.fmean(timings):.1f}ms / p50 {percentile(timings, 0.5):.1f}ms / "
+                f"p95 {percentile(timings, 0.95):.1f}ms / p99 {percentile(timings, 0.99):.1f}ms / "
+                f"최대 {timings[-1]:.1f}ms")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from services.cache import bump_catalog_version
+from services.pricing import rebuild_all_price_summaries
+
+
+class Command(BaseCommand):
+    help = "서비스별 월 환산 요금 요약(service_price_summary)을 전체 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help="한 번에 처리할 서비스 수 (기본 500)")
+
+    def handle(self, *args, **options):
+        total = rebuild_all_price_summaries(batch_size=options['batch_size'])
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f"요금 요약 {total}건을 다시 계산했습니다."))
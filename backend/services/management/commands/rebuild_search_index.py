@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from services.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "서비스 검색 색인을 DB에서 다시 만들고, 실행 중인 워커들도 다음 검색 때 전체 재색인하도록 합니다."
+
+    def handle(self, *args, **options):
+        stats = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"서비스 {stats['documents']}건을 색인했습니다."))
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Plan',
+            fields=[
+                ('id', models.BigAutoField(db_column='plan_id', help_text='Plan ID', primary_key=True, serialize=False)),
+                ('plan_name', models.CharField(db_column='plan_name', max_length=100)),
+                ('billing_cycle', models.CharField(db_column='billing_cycle', default='month', max_length=50)),
+                ('price', models.DecimalField(db_column='price', decimal_places=2, max_digits=10)),
+                ('benefits', models.TextField(blank=True, db_column='benefits')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_column='updated_at')),
+            ],
+            options={
+                'db_table': 'plan',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Service',
+            fields=[
+                ('id', models.BigAutoField(db_column='service_id', help_text='Service ID', primary_key=True, serialize=False)),
+                ('name', models.CharField(db_column='name', max_length=120)),
+                ('category', models.CharField(db_column='category', max_length=40, null=True)),
+                ('description', models.TextField(db_column='description', null=True)),
+                ('official_link', models.CharField(blank=True, db_column='official_link', max_length=255, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_column='updated_at')),
+            ],
+            options={
+                'db_table': 'service',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Card',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('description', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Telecom',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('description', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServicePriceSummary',
+            fields=[
+                ('service', models.OneToOneField(db_column='service_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='price_summary', serialize=False, to='services.service')),
+                ('min_monthly_price', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('max_monthly_price', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('plan_count', models.PositiveIntegerField(default=0)),
+                ('billing_cycles', models.CharField(blank=True, max_length=100)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'service_price_summary',
+                'indexes': [models.Index(fields=['min_monthly_price'], name='price_summary_min_idx'), models.Index(fields=['max_monthly_price'], name='price_summary_max_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0002_servicepricesummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlanPriceHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('billing_cycle', models.CharField(max_length=50)),
+                ('recorded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('plan', models.ForeignKey(db_column='plan_id', on_delete=django.db.models.deletion.CASCADE, related_name='price_history', to='services.plan')),
+            ],
+            options={
+                'db_table': 'plan_price_history',
+                'indexes': [models.Index(fields=['plan', 'recorded_at'], name='price_history_plan_time_idx')],
+            },
+        ),
+    ]
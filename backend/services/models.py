@@ -1,5 +1,6 @@
 # services/models.py
 from django.db import models
+from django.utils import timezone
 
 
 class Service(models.Model):
@@ -55,3 +56,46 @@ class Telecom(models.Model):
 
     def __str__(self):
         return self.name
+
+
+# 서비스별 요금 요약 (목록 API에서 매번 plan JOIN + GROUP BY 하지 않도록 미리 계산해 둔 값)
+class ServicePriceSummary(models.Model):
+    service = models.OneToOneField(Service, db_column="service_id", primary_key=True,
+                                   on_delete=models.CASCADE, related_name='price_summary')
+    min_monthly_price = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    max_monthly_price = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    plan_count = models.PositiveIntegerField(default=0)
+    billing_cycles = models.CharField(max_length=100, blank=True)  # 예: "month,year"
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'service_price_summary'
+        indexes = [
+            models.Index(fields=['min_monthly_price'], name='price_summary_min_idx'),
+            models.Index(fields=['max_monthly_price'], name='price_summary_max_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.service_id} 요금 요약"
+
+
+# 요금제 가격 이력 (추가만 하는 테이블. 가격/결제 주기가 바뀔 때마다 한 행씩 쌓입니다)
+class PlanPriceHistory(models.Model):
+    plan = models.ForeignKey(Plan, db_column="plan_id", on_delete=models.CASCADE, related_name='price_history')
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    billing_cycle = models.CharField(max_length=50)
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'plan_price_history'
+        indexes = [
+            models.Index(fields=['plan', 'recorded_at'], name='price_history_plan_time_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("가격 이력은 수정할 수 없습니다. (추가만 가능)")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.plan_id} {self.price}/{self.billing_cycle} @ {self.recorded_at:%Y-%m-%d}"
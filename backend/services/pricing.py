@@ -0,0 +1,113 @@
+# services/pricing.py
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db.models import Case, When, F, Min, Max, Count, DecimalField
+
+from .models import Service, Plan, ServicePriceSummary
+
+PRICE_FIELD = DecimalField(max_digits=10, decimal_places=2)
+CENT = Decimal('0.01')
+
+
+def monthly_price_expression(price='price', billing_cycle='billing_cycle'):
+    """
+    연간(year) 요금제는 12로 나눠 월 단위로 환산하는 표현식을 만듭니다.
+    price에는 필드 경로(문자열) 또는 Coalesce 같은 표현식을 넘길 수 있습니다.
+    """
+    if isinstance(price, str):
+        price = F(price)
+    return Case(
+        When(**{billing_cycle: 'year'}, then=price / 12),
+        default=price,
+        output_field=PRICE_FIELD,
+    )
+
+
+def monthly_price(price, billing_cycle):
+    """monthly_price_expression과 같은 기준의 파이썬 계산 (이미 메모리에 올라온 요금제용)"""
+    if price is None:
+        return None
+    price = Decimal(price)
+    return _quantize(price / 12 if billing_cycle == 'year' else price)
+
+
+def _quantize(value):
+    if value is None:
+        return None
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def refresh_price_summaries(service_ids):
+    """
+    주어진 서비스들의 요금 요약(ServicePriceSummary)을 다시 계산해 저장합니다.
+    (service_id, billing_cycle) 단위로 한 번만 GROUP BY 한 뒤 파이썬에서 서비스별로 합칩니다.
+    Plan 저장/삭제 시그널과 rebuild_price_summary 명령어가 함께 사용합니다.
+    """
+    service_ids = {sid for sid in service_ids if sid is not None}
+    if not service_ids:
+        return 0
+
+    summaries = {
+        sid: ServicePriceSummary(service_id=sid, plan_count=0, billing_cycles='')
+        for sid in Service.objects.filter(pk__in=service_ids).values_list('pk', flat=True)
+    }
+    cycles = {sid: set() for sid in summaries}
+
+    rows = (
+        Plan.objects.filter(service_id__in=summaries.keys())
+        .values('service_id', 'billing_cycle')
+        .annotate(
+            min_price=Min(monthly_price_expression()),
+            max_price=Max(monthly_price_expression()),
+            plan_count=Count('id'),
+        )
+        .order_by()
+    )
+    for row in rows:
+        summary = summaries[row['service_id']]
+        min_price, max_price = _quantize(row['min_price']), _quantize(row['max_price'])
+        if summary.min_monthly_price is None or min_price < summary.min_monthly_price:
+            summary.min_monthly_price = min_price
+        if summary.max_monthly_price is None or max_price > summary.max_monthly_price:
+            summary.max_monthly_price = max_price
+        summary.plan_count += row['plan_count']
+        cycles[row['service_id']].add(row['billing_cycle'])
+
+    for sid, summary in summaries.items():
+        summary.billing_cycles = ','.join(sorted(cycles[sid]))
+
+    existing = set(
+        ServicePriceSummary.objects.filter(service_id__in=summaries.keys())
+        .values_list('service_id', flat=True)
+    )
+    to_update = [s for sid, s in summaries.items() if sid in existing]
+    to_create = [s for sid, s in summaries.items() if sid not in existing]
+
+    if to_update:
+        ServicePriceSummary.objects.bulk_update(
+            to_update, ['min_monthly_price', 'max_monthly_price', 'plan_count', 'billing_cycles'])
+    if to_create:
+        ServicePriceSummary.objects.bulk_create(to_create)
+
+    # 이미 삭제된 서비스의 요약은 CASCADE로 정리되지만, 외부에서 직접 지운 경우를 대비
+    ServicePriceSummary.objects.filter(service_id__in=service_ids - summaries.keys()).delete()
+    return len(summaries)
+
+
+def rebuild_all_price_summaries(batch_size=500):
+    """모든 서비스의 요금 요약을 batch_size 단위로 다시 계산합니다."""
+    total = 0
+    last_id = 0
+    while True:
+        ids = list(
+            Service.objects.filter(pk__gt=last_id).order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        total += refresh_price_summaries(ids)
+        last_id = ids[-1]
+
+    # 서비스가 사라졌는데 남아 있는 요약 행 정리
+    ServicePriceSummary.objects.exclude(service__in=Service.objects.all()).delete()
+    return total
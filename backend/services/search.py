@@ -0,0 +1,349 @@
+# services/search.py
+"""
+서비스 검색용 n-gram 역색인입니다.
+
+- 한글은 자모 단위로 분해해서 색인하므로 "넷플" → "넷플릭스" 같은 부분 일치와
+  받침이 빠지거나 오타가 섞인 입력도 찾을 수 있습니다. (n-gram으로 후보 단어를 고른 뒤 유사도로 판정)
+- 서비스 이름/설명과 요금제 이름/혜택을 서비스 단위 문서 하나로 묶고, 필드마다 가중치를 다르게 줍니다.
+- 색인은 워커(프로세스)마다 메모리에 들고 있습니다. 서비스/요금제를 바꾸는 쪽이 바뀐 서비스 id를
+  공유 캐시의 변경 기록(search:changes:<번호>)에 남기고(mark_services_changed), 각 워커는 검색할 때
+  마지막으로 본 번호 이후의 id만 다시 색인합니다. 카드/통신사 변경으로 카탈로그 버전만 바뀐 경우는 건드리지 않습니다.
+  기록이 만료됐거나 너무 많이 밀렸으면 서비스별 변경 감지 값을 비교해 바뀐 것만 다시 색인합니다.
+  (manage.py rebuild_search_index 로 모든 워커가 처음부터 다시 만들도록 할 수 있습니다.)
+"""
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .cache import shared_cache
+from .models import Service, Plan
+
+SEARCH_GENERATION_KEY = 'search:generation'
+SEARCH_CHANGES_KEY = 'search:changes'
+# 변경 기록 보관 시간(초). 이보다 오래 검색이 없던 워커는 변경 감지 값 비교로 따라잡습니다.
+CHANGE_LOG_TIMEOUT = 60 * 60
+
+NGRAM_SIZES = (2, 3)
+# 후보 단어를 고를 때 검색어 n-gram 중 이 비율 이상을 공유해야 함
+MIN_GRAM_OVERLAP = 0.3
+# 부분 문자열이 아닌 경우(오타) 자모 문자열 유사도가 이 값 이상이어야 일치로 봄
+MIN_SIMILARITY = 0.75
+# 검색어 단어 중 이 비율 이상이 일치해야 결과에 포함
+MIN_COVERAGE = 0.5
+# 상위 몇 개만 필요한 순위 조회의 기본 개수 (?q= 필터는 페이지네이션 때문에 자르지 않습니다)
+MAX_RESULTS = 200
+LOAD_BATCH_SIZE = 500
+# 마지막 동기화 이후 바뀐 서비스가 이보다 많으면 변경 기록 대신 변경 감지 값 비교로 동기화
+MAX_CHANGED_IDS = LOAD_BATCH_SIZE
+
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'plan_name': 1.5,
+    'description': 1.0,
+    'benefits': 0.5,
+}
+
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ('', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+             'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+_word_re = re.compile(r'\w+')
+# NFKC는 입력 중인 호환 자모(ㄴ, ㅍ ...)를 첫가끝 자모로 바꾸므로 다시 호환 자모로 되돌립니다.
+_COMPAT_JAMO = str.maketrans({
+    unicodedata.normalize('NFKC', chr(code)): chr(code)
+    for code in range(0x3131, 0x3164)
+    if len(unicodedata.normalize('NFKC', chr(code))) == 1
+})
+
+
+def decompose_hangul(text):
+    """완성형 한글 음절을 초성/중성/종성 자모로 풀어 씁니다. (그 외 문자는 그대로)"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            chars.append(CHOSEONG[offset // 588])
+            chars.append(JUNGSEONG[(offset % 588) // 28])
+            chars.append(JONGSEONG[offset % 28])
+        else:
+            chars.append(ch)
+    return ''.join(chars)
+
+
+def normalize_words(text):
+    """소문자/NFKC 정규화 후 단어별 자모 문자열 목록을 반환합니다."""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKC', text).lower().translate(_COMPAT_JAMO)
+    return [decompose_hangul(word) for word in _word_re.findall(text)]
+
+
+def ngrams(word):
+    if len(word) < min(NGRAM_SIZES):
+        return {word}
+    return {word[i:i + n] for n in NGRAM_SIZES for i in range(len(word) - n + 1)}
+
+
+def similarity(query_word, word):
+    """
+    검색어 단어와 색인 단어(둘 다 자모 문자열)의 일치 정도 (0 ~ 1)
+    접두 일치 > 부분 일치 > 오타(편집 유사도) 순으로 점수를 줍니다.
+    """
+    if word.startswith(query_word):
+        return 1.0
+    if len(query_word) < min(NGRAM_SIZES):
+        return 0.0
+    if query_word in word:
+        return 0.8
+    ratio = SequenceMatcher(None, query_word, word).ratio()
+    return ratio * 0.8 if ratio >= MIN_SIMILARITY else 0.0
+
+
+class SearchIndex:
+    """
+    서비스 id를 문서 키로 하는 메모리 역색인입니다.
+    n-gram → 단어, 단어 → {서비스 id: 필드 가중치} 두 단계로 두어,
+    검색어와 n-gram을 공유하는 단어만 골라 유사도를 계산합니다.
+    """
+
+    def __init__(self):
+        self.grams = defaultdict(set)    # n-gram → 단어 집합
+        self.words = defaultdict(dict)   # 단어 → {서비스 id: 가중치}
+        self.documents = {}              # 서비스 id → 단어 집합 (문서 삭제 시 역색인 정리용)
+        self.signatures = {}             # 서비스 id → 변경 감지용 값
+        self.state = None                # 마지막으로 동기화한 (카탈로그 버전, 색인 세대)
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, service_id, fields):
+        """fields: {'name': [...], 'description': [...], 'plan_name': [...], 'benefits': [...]}"""
+        weights = {}
+        for field, values in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for value in values:
+                for word in normalize_words(value):
+                    if weights.get(word, 0) < weight:
+                        weights[word] = weight
+
+        with self.lock:
+            self.remove(service_id)
+            for word, weight in weights.items():
+                if word not in self.words:
+                    for gram in ngrams(word):
+                        self.grams[gram].add(word)
+                self.words[word][service_id] = weight
+            self.documents[service_id] = set(weights)
+
+    def remove(self, service_id):
+        with self.lock:
+            for word in self.documents.pop(service_id, ()):
+                postings = self.words[word]
+                postings.pop(service_id, None)
+                if postings:
+                    continue
+                del self.words[word]
+                for gram in ngrams(word):
+                    self.grams[gram].discard(word)
+                    if not self.grams[gram]:
+                        del self.grams[gram]
+            self.signatures.pop(service_id, None)
+
+    def _candidates(self, query_word):
+        if len(query_word) < min(NGRAM_SIZES):
+            # 한 글자(자모) 검색은 n-gram이 없으므로 접두 일치하는 단어만 찾습니다.
+            return [word for word in self.words if word.startswith(query_word)]
+        query_grams = ngrams(query_word)
+        hits = Counter(word for gram in query_grams for word in self.grams.get(gram, ()))
+        needed = max(1, len(query_grams) * MIN_GRAM_OVERLAP)
+        return [word for word, count in hits.items() if count >= needed]
+
+    def search(self, query, limit=MAX_RESULTS):
+        """관련도 순으로 [(서비스 id, 점수), ...]를 반환합니다."""
+        query_words = list(dict.fromkeys(normalize_words(query)))
+        if not query_words:
+            return []
+
+        best = defaultdict(dict)  # 서비스 id → {검색어 단어: 최고 점수}
+        with self.lock:
+            for query_word in query_words:
+                for word in self._candidates(query_word):
+                    score = similarity(query_word, word)
+                    if not score:
+                        continue
+                    for service_id, weight in self.words[word].items():
+                        matched = best[service_id]
+                        matched[query_word] = max(matched.get(query_word, 0), score * weight)
+
+        total = len(query_words)
+        scores = {
+            service_id: sum(matched.values()) / (total * FIELD_WEIGHTS['name'])
+            for service_id, matched in best.items()
+            if len(matched) / total >= MIN_COVERAGE
+        }
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+
+def _catalog_signatures(service_ids=None):
+    """
+    서비스별 (수정 시각, 요금제 수, 요금제 마지막 수정 시각). 요금제 추가/삭제/수정도 감지됩니다.
+    service_ids를 주면 그 서비스만 조회합니다.
+    """
+    plans = Plan.objects.order_by()
+    services = Service.objects.all()
+    if service_ids is not None:
+        plans = plans.filter(service_id__in=service_ids)
+        services = services.filter(pk__in=service_ids)
+    plans = {
+        row['service_id']: (row['count'], row['last_updated'])
+        for row in plans.values('service_id').annotate(count=Count('pk'), last_updated=Max('updated_at'))
+    }
+    return {
+        service_id: (updated_at, *plans.get(service_id, (0, None)))
+        for service_id, updated_at in services.values_list('pk', 'updated_at')
+    }
+
+
+def _load_documents(service_ids):
+    service_ids = list(service_ids)
+    for start in range(0, len(service_ids), LOAD_BATCH_SIZE):
+        batch = service_ids[start:start + LOAD_BATCH_SIZE]
+        documents = {
+            pk: {'name': [name], 'description': [description or ''], 'plan_name': [], 'benefits': []}
+            for pk, name, description in Service.objects.filter(pk__in=batch)
+            .values_list('pk', 'name', 'description')
+        }
+        for service_id, plan_name, benefits in (
+                Plan.objects.filter(service_id__in=batch).order_by('pk')
+                .values_list('service_id', 'plan_name', 'benefits')):
+            documents[service_id]['plan_name'].append(plan_name)
+            documents[service_id]['benefits'].append(benefits or '')
+        yield from documents.items()
+
+
+def sync_index(index, full=False, service_ids=None):
+    """
+    DB와 색인을 맞춥니다. 바뀐(또는 새로 생긴) 서비스만 다시 색인하고 사라진 서비스는 지웁니다.
+    service_ids를 주면 그 서비스만 DB에서 읽어 다시 색인합니다. (변경 기록으로 동기화할 때)
+    반환값: {'indexed': 다시 색인한 수, 'removed': 지운 수, 'documents': 전체 문서 수}
+    """
+    if full:
+        service_ids = None
+    signatures = _catalog_signatures(service_ids)
+    with index.lock:
+        if full:
+            stale = set(signatures)
+            removed = set(index.documents)
+        elif service_ids is not None:
+            stale = set(signatures)
+            removed = (set(service_ids) - stale) & set(index.documents)
+        else:
+            stale = {sid for sid, sig in signatures.items() if index.signatures.get(sid) != sig}
+            removed = set(index.documents) - set(signatures)
+
+        for service_id in removed:
+            index.remove(service_id)
+        for service_id, fields in _load_documents(stale):
+            index.add(service_id, fields)
+            index.signatures[service_id] = signatures[service_id]
+
+        removed -= stale
+        return {'indexed': len(stale), 'removed': len(removed), 'documents': len(index)}
+
+
+_index = SearchIndex()
+
+
+def _change_key(number):
+    return f'{SEARCH_CHANGES_KEY}:{number}'
+
+
+def _record_changes(service_ids):
+    cache = shared_cache()
+    cache.add(SEARCH_CHANGES_KEY, 0, timeout=None)
+    try:
+        number = cache.incr(SEARCH_CHANGES_KEY)
+    except ValueError:
+        number = 1
+        cache.set(SEARCH_CHANGES_KEY, number, timeout=None)
+    cache.set(_change_key(number), sorted(service_ids), timeout=CHANGE_LOG_TIMEOUT)
+
+
+def mark_services_changed(service_ids):
+    """
+    이름/설명/요금제가 바뀐 서비스 id를 변경 기록에 남깁니다. (시그널, 일괄 가져오기에서 호출)
+    커밋 전에 다른 워커가 옛 데이터로 다시 색인했을 수 있으므로 bump_catalog_version처럼 커밋 후에 한 번 더 남깁니다.
+    """
+    service_ids = {service_id for service_id in service_ids if service_id is not None}
+    if not service_ids:
+        return
+    _record_changes(service_ids)
+    transaction.on_commit(lambda: _record_changes(service_ids))
+
+
+def _changed_since(last, current):
+    """last 이후 current까지 기록된 서비스 id 집합. 기록이 빠졌거나 너무 많으면 None"""
+    if current < last or current - last > MAX_CHANGED_IDS:
+        return None
+    if current == last:
+        return set()
+    numbers = range(last + 1, current + 1)
+    records = shared_cache().get_many([_change_key(number) for number in numbers])
+    if len(records) != len(numbers):
+        return None
+    changed = set().union(*records.values())
+    return changed if len(changed) <= MAX_CHANGED_IDS else None
+
+
+def _current_state():
+    """(색인 세대, 마지막 변경 기록 번호)"""
+    cache = shared_cache()
+    return cache.get(SEARCH_GENERATION_KEY, 0), cache.get(SEARCH_CHANGES_KEY, 0)
+
+
+def get_search_index():
+    """색인 세대가 바뀌었으면 전체를, 변경 기록이 늘었으면 바뀐 서비스만 동기화한 뒤 이 워커의 색인을 반환합니다."""
+    state = _current_state()
+    if _index.state != state:
+        with _index.lock:
+            if _index.state != state:
+                if _index.state is None or _index.state[0] != state[0]:
+                    sync_index(_index, full=True)
+                else:
+                    sync_index(_index, service_ids=_changed_since(_index.state[1], state[1]))
+                _index.state = state
+    return _index
+
+
+def search_services(query, limit=None):
+    """검색어와 관련된 서비스 id를 관련도 순으로 반환합니다. limit을 주지 않으면 일치하는 서비스 전부"""
+    return [service_id for service_id, _ in get_search_index().search(query, limit=limit)]
+
+
+def rebuild_search_index():
+    """
+    이 프로세스의 색인을 DB에서 처음부터 다시 만들고, 색인 세대를 올려
+    다른 워커들도 다음 검색 때 전체 재색인하도록 합니다.
+    """
+    cache = shared_cache()
+    cache.add(SEARCH_GENERATION_KEY, 0, timeout=None)
+    try:
+        cache.incr(SEARCH_GENERATION_KEY)
+    except ValueError:
+        cache.set(SEARCH_GENERATION_KEY, 1, timeout=None)
+
+    with _index.lock:
+        stats = sync_index(_index, full=True)
+        _index.state = _current_state()
+    return stats
@@ -0,0 +1,68 @@
+# services/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import bump_catalog_version
+from .models import Service, Plan, Card, Telecom
+from .history import record_price_changes
+from .pricing import refresh_price_summaries
+from .search import mark_services_changed
+
+
+@receiver(pre_save, sender=Plan)
+def remember_previous_values(sender, instance, **kwargs):
+    """
+    요금제가 다른 서비스로 옮겨지는 경우 이전 서비스의 요약도 갱신하고,
+    가격/결제 주기가 바뀌었을 때만 가격 이력을 남기기 위해 저장 전 값을 기억해 둡니다.
+    """
+    instance._previous_service_id = None
+    instance._previous_price = None
+    if instance.pk:
+        previous = (
+            sender.objects.filter(pk=instance.pk).values_list('service_id', 'price', 'billing_cycle').first()
+        )
+        if previous is not None:
+            instance._previous_service_id = previous[0]
+            instance._previous_price = previous[1:]
+
+
+@receiver(post_save, sender=Plan)
+def refresh_summary_on_plan_save(sender, instance, **kwargs):
+    refresh_price_summaries({instance.service_id, getattr(instance, '_previous_service_id', None)})
+
+
+@receiver(post_save, sender=Plan)
+def record_price_history(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_price', None)
+    record_price_changes([instance], previous={instance.pk: previous} if previous else None)
+
+
+@receiver(post_delete, sender=Plan)
+def refresh_summary_on_plan_delete(sender, instance, **kwargs):
+    refresh_price_summaries({instance.service_id})
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def mark_service_for_search(sender, instance, **kwargs):
+    mark_services_changed({instance.pk})
+
+
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+def mark_plan_service_for_search(sender, instance, **kwargs):
+    """요금제 이름/혜택은 서비스 문서에 들어가므로 (옮겨졌다면 이전 서비스까지) 다시 색인합니다."""
+    mark_services_changed({instance.service_id, getattr(instance, '_previous_service_id', None)})
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+@receiver(post_save, sender=Card)
+@receiver(post_delete, sender=Card)
+@receiver(post_save, sender=Telecom)
+@receiver(post_delete, sender=Telecom)
+def invalidate_catalog_cache(sender, **kwargs):
+    """마스터 데이터가 바뀌면 카탈로그 버전을 올려 모든 워커의 캐시를 무효화합니다."""
+    bump_catalog_version()
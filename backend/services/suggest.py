@@ -0,0 +1,127 @@
+# services/suggest.py
+"""
+검색창 자동완성용 접두 검색 구조입니다.
+
+서비스 이름에서 만든 키(별칭)를 정렬된 배열에 넣어 두고 bisect로 접두 범위를 찾습니다.
+워커마다 메모리에 들고 있으므로 자동완성 요청은 DB를 조회하지 않고,
+카탈로그 버전이 바뀌었을 때만 Service 테이블에서 다시 읽습니다.
+
+별칭 종류 (우선순위 순)
+- 이름 전체: "넷플릭스", "disney plus" → 공백을 없앤 자모 문자열 (입력 중인 "넷ㅍ"도 일치)
+- 단어 시작: "Disney Plus" → "plus" 로도 찾을 수 있음
+- 초성: "넷플릭스" → "ㄴㅍㄹㅅ"
+"""
+import logging
+import threading
+import unicodedata
+from bisect import bisect_left
+
+from .cache import get_catalog_version
+from .models import Service
+from .search import CHOSEONG, HANGUL_BASE, HANGUL_LAST, normalize_words
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 20
+# 한 글자처럼 범위가 아주 넓은 접두어도 이 개수까지만 훑습니다.
+MAX_SCAN = 500
+
+PRIORITY_NAME = 0
+PRIORITY_WORD = 1
+PRIORITY_CHOSEONG = 2
+
+
+def choseong(text):
+    """한글 음절은 초성만, 그 외 문자는 그대로 남깁니다. ("넷플릭스" → "ㄴㅍㄹㅅ")"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            chars.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        elif not ch.isspace():
+            chars.append(ch)
+    return ''.join(chars)
+
+
+def _normalize(text):
+    return unicodedata.normalize('NFKC', text or '').lower()
+
+
+def aliases(name):
+    """서비스 이름에서 (키, 우선순위) 목록을 만듭니다."""
+    words = normalize_words(name)
+    if not words:
+        return []
+    keys = [(''.join(words), PRIORITY_NAME)]
+    # 두 번째 단어부터 시작하는 접미 (예: "disney plus" → "plus")
+    keys += [(''.join(words[i:]), PRIORITY_WORD) for i in range(1, len(words))]
+    initials = choseong(_normalize(name))
+    if initials and any(ch in CHOSEONG for ch in initials):
+        keys.append((initials, PRIORITY_CHOSEONG))
+    return keys
+
+
+class SuggestionIndex:
+    def __init__(self):
+        # (정렬된 별칭 키, 같은 순서의 (우선순위, 이름 길이, 이름, 서비스 id), 서비스 id → 응답 값)
+        # 갱신 시 튜플째 교체하므로 읽는 쪽은 잠금 없이 일관된 배열을 봅니다.
+        self.data = ([], [], {})
+        self.version = None
+
+    def load(self, services):
+        """services: (id, name, category) 목록. 새 배열을 만든 뒤 한 번에 교체합니다."""
+        rows = []
+        items = {}
+        for service_id, name, category in services:
+            items[service_id] = {'id': service_id, 'name': name, 'category': category}
+            for key, priority in set(aliases(name)):
+                rows.append((key, (priority, len(name), name, service_id)))
+        rows.sort()
+        self.data = ([key for key, _ in rows], [entry for _, entry in rows], items)
+
+    def suggest(self, query, limit=DEFAULT_LIMIT):
+        prefix = ''.join(normalize_words(query))
+        if not prefix:
+            return []
+        keys, entries, items = self.data
+
+        best = {}
+        start = bisect_left(keys, prefix)
+        for position in range(start, min(start + MAX_SCAN, len(keys))):
+            if not keys[position].startswith(prefix):
+                break
+            entry = entries[position]
+            service_id = entry[-1]
+            if service_id not in best or entry < best[service_id]:
+                best[service_id] = entry
+
+        ranked = sorted(best.values())[:limit]
+        return [items[entry[-1]] for entry in ranked]
+
+
+_index = SuggestionIndex()
+_lock = threading.Lock()
+
+
+def get_suggestion_index():
+    """카탈로그 버전이 바뀌었으면 Service에서 다시 읽어 교체합니다. (요청 처리 중인 다른 스레드는 이전 배열을 계속 사용)"""
+    version = get_catalog_version()
+    if _index.version != version:
+        with _lock:
+            if _index.version != version:
+                _index.load(Service.objects.order_by('pk').values_list('pk', 'name', 'category'))
+                _index.version = version
+    return _index
+
+
+def suggest_services(query, limit=DEFAULT_LIMIT):
+    return get_suggestion_index().suggest(query, limit=min(max(limit, 1), MAX_LIMIT))
+
+
+def warm_up():
+    """워커 시작 시 미리 불러 둡니다. DB가 아직 준비되지 않았으면 첫 요청 때 불러옵니다."""
+    try:
+        get_suggestion_index()
+    except Exception as e:
+        logger.warning("자동완성 색인을 미리 불러오지 못했습니다: %s", e)
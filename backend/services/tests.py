@@ -1,6 +1,21 @@
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
-from .models import Service, Plan
+from .models import Service, Plan, Card, ServicePriceSummary, PlanPriceHistory
+from . import search
+from .comparison import MAX_PLANS, MAX_SERVICES
 
 
 class PlanAPITestCase(APITestCase):
@@ -140,4 +155,557 @@ class ServiceAPITestCase(APITestCase):
         response = self.client.get(url)
 
         # Assert (검증): 잘못된 요청이므로 400 Bad Request가 와야 함
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ServicePriceSummaryTestCase(APITestCase):
+    def setUp(self):
+        self.service = Service.objects.create(name='Melon', category='music')
+        self.monthly = Plan.objects.create(service=self.service, plan_name='Monthly', price=10900)
+        self.yearly = Plan.objects.create(service=self.service, plan_name='Yearly',
+                                          billing_cycle='year', price=120000)
+
+    def test_summary_is_maintained_on_plan_changes(self):
+        """요금제 생성/수정/삭제 시 월 환산 요금 요약이 함께 갱신되는지 테스트"""
+        summary = ServicePriceSummary.objects.get(service=self.service)
+        self.assertEqual(summary.min_monthly_price, Decimal('10000.00'))
+        self.assertEqual(summary.max_monthly_price, Decimal('10900.00'))
+        self.assertEqual(summary.plan_count, 2)
+        self.assertEqual(summary.billing_cycles, 'month,year')
+
+        self.monthly.price = 8900
+        self.monthly.save()
+        self.yearly.delete()
+
+        summary.refresh_from_db()
+        self.assertEqual(summary.min_monthly_price, Decimal('8900.00'))
+        self.assertEqual(summary.max_monthly_price, Decimal('8900.00'))
+        self.assertEqual(summary.plan_count, 1)
+        self.assertEqual(summary.billing_cycles, 'month')
+
+    def test_rebuild_command_restores_summary(self):
+        """rebuild_price_summary 명령어로 요약을 처음부터 다시 만들 수 있는지 테스트"""
+        ServicePriceSummary.objects.all().delete()
+
+        call_command('rebuild_price_summary', stdout=StringIO())
+
+        summary = ServicePriceSummary.objects.get(service=self.service)
+        self.assertEqual(summary.min_monthly_price, Decimal('10000.00'))
+        self.assertEqual(summary.plan_count, 2)
+
+    def test_service_list_reads_prices_from_summary(self):
+        """서비스 목록의 min_price/max_price가 요약 테이블 값으로 내려오는지 테스트"""
+        response = self.client.get('/api/services/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        item = next(i for i in response.data if i['id'] == self.service.id)
+        self.assertEqual(Decimal(item['min_price']), Decimal('10000'))
+        self.assertEqual(Decimal(item['max_price']), Decimal('10900'))
+
+
+class CatalogCacheTestCase(APITestCase):
+    def setUp(self):
+        self.service = Service.objects.create(name='Watcha', category='video')
+        Plan.objects.create(service=self.service, plan_name='Basic', price=7900)
+
+    def test_repeated_list_is_served_from_cache(self):
+        """같은 조건의 목록 조회는 두 번째부터 DB를 조회하지 않는지 테스트"""
+        first = self.client.get('/api/services/?sort=name')
+
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/services/?sort=name')
+
+        self.assertEqual(first.data, second.data)
+
+    def test_catalog_write_invalidates_cache(self):
+        """요금제가 추가되면 카탈로그 버전이 올라가 새 데이터가 내려오는지 테스트"""
+        url = f'/api/services/{self.service.id}/plans/'
+        self.assertEqual(len(self.client.get(url).data), 1)
+
+        Plan.objects.create(service=self.service, plan_name='Premium', price=12900)
+
+        self.assertEqual(len(self.client.get(url).data), 2)
+
+
+class ConditionalRequestTestCase(APITestCase):
+    def setUp(self):
+        self.service = Service.objects.create(name='Spotify', category='music')
+        Plan.objects.create(service=self.service, plan_name='Individual', price=10900)
+
+    def test_list_returns_validators_and_304(self):
+        """ETag를 다시 보내면 본문 없이 304가 오는지 테스트"""
+        response = self.client.get('/api/services/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get('/api/services/', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_nested_plans_etag_changes_after_write(self):
+        """요금제가 바뀌면 이전 ETag로는 304가 아니라 새 데이터가 오는지 테스트"""
+        url = f'/api/services/{self.service.id}/plans/'
+        etag = self.client.get(url)['ETag']
+
+        Plan.objects.create(service=self.service, plan_name='Duo', price=16350)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_compare_supports_if_modified_since(self):
+        """비교 API도 Last-Modified 기준으로 304를 반환하는지 테스트"""
+        url = f'/api/services/compare/?plan_id={self.service.id}'
+        last_modified = self.client.get(url)['Last-Modified']
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class ServiceKeysetPaginationTestCase(APITestCase):
+    def setUp(self):
+        prices = [9900, 5500, 9900, 13900, 5500]
+        for index, price in enumerate(prices):
+            service = Service.objects.create(name=f'Service {index}', category='video')
+            Plan.objects.create(service=service, plan_name='Basic', price=price)
+
+    def _walk(self, url):
+        names, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            names += [item['name'] for item in response.data['results']]
+            url = response.data['next']
+            pages += 1
+        return names, pages
+
+    def test_cursor_walk_is_stable_with_duplicate_prices(self):
+        """같은 가격이 있어도 커서를 따라가면 누락/중복 없이 가격순으로 나오는지 테스트"""
+        names, pages = self._walk('/api/services/?sort=price&page_size=2')
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(names, ['Service 1', 'Service 4', 'Service 0', 'Service 2', 'Service 3'])
+
+    def test_descending_name_order(self):
+        """내림차순 정렬에서도 커서가 정상 동작하는지 테스트"""
+        names, _ = self._walk('/api/services/?sort=-name&page_size=3')
+
+        self.assertEqual(names, sorted(names, reverse=True))
+        self.assertEqual(len(names), 5)
+
+    def test_page_does_not_run_count_query(self):
+        """페이지 조회 시 COUNT(*) 쿼리를 실행하지 않는지 테스트"""
+        with self.assertNumQueries(1) as context:
+            self.client.get('/api/services/?sort=name&page_size=2')
+
+        self.assertNotIn('COUNT', context.captured_queries[0]['sql'].upper())
+
+    def test_invalid_cursor_returns_404(self):
+        """조작된 커서는 404로 거절하는지 테스트"""
+        response = self.client.get('/api/services/?cursor=not-a-cursor')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_without_pagination_params_returns_plain_list(self):
+        """페이지네이션 파라미터가 없으면 기존처럼 전체 목록(배열)을 반환하는지 테스트"""
+        response = self.client.get('/api/services/')
+
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+
+
+class ServiceSearchTestCase(APITestCase):
+    def setUp(self):
+        self.netflix = Service.objects.create(name='넷플릭스', category='video',
+                                              description='영화와 드라마 스트리밍')
+        Plan.objects.create(service=self.netflix, plan_name='프리미엄', price=17000, benefits='4K 화질')
+        self.melon = Service.objects.create(name='Melon', category='music',
+                                            description='국내 음원 스트리밍 서비스')
+        Plan.objects.create(service=self.melon, plan_name='스트리밍 클럽', price=7900, benefits='무제한 듣기')
+
+    def _search(self, query):
+        response = self.client.get('/api/services/', {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['name'] for item in response.data]
+
+    def test_korean_partial_and_typo_match(self):
+        """한글 부분 일치(넷플)와 받침이 빠진 오타(넷플릭)도 찾는지 테스트"""
+        self.assertEqual(self._search('넷플'), ['넷플릭스'])
+        self.assertEqual(self._search('넷플릭ㅅ'), ['넷플릭스'])
+        self.assertEqual(self._search('melno'), ['Melon'])
+
+    def test_description_and_plan_fields_are_searched(self):
+        """설명/요금제 이름/혜택으로도 검색되고, 설명보다 요금제 이름 일치가 먼저 오는지 테스트"""
+        self.assertEqual(self._search('4K'), ['넷플릭스'])
+        self.assertEqual(self._search('프리미엄'), ['넷플릭스'])
+        self.assertEqual(self._search('스트리밍'), ['Melon', '넷플릭스'])
+
+    def test_index_follows_catalog_writes(self):
+        """서비스가 추가/수정/삭제되면 다음 검색부터 반영되는지 테스트"""
+        self.assertEqual(self._search('왓챠'), [])
+
+        watcha = Service.objects.create(name='왓챠', category='video')
+        self.assertEqual(self._search('왓챠'), ['왓챠'])
+
+        watcha.name = '왓챠 플레이'
+        watcha.save()
+        self.assertEqual(self._search('플레이'), ['왓챠 플레이'])
+
+        watcha.delete()
+        self.assertEqual(self._search('왓챠'), [])
+
+    def test_only_changed_services_are_reindexed(self):
+        """변경 기록의 서비스만 다시 읽고, 카드 변경처럼 검색과 무관한 카탈로그 변경은 색인을 건드리지 않는지 테스트"""
+        self._search('넷플')
+        Card.objects.create(name='신한카드')
+        with mock.patch.object(search, '_load_documents', wraps=search._load_documents) as load:
+            self._search('넷플')
+        load.assert_not_called()
+
+        Plan.objects.create(service=self.melon, plan_name='오디오북', price=4900)
+        with mock.patch.object(search, '_load_documents', wraps=search._load_documents) as load:
+            self.assertEqual(self._search('오디오북'), ['Melon'])
+        load.assert_called_once_with({self.melon.id})
+
+    def test_search_filter_is_not_capped(self):
+        """검색 결과가 MAX_RESULTS보다 많아도 ?q= 필터와 키셋 페이지네이션으로 모두 볼 수 있는지 테스트"""
+        services = Service.objects.bulk_create(
+            Service(name=f'스트리밍 {i:03d}', category='video') for i in range(search.MAX_RESULTS + 5))
+        search.mark_services_changed(service.pk for service in services)
+
+        self.assertEqual(len(self._search('스트리밍')), search.MAX_RESULTS + 7)
+        data = self.client.get('/api/services/', {'q': '스트리밍', 'page_size': 100}).data
+        seen = len(data['results'])
+        while data['next']:
+            data = self.client.get(data['next']).data
+            seen += len(data['results'])
+        self.assertEqual(seen, search.MAX_RESULTS + 7)
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn('2건', out.getvalue())
+        self.assertEqual(self._search('멜론 스트리밍 클럽'), ['Melon'])
+
+
+class ServiceSuggestTestCase(APITestCase):
+    def setUp(self):
+        for name in ['넷플릭스', '네이버 플러스 멤버십', 'Disney Plus', 'Discovery', 'Netflix']:
+            Service.objects.create(name=name, category='video')
+
+    def _suggest(self, query, **params):
+        response = self.client.get('/api/services/suggest/', {'q': query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['name'] for item in response.data]
+
+    def test_prefix_word_and_choseong_aliases(self):
+        """이름 접두/입력 중인 자모/단어 시작/초성으로 찾고, 이름 접두 일치가 먼저 오는지 테스트"""
+        self.assertEqual(self._suggest('dis'), ['Discovery', 'Disney Plus'])
+        self.assertEqual(self._suggest('넷ㅍ'), ['넷플릭스'])
+        self.assertEqual(self._suggest('plus'), ['Disney Plus'])
+        self.assertEqual(self._suggest('ㄴㅍ'), ['넷플릭스'])
+        self.assertEqual(self._suggest('네이버플'), ['네이버 플러스 멤버십'])
+        self.assertEqual(self._suggest('d', limit=1), ['Discovery'])
+        self.assertEqual(self._suggest(''), [])
+
+    def test_suggest_does_not_query_database_until_catalog_changes(self):
+        """한 번 불러온 뒤에는 DB를 조회하지 않고, 서비스가 추가되면 다시 불러오는지 테스트"""
+        self._suggest('net')
+        with self.assertNumQueries(0):
+            self.assertEqual(self._suggest('net'), ['Netflix'])
+
+        Service.objects.create(name='Netmarble', category='game')
+
+        self.assertEqual(self._suggest('net'), ['Netflix', 'Netmarble'])
+
+
+class ServiceFilterCombinationTestCase(APITestCase):
+    def setUp(self):
+        self.wave = Service.objects.create(name='Wave', category='video')
+        Plan.objects.create(service=self.wave, plan_name='Basic', price=5000)
+        Plan.objects.create(service=self.wave, plan_name='Premium', price=20000)
+        self.flo = Service.objects.create(name='Flo', category='Music')
+        Plan.objects.create(service=self.flo, plan_name='Yearly', billing_cycle='year', price=120000)
+        self.tving = Service.objects.create(name='Tving', category='video')
+        Plan.objects.create(service=self.tving, plan_name='Standard', price=15000)
+        Plan.objects.create(service=self.tving, plan_name='Premium', price=17000)
+
+    def _names(self, query):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/services/', query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for captured in context.captured_queries:
+            self.assertNotIn('DISTINCT', captured['sql'].upper())
+        return [item['name'] for item in response.data]
+
+    def test_price_range_must_match_a_single_plan(self):
+        """최소/최대 가격은 같은 요금제 하나가 모두 만족해야 함 (5000원/20000원 요금제만 있는 Wave는 제외)"""
+        self.assertEqual(self._names({'min_price': 8000, 'max_price': 12000}), ['Flo'])
+
+    def test_categories_price_and_sort_compose_without_duplicates(self):
+        self.assertEqual(
+            self._names({'categories': 'VIDEO,music', 'min_price': 4000, 'max_price': 16000, 'sort': 'price'}),
+            ['Wave', 'Flo', 'Tving'])
+        self.assertEqual(self._names({'categories': 'video', 'max_price': 6000}), ['Wave'])
+        self.assertEqual(self._names({'categories': 'video', 'min_price': 16000, 'sort': '-price'}),
+                         ['Tving', 'Wave'])
+
+    def test_service_without_summary_row_is_not_dropped(self):
+        """요약 행이 없는 서비스도 요금제 기준으로 가격 필터에 걸리는지 테스트"""
+        ServicePriceSummary.objects.filter(service=self.tving).delete()
+        self.assertEqual(self._names({'categories': 'video', 'min_price': 14000, 'max_price': 16000}), ['Tving'])
+        self.assertEqual(self._names({'categories': 'video', 'max_price': 6000}), ['Wave'])
+
+    def test_benchmark_command_runs_and_rolls_back(self):
+        out = StringIO()
+        call_command('benchmark_service_filters', plans=40, repeat=1, stdout=out)
+
+        self.assertIn('[current]', out.getvalue())
+        self.assertIn('distinct=False', out.getvalue())
+        self.assertFalse(Service.objects.filter(name__startswith='bench-').exists())
+
+
+class ComparisonMatrixTestCase(APITestCase):
+    def setUp(self):
+        self.netflix = Service.objects.create(name='Netflix', category='video')
+        self.basic = Plan.objects.create(service=self.netflix, plan_name='Basic', price=9500,
+                                         benefits='HD 화질, 광고 없음')
+        self.premium = Plan.objects.create(service=self.netflix, plan_name='Premium', price=17000,
+                                           benefits='4K 화질, 광고 없음, 동시 시청 4명')
+        self.disney = Service.objects.create(name='Disney+', category='video')
+        self.yearly = Plan.objects.create(service=self.disney, plan_name='Yearly', billing_cycle='year',
+                                          price=99000, benefits='4k 화질,  광고 없음')
+
+    def test_service_matrix_prices_cheapest_and_benefits(self):
+        url = f'/api/services/compare/matrix/?service_ids={self.disney.id},{self.netflix.id}'
+        with self.assertNumQueries(2):
+            data = self.client.get(url).data
+
+        services = {row['id']: row for row in data['services']}
+        self.assertEqual(services[self.netflix.id]['cheapest_plan_id'], self.basic.id)
+        self.assertEqual(services[self.disney.id]['min_monthly_price'], Decimal('8250.00'))
+        self.assertEqual(data['cheapest'], {'service_id': self.disney.id, 'plan_id': self.yearly.id,
+                                            'monthly_price': Decimal('8250.00')})
+        self.assertEqual(data['common_benefits'], ['광고 없음'])
+        benefits = {row['name']: row for row in data['benefits']}
+        self.assertEqual(sorted(benefits['4K 화질']['plan_ids']), [self.premium.id, self.yearly.id])
+
+    def test_plan_matrix_and_cache_by_sorted_ids(self):
+        url = '/api/services/compare/matrix/?plan_ids={},{}'
+        data = self.client.get(url.format(self.premium.id, self.yearly.id)).data
+        self.assertEqual([len(row['plans']) for row in data['services']], [1, 1])
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url.format(self.yearly.id, self.premium.id)).data
+        self.assertEqual(cached, data)
+
+    def test_requires_exactly_one_id_kind(self):
+        response = self.client.get(f'/api/services/compare/matrix/?service_ids=1&plan_ids={self.basic.id}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/services/compare/matrix/?service_ids=a,b')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_too_many_ids_is_rejected_not_truncated(self):
+        ids = ','.join(str(i) for i in range(1, MAX_PLANS + 2))
+        response = self.client.get(f'/api/services/compare/matrix/?plan_ids={ids}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(f'최대 {MAX_PLANS}개', response.data['error'])
+
+        ids = ','.join(str(i) for i in range(1, MAX_SERVICES + 2))
+        response = self.client.get(f'/api/services/compare/?ids={ids}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(f'최대 {MAX_SERVICES}개', response.data['error'])
+        # 중복 id는 한 번으로 셉니다.
+        ids = ','.join([str(self.netflix.id)] * (MAX_SERVICES + 1))
+        response = self.client.get(f'/api/services/compare/?ids={ids}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_legacy_compare_prefetches_plans(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/services/compare/?plan_id={self.netflix.id},{self.disney.id}')
+        self.assertEqual(len(response.data), 2)
+
+
+class AsyncCatalogViewTestCase(APITestCase):
+    def setUp(self):
+        self.netflix = Service.objects.create(name='Netflix', category='video')
+        self.basic = Plan.objects.create(service=self.netflix, plan_name='Basic', price=9500,
+                                         benefits='HD 화질, 광고 없음')
+        self.disney = Service.objects.create(name='Disney+', category='video')
+        Plan.objects.create(service=self.disney, plan_name='Yearly', billing_cycle='year', price=99000,
+                            benefits='4K 화질, 광고 없음')
+        Card.objects.create(name='신한카드')
+
+    def async_get(self, url, **extra):
+        return async_to_sync(self.async_client.get)(url, **extra)
+
+    def test_matrix_matches_sync_view_and_shares_cache(self):
+        """비동기 매트릭스는 동기 뷰와 같은 JSON/ETag를 내고, 동기 뷰가 채운 캐시를 그대로 쓰는지 테스트"""
+        url = f'services/compare/matrix/?service_ids={self.disney.id},{self.netflix.id}'
+        sync = self.client.get(f'/api/{url}')
+
+        with self.assertNumQueries(0):
+            response = self.async_get(f'/api/async/{url}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, sync.content)
+        self.assertEqual(response['ETag'], sync['ETag'])
+
+        response = self.async_get(f'/api/async/{url}', headers={'If-None-Match': sync['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_compare_uses_async_orm_with_prefetch(self):
+        url = f'/api/async/services/compare/?plan_id={self.netflix.id},{self.disney.id}'
+        with self.assertNumQueries(2):
+            response = self.async_get(url)
+        data = response.json()
+        self.assertEqual([row['name'] for row in data], ['Netflix', 'Disney+'])
+        self.assertEqual(data[0]['plans'][0]['plan_name'], 'Basic')
+
+        self.assertEqual(self.async_get('/api/async/services/compare/').status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.async_get('/api/async/services/compare/matrix/?service_ids=a,b')
+        self.assertEqual(response.json(), {'error': 'Invalid ID format'})
+
+        ids = ','.join(str(i) for i in range(1, MAX_SERVICES + 2))
+        for url in (f'/api/async/services/compare/?ids={ids}', f'/api/async/services/compare/matrix/?service_ids={ids}'):
+            response = self.async_get(url)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(f'최대 {MAX_SERVICES}개', response.json()['error'])
+
+    def test_card_list(self):
+        response = self.async_get('/api/async/cards/')
+        self.assertEqual([row['name'] for row in response.json()], ['신한카드'])
+        self.assertEqual(self.client.get('/api/cards/').content, response.content)
+
+
+class ImportCatalogTestCase(APITestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.existing = Service.objects.create(name='Netflix', category='video', description='영상')
+        Plan.objects.create(service=self.existing, plan_name='Basic', price=9500)
+        Plan.objects.create(service=self.existing, plan_name='Premium', price=17000)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8-sig') as f:
+            f.write(content)
+        return path
+
+    def _import(self, *args, **options):
+        out, err = StringIO(), StringIO()
+        call_command('import_catalog', *args, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_services_csv_upserts_by_name(self):
+        path = self._write('Service.csv', (
+            "service_id,name,category,description,official_link\n"
+            "1,Netflix,video,글로벌 영상 스트리밍 서비스,https://netflix.com\n"
+            "2,TVING,video,국내 OTT,https://tving.com\n"
+            "3,,video,이름 없음,\n"
+        ))
+        out, err = self._import(path, batch_size=2)
+
+        self.assertIn('inserted=1 updated=1 unchanged=0 invalid=1', out)
+        self.assertIn(':4: name', err)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.description, '글로벌 영상 스트리밍 서비스')
+        self.assertTrue(ServicePriceSummary.objects.filter(service__name='TVING').exists())
+
+        out, _ = self._import(path)
+        self.assertIn('inserted=0 updated=0 unchanged=2 invalid=1', out)
+
+    def test_plan_price_sheet_updates_prices_and_summaries(self):
+        path = self._write('plans.jsonl', '\n'.join(json.dumps(row, ensure_ascii=False) for row in [
+            {'service': 'Netflix', 'plan_name': 'Basic', 'price': '9,500'},
+            {'service': 'Netflix', 'plan_name': 'Premium', 'price': '17900'},
+            {'service_id': self.existing.id, 'plan_name': 'Yearly', 'billing_cycle': 'year', 'price': 60000},
+            {'service': '없는 서비스', 'plan_name': 'Basic', 'price': 1000},
+            {'service': 'Netflix', 'plan_name': 'Weekly', 'billing_cycle': 'week', 'price': 1000},
+        ]))
+        out, err = self._import(path)
+
+        self.assertIn('inserted=1 updated=1 unchanged=1 invalid=2', out)
+        self.assertEqual(Plan.objects.get(plan_name='Premium').price, Decimal('17900'))
+        self.assertEqual(PlanPriceHistory.objects.filter(plan__service=self.existing).count(), 4)
+        summary = ServicePriceSummary.objects.get(service=self.existing)
+        self.assertEqual((summary.min_monthly_price, summary.max_monthly_price, summary.plan_count),
+                         (Decimal('5000.00'), Decimal('17900.00'), 3))
+
+    def test_dry_run_does_not_write(self):
+        path = self._write('plans.csv', "service,plan_name,price\nNetflix,Premium,19000\n")
+        out, _ = self._import(path, dry_run=True)
+
+        self.assertIn('[dry-run]', out)
+        self.assertIn('updated=1', out)
+        self.assertEqual(Plan.objects.get(plan_name='Premium').price, Decimal('17000'))
+
+
+class PlanPriceHistoryTestCase(APITestCase):
+    def setUp(self):
+        self.service = Service.objects.create(name='Spotify', category='music')
+        self.plan = Plan.objects.create(service=self.service, plan_name='Individual', price=10900)
+        self.url = f'/api/services/{self.service.id}/plans/{self.plan.id}/history/'
+
+    def _record(self, plan, price, billing_cycle, recorded_at):
+        return PlanPriceHistory.objects.create(plan=plan, price=price, billing_cycle=billing_cycle,
+                                               recorded_at=recorded_at)
+
+    def test_changes_are_recorded_only_for_price_or_cycle(self):
+        self.plan.benefits = '광고 없음'
+        self.plan.save()
+        self.plan.price = 11990
+        self.plan.save()
+        self.plan.billing_cycle = 'year'
+        self.plan.price = '119900'
+        self.plan.save()
+
+        history = list(self.plan.price_history.order_by('pk').values_list('price', 'billing_cycle'))
+        self.assertEqual(history, [(Decimal('10900'), 'month'), (Decimal('11990'), 'month'),
+                                   (Decimal('119900'), 'year')])
+
+        points = self.client.get(self.url).data['points']
+        self.assertEqual([point['monthly_price'] for point in points],
+                         [Decimal('10900.00'), Decimal('11990.00'), Decimal('9991.67')])
+
+    def test_range_and_downsampling(self):
+        self.plan.price_history.all().delete()
+        start = timezone.make_aware(datetime(2024, 1, 1))
+        for day in range(60):
+            self._record(self.plan, 10000 + day * 10, 'month', start + timedelta(days=day))
+
+        data = self.client.get(self.url, {'points': 6}).data
+        self.assertEqual(len(data['points']), 6)
+        self.assertEqual(data['points'][0]['min_monthly_price'], Decimal('10000.00'))
+        self.assertEqual(data['points'][-1]['price'], Decimal('10590'))
+
+        ranged = self.client.get(self.url, {'from': '2024-01-10T12:00:00', 'to': '2024-01-12'}).data['points']
+        # 구간 시작 시점 값(1/10 기록분) + 1/11, 1/12
+        self.assertEqual([point['price'] for point in ranged], [Decimal('10090'), Decimal('10100'), Decimal('10110')])
+
+        self.assertEqual(self.client.get(self.url, {'from': 'yesterday'}).status_code, status.HTTP_400_BAD_REQUEST)
+        other = Service.objects.create(name='Other')
+        response = self.client.get(f'/api/services/{other.id}/plans/{self.plan.id}/history/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_compaction_collapses_unchanged_runs(self):
+        start = timezone.now() - timedelta(days=10)
+        for day, price in enumerate([10900, 10900, 11900, 11900, 11900, 10900]):
+            self._record(self.plan, price, 'month', start + timedelta(days=day))
+
+        out = StringIO()
+        call_command('compact_price_history', batch_size=2, stdout=out)
+
+        self.assertIn('4행을 정리', out.getvalue())
+        self.assertEqual(list(self.plan.price_history.order_by('recorded_at').values_list('price', flat=True)),
+                         [Decimal('10900'), Decimal('11900'), Decimal('10900')])
+
+    def test_history_rows_are_append_only(self):
+        row = self.plan.price_history.get()
+        row.price = 1
+        with self.assertRaises(ValueError):
+            row.save()
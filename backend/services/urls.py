@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework_nested import routers
-from .views import ServiceViewSet, PlanViewSet, CardViewSet, TelecomViewSet, ComparisonView
+from .views import ServiceViewSet, PlanViewSet, CardViewSet, TelecomViewSet, ComparisonView, ComparisonMatrixView
+from . import async_views
 
 router = routers.DefaultRouter()
 router.register(r'services', ServiceViewSet, basename='service')
@@ -12,6 +13,12 @@ plans_router.register(r'plans', PlanViewSet, basename='service-plans')
 
 urlpatterns = [
     path('services/compare/', ComparisonView.as_view(), name='service-comparison'),
+    path('services/compare/matrix/', ComparisonMatrixView.as_view(), name='service-comparison-matrix'),
+    # 같은 조회의 비동기 버전 (ASGI/uvicorn 배포용, services/async_views.py)
+    path('async/services/compare/', async_views.comparison, name='async-service-comparison'),
+    path('async/services/compare/matrix/', async_views.comparison_matrix, name='async-service-comparison-matrix'),
+    path('async/cards/', async_views.card_list, name='async-card-list'),
+    path('async/telecoms/', async_views.telecom_list, name='async-telecom-list'),
     path('', include(router.urls)),
     path('', include(plans_router.urls)),
 ]
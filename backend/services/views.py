@@ -1,40 +1,49 @@
-from django.db.models import Min, Max, Case, When, F, Value, DecimalField
+from datetime import datetime, time
+
+from django.db.models import Value, DecimalField
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.db.models.functions import Coalesce
 
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from backend.pagination import KeysetPagination
+
+from .cache import CatalogCacheMixin, conditional_cached_response
+from .comparison import build_matrix, compare_request_ids, load_services, matrix_request_ids
 from .models import Service, Plan, Card, Telecom
 from .serializers import ServiceSerializer, ServiceDetailSerializer, \
                         PlanSerializer, CardSerializer, TelecomSerializer
 
 from .filters import ServiceFilter
+from .history import DEFAULT_POINTS, MAX_POINTS, price_timeline
+from .suggest import DEFAULT_LIMIT, MAX_LIMIT, suggest_services
 
 
-class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
+class ServiceViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """
     모든 구독 서비스의 목록 및 상세 정보를 조회합니다.
     (권한: 누구나 조회 가능)
     """
+    catalog_cache_scope = 'services'
     serializer_class = ServiceSerializer
     filterset_class = ServiceFilter
+    # ?cursor= / ?page_size= 를 보낸 경우에만 키셋 페이지네이션 적용 (backend/pagination.py)
+    pagination_class = KeysetPagination
     permission_classes = [AllowAny]
-    monthly_price_expression = Case(
-        When(
-            plans__billing_cycle='year',
-            then=F('plans__price') / 12),
-        default=F('plans__price'),
-        output_field=DecimalField(max_digits=10, decimal_places=2)
-    )
-
+    # 월 환산 최소/최대 가격은 service_price_summary에 미리 계산되어 있으므로
+    # plan JOIN + GROUP BY 없이 서비스당 한 행만 읽습니다. (services/pricing.py 참고)
     queryset = Service.objects.all().annotate(
-        min_price=Coalesce(Min(monthly_price_expression),
+        min_price=Coalesce('price_summary__min_monthly_price',
                            Value(0, output_field=DecimalField(max_digits=10, decimal_places=2))),
-        max_price=Coalesce(Max(monthly_price_expression),
+        max_price=Coalesce('price_summary__max_monthly_price',
                            Value(0, output_field=DecimalField(max_digits=10, decimal_places=2)))
     )
 
@@ -43,12 +52,33 @@ class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
             return ServiceDetailSerializer
         return ServiceSerializer
 
+    @extend_schema(
+        description="검색창 자동완성. 서비스 이름/단어/초성 접두 일치 결과를 DB 조회 없이 반환합니다.",
+        parameters=[
+            OpenApiParameter('q', str, description='입력 중인 검색어'),
+            OpenApiParameter('limit', int, description=f'최대 개수 (기본 {DEFAULT_LIMIT}, 최대 {MAX_LIMIT})'),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """
+        URL: /api/services/suggest/?q=넷플
+        워커 메모리의 접두 색인(services/suggest.py)만 사용합니다.
+        """
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        return Response(suggest_services(request.query_params.get('q', ''), limit=limit))
+
 
-class PlanViewSet(viewsets.ReadOnlyModelViewSet):
+class PlanViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """
     특정 서비스에 속한 요금제 목록 및 상세 정보를 조회합니다.
     (권한: 누구나 조회 가능)
     """
+    catalog_cache_scope = 'plans'
     serializer_class = PlanSerializer
     permission_classes = [AllowAny]
 
@@ -61,24 +91,73 @@ class PlanViewSet(viewsets.ReadOnlyModelViewSet):
 
         return Plan.objects.filter(service_id=self.kwargs['service_pk'])
 
+    @extend_schema(
+        description="요금제 가격 변경 이력을 시계열로 반환합니다. 점이 많으면 points개 구간으로 다운샘플링합니다.",
+        parameters=[
+            OpenApiParameter('from', str, description='시작 시각 (YYYY-MM-DD 또는 ISO 8601)'),
+            OpenApiParameter('to', str, description='끝 시각 (YYYY-MM-DD 또는 ISO 8601)'),
+            OpenApiParameter('points', int, description=f'최대 점 개수 (기본 {DEFAULT_POINTS}, 최대 {MAX_POINTS})'),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=True, methods=['get'])
+    def history(self, request, service_pk=None, pk=None):
+        """
+        URL: /api/services/{service_id}/plans/{plan_id}/history/
+        가격이 바뀌면 카탈로그 버전이 올라가므로 다른 목록과 같은 방식으로 캐시됩니다.
+        """
+        try:
+            start = _parse_moment(request.query_params.get('from'))
+            end = _parse_moment(request.query_params.get('to'), end_of_day=True)
+            points = int(request.query_params.get('points', DEFAULT_POINTS))
+        except ValueError:
+            return Response({"error": "from/to/points 형식이 올바르지 않습니다."}, status=400)
+
+        def render():
+            plan = self.get_object()
+            return {
+                'plan_id': plan.id,
+                'service_id': plan.service_id,
+                'points': price_timeline(plan, start=start, end=end, points=points),
+            }
+
+        return self.cached_response(request, 'history', render)
+
+
+def _parse_moment(value, end_of_day=False):
+    """'2025-01-31' 또는 ISO 8601 문자열을 aware datetime으로 바꿉니다. 날짜만 오면 그날 0시(또는 끝)."""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
 
 # --- 기타 마스터 데이터 API ---
 
-class CardViewSet(viewsets.ReadOnlyModelViewSet):
+class CardViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """
     카드사 목록 및 상세 정보를 조회합니다.
     (권한: 누구나 조회 가능)
     """
+    catalog_cache_scope = 'cards'
     queryset = Card.objects.all()
     serializer_class = CardSerializer
     permission_classes = [AllowAny]
 
 
-class TelecomViewSet(viewsets.ReadOnlyModelViewSet):
+class TelecomViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """
     통신사 목록 및 상세 정보를 조회합니다.
     (권한: 누구나 조회 가능)
     """
+    catalog_cache_scope = 'telecoms'
     queryset = Telecom.objects.all()
     serializer_class = TelecomSerializer
     permission_classes = [AllowAny]
@@ -97,15 +176,46 @@ class ComparisonView(APIView):
         responses=ServiceDetailSerializer(many=True)
     )
     def get(self, request):
-        ids_str = request.query_params.get('plan_id', '')
-        if not ids_str:
-            return Response({"error": "No service IDs provided"}, status=400)
+        try:
+            service_ids = compare_request_ids(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        def render():
+            # 요금제를 서비스마다 따로 조회하지 않도록 prefetch (쿼리 2번)
+            services = Service.objects.filter(pk__in=service_ids).prefetch_related('plans')
+            return ServiceDetailSerializer(services, many=True).data
+
+        params = {'ids': ','.join(str(i) for i in service_ids)}
+        return conditional_cached_response(request, 'compare', params, None, render)
+
+
+class ComparisonMatrixView(APIView):
+    permission_classes = [AllowAny]
+    throttle_classes = [AnonRateThrottle, UserRateThrottle]
+    throttle_scope = 'comparison'
 
+    @extend_schema(
+        description=(
+            "서비스 id(service_ids, 최대 5개) 또는 요금제 id(plan_ids, 최대 10개, 넘으면 400)를 받아 "
+            "요금제별 월 환산 가격, 서비스별 최저가 요금제, 혜택 겹침을 계산한 비교 매트릭스를 반환합니다."
+        ),
+        parameters=[
+            OpenApiParameter('service_ids', str, description='쉼표로 구분한 서비스 id'),
+            OpenApiParameter('plan_ids', str, description='쉼표로 구분한 요금제 id'),
+        ],
+        request=None,
+        responses=OpenApiTypes.OBJECT,
+    )
+    def get(self, request):
         try:
-            service_ids = [int(id) for id in ids_str.split(',')][:5]
-        except ValueError:
-            return Response({"error": "Invalid ID format"}, status=400)
+            kind, ids = matrix_request_ids(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        def render():
+            return build_matrix(load_services(**{kind: ids}))
 
-        services = Service.objects.filter(pk__in=service_ids)
-        serializer = ServiceDetailSerializer(services, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        # 정렬된 id 집합을 키로 캐시하므로 순서만 다른 같은 비교는 캐시에서 바로 응답합니다.
+        params = {kind: ','.join(str(i) for i in ids)}
+        return conditional_cached_response(request, 'compare:matrix', params, None, render)
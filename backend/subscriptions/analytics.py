@@ -0,0 +1,87 @@
+# subscriptions/analytics.py
+from datetime import date, datetime
+from decimal import Decimal
+from math import ceil
+
+from dateutil.relativedelta import relativedelta
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+from .pricing import summarize_by_category, effective_price_expression, monthly_subscription_price
+
+PROJECTION_MONTHS = 12
+
+
+def _spend_by_service(queryset):
+    rows = (
+        queryset.order_by()
+        .values('plan__service_id', 'plan__service__name', 'plan__service__category')
+        .annotate(count=Count('pk'), total_price=Sum(monthly_subscription_price()))
+        .order_by('-total_price', 'plan__service_id')
+    )
+    return [
+        {
+            'service_id': row['plan__service_id'],
+            'service_name': row['plan__service__name'],
+            'category': row['plan__service__category'],
+            'count': row['count'],
+            'total_price': ceil(row['total_price'] or 0),
+        }
+        for row in rows
+    ]
+
+
+def _projection(queryset, today):
+    """
+    앞으로 12개월 동안 달마다 실제로 결제될 금액을 추정합니다.
+    (결제 주기, 다음 결제월) 단위로 GROUP BY 한 작은 결과만 파이썬에서 달력에 펼칩니다.
+    - month: 다음 결제월부터 매달 결제
+    - year : 다음 결제월에 한 번 (12개월 창 안에서는 최대 한 번)
+    다음 결제일이 이미 지난 구독은 이번 달부터 주기에 맞춰 이어진다고 봅니다.
+    """
+    start = today.replace(day=1)
+    months = [start + relativedelta(months=i) for i in range(PROJECTION_MONTHS)]
+    totals = {month: Decimal('0') for month in months}
+
+    rows = (
+        queryset.order_by()
+        .values('plan__billing_cycle', payment_month=TruncMonth('next_payment_date'))
+        .annotate(amount=Sum(effective_price_expression()))
+    )
+    for row in rows:
+        amount = row['amount'] or Decimal('0')
+        first = row['payment_month']
+        if isinstance(first, datetime):
+            first = first.date()
+        if row['plan__billing_cycle'] == 'year':
+            while first < start:
+                first += relativedelta(years=1)
+            if first in totals:
+                totals[first] += amount
+        else:
+            for month in months:
+                if month >= first:
+                    totals[month] += amount
+
+    return [
+        {'month': month.strftime('%Y-%m'), 'total_price': ceil(totals[month])}
+        for month in months
+    ]
+
+
+def build_spending_summary(queryset, today=None):
+    """
+    사용 중(status=True)인 구독 기준 지출 요약을 만듭니다.
+    카테고리별/서비스별 월 환산 지출과 12개월 결제 예상액을 모두 GROUP BY 집계로 계산합니다.
+    """
+    today = today or date.today()
+    queryset = queryset.filter(status=True)
+
+    count, total_price, categories = summarize_by_category(queryset)
+    return {
+        'count': count,
+        'total_price': ceil(total_price),
+        'by_category': [{**row, 'total_price': ceil(row['total_price'])} for row in categories],
+        'by_service': _spend_by_service(queryset),
+        'projection': _projection(queryset, today),
+    }
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SubscriptionConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "subscriptions"
+
+    def ready(self):
+        # 구독 변경 시 사용자별 캐시를 무효화하는 시그널 등록
+        from . import signals  # noqa: F401
@@ -0,0 +1,56 @@
+# subscriptions/cache.py
+import hashlib
+import time
+
+from django.core.cache import cache
+
+from services.cache import get_catalog_version
+
+
+# 목록/요약 캐시 보관 시간. 버전이 바뀌면 키가 달라지므로 만료는 메모리 정리 용도입니다.
+USER_CACHE_TIMEOUT = 60 * 60
+
+
+def _version_key(user_id):
+    return f'subscriptions:user:{user_id}:version'
+
+
+def get_user_version(user_id):
+    """사용자별 구독/북마크 데이터 버전. 구독이나 북마크가 바뀔 때마다 올라갑니다."""
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), int(time.time() * 1000), timeout=None)
+        version = cache.get(_version_key(user_id))
+    return version
+
+
+def bump_user_version(user_id):
+    current = cache.get(_version_key(user_id)) or 0
+    cache.set(_version_key(user_id), max(int(time.time() * 1000), current + 1), timeout=None)
+
+
+def user_cache_key(user_id, scope, *parts):
+    """
+    사용자 버전 + 카탈로그 버전(요금제 가격 변경 반영)을 포함한 캐시 키를 만듭니다.
+    둘 중 하나라도 바뀌면 키가 달라져 예전 값은 자연스럽게 버려집니다.
+    """
+    raw = '&'.join(str(p) for p in parts)
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return f'subscriptions:{user_id}:{get_user_version(user_id)}:{get_catalog_version()}:{scope}:{digest}'
+
+
+def cached_user_data(request, scope, build, timeout=USER_CACHE_TIMEOUT):
+    """
+    로그인한 사용자의 응답 데이터를 캐시에서 꺼내고, 없으면 build()로 만들어 저장합니다.
+    쿼리 파라미터(페이지 커서 등)와 호스트(next 링크)가 다르면 다른 키를 씁니다.
+    """
+    params = request.query_params
+    parts = [request.get_host()] + [
+        f"{name}={','.join(sorted(params.getlist(name)))}" for name in sorted(params.keys())
+    ]
+    key = user_cache_key(request.user.pk, scope, *parts)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout=timeout)
+    return data
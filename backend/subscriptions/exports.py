@@ -0,0 +1,63 @@
+# subscriptions/exports.py
+import csv
+from math import ceil
+
+from .pricing import monthly_subscription_price
+
+CSV_CHUNK_SIZE = 2000
+
+USER_COLUMNS = ['서비스명', '요금제', '월 가격', '다음 결제일']
+ADMIN_COLUMNS = ['사용자 ID', '아이디', '서비스명', '요금제', '결제 주기', '월 가격', '상태', '다음 결제일']
+
+
+class Echo:
+    """csv.writer가 쓴 한 줄을 버퍼에 쌓지 않고 그대로 돌려주는 가짜 파일 객체"""
+
+    def write(self, value):
+        return value
+
+
+def iter_values(queryset, fields, chunk_size=CSV_CHUNK_SIZE):
+    """
+    pk 기준 키셋으로 chunk_size씩 끊어서 values_list 튜플을 내보냅니다.
+    MySQL/MariaDB 드라이버는 iterator()를 써도 결과 전체를 클라이언트 메모리에 올리므로,
+    청크마다 새 쿼리를 실행해 메모리 사용량을 일정하게 유지합니다.
+    """
+    queryset = queryset.annotate(monthly_price=monthly_subscription_price()).order_by('pk')
+    last_pk = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk).values_list('pk', *fields)[:chunk_size])
+        if not rows:
+            return
+        for row in rows:
+            yield row[1:]
+        last_pk = rows[-1][0]
+
+
+def _stream(columns, rows):
+    writer = csv.writer(Echo())
+    yield '\ufeff'  # 한글 깨짐 방지 (BOM 추가)
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_user_csv(queryset):
+    fields = ('plan__service__name', 'plan__plan_name', 'monthly_price', 'next_payment_date')
+    rows = (
+        (service, plan, ceil(price or 0), next_payment)
+        for service, plan, price, next_payment in iter_values(queryset, fields)
+    )
+    return _stream(USER_COLUMNS, rows)
+
+
+def stream_admin_csv(queryset):
+    fields = ('user_id', 'user__username', 'plan__service__name', 'plan__plan_name',
+              'plan__billing_cycle', 'monthly_price', 'status', 'next_payment_date')
+    rows = (
+        (user_id, username, service, plan, cycle, ceil(price or 0),
+         '사용' if active else '해지', next_payment)
+        for user_id, username, service, plan, cycle, price, active, next_payment
+        in iter_values(queryset, fields)
+    )
+    return _stream(ADMIN_COLUMNS, rows)
@@ -0,0 +1,42 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from subscriptions.renewals import DEFAULT_CHUNK_SIZE, advance_renewals
+
+
+class Command(BaseCommand):
+    help = (
+        "결제일이 지난 구독의 다음 결제일(next_payment_date)을 결제 주기에 맞춰 넘깁니다. "
+        "매일 cron 등으로 실행하며, 여러 번 실행하거나 중간에 멈췄다 다시 실행해도 안전합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="기준일 YYYY-MM-DD (기본: 오늘)")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help=f"한 트랜잭션에서 처리할 구독 수 (기본 {DEFAULT_CHUNK_SIZE})")
+        parser.add_argument('--limit', type=int, help="이번 실행에서 처리할 최대 구독 수")
+        parser.add_argument('--dry-run', action='store_true', help="DB에 쓰지 않고 대상 수만 확인합니다.")
+
+    def handle(self, *args, **options):
+        try:
+            as_of = date.fromisoformat(options['date']) if options['date'] else None
+        except ValueError:
+            raise CommandError("--date는 YYYY-MM-DD 형식이어야 합니다.")
+
+        verbosity = options['verbosity']
+
+        def report(progress):
+            if verbosity >= 2:
+                metrics = progress.as_dict()
+                self.stdout.write(
+                    f"  chunk {metrics['chunks']}: {metrics['advanced']}건 "
+                    f"({metrics['rows_per_second']}건/s, {metrics['elapsed_seconds']}s)")
+
+        progress = advance_renewals(as_of=as_of, chunk_size=options['chunk_size'], dry_run=options['dry_run'],
+                                    limit=options['limit'], on_progress=report)
+        metrics = progress.as_dict()
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}구독 {metrics['advanced']}건의 결제일을 넘겼습니다. "
+            f"(청크 {metrics['chunks']}개, {metrics['elapsed_seconds']}s, {metrics['rows_per_second']}건/s)"))
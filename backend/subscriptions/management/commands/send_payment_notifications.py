@@ -0,0 +1,50 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from subscriptions.notifications import BATCH_SIZE, DAYS_AHEAD, MAX_WORKERS, send_payment_notifications
+
+
+class Command(BaseCommand):
+    help = (
+        "결제일이 다가온 구독을 사용자별로 묶어 알림 메일을 보냅니다. "
+        "이미 보낸 (구독, 결제일)은 건너뛰므로 다시 실행해도 중복 발송하지 않습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="기준일 YYYY-MM-DD (기본: 오늘)")
+        parser.add_argument('--days', type=int, default=DAYS_AHEAD,
+                            help=f"기준일부터 며칠 안의 결제일을 알릴지 (기본 {DAYS_AHEAD})")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f"한 번에 읽고 발송하는 사용자 수 (기본 {BATCH_SIZE})")
+        parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                            help=f"동시에 메일을 보내는 스레드 수 (기본 {MAX_WORKERS})")
+        parser.add_argument('--backend', help="메일 백엔드 경로 (기본: settings.EMAIL_BACKEND)")
+        parser.add_argument('--dry-run', action='store_true', help="메일을 보내지 않고 대상 수만 확인합니다.")
+
+    def handle(self, *args, **options):
+        try:
+            as_of = date.fromisoformat(options['date']) if options['date'] else None
+        except ValueError:
+            raise CommandError("--date는 YYYY-MM-DD 형식이어야 합니다.")
+        if options['days'] < 0 or options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError("--days는 0 이상, --batch-size/--workers는 1 이상이어야 합니다.")
+
+        verbosity = options['verbosity']
+
+        def report(stats):
+            if verbosity >= 2:
+                self.stdout.write(f"  batch {stats.batches}: 사용자 {stats.users}명, 발송 {stats.sent}건")
+
+        stats = send_payment_notifications(
+            as_of=as_of, days=options['days'], batch_size=options['batch_size'],
+            max_workers=options['workers'], dry_run=options['dry_run'], backend=options['backend'],
+            on_progress=report)
+        metrics = stats.as_dict()
+        if options['dry_run']:
+            self.stdout.write(f"[dry-run] 대상 사용자 {metrics['users']}명 / 구독 {metrics['subscriptions']}건")
+            return
+        style = self.style.SUCCESS if not metrics['failed'] else self.style.WARNING
+        self.stdout.write(style(
+            f"알림 {metrics['sent']}통 발송, 실패 {metrics['failed']}통 "
+            f"(구독 {metrics['subscriptions']}건, {metrics['elapsed_seconds']}s)"))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Bookmark',
+            fields=[
+                ('id', models.BigAutoField(db_column='bookmark_id', help_text='Bookmark ID', primary_key=True, serialize=False)),
+                ('memo', models.TextField(blank=True, db_column='memo', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='created_at')),
+            ],
+            options={
+                'db_table': 'bookmark',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Subscription',
+            fields=[
+                ('id', models.BigAutoField(db_column='subscription_id', help_text='Subscription ID', primary_key=True, serialize=False)),
+                ('status', models.BooleanField(db_column='status', default=True)),
+                ('start_date', models.DateField(db_column='start_date')),
+                ('next_payment_date', models.DateField(db_column='next_payment_date')),
+                ('custom_memo', models.TextField(blank=True, db_column='custom_memo', null=True)),
+                ('price_override', models.DecimalField(blank=True, db_column='price_override', decimal_places=2, max_digits=10, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_column='updated_at')),
+            ],
+            options={
+                'db_table': 'subscription',
+                'managed': False,
+            },
+        ),
+    ]
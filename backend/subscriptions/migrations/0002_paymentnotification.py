@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('subscriptions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payment_date', models.DateField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('subscription', models.ForeignKey(db_column='subscription_id', on_delete=django.db.models.deletion.CASCADE, related_name='payment_notifications', to='subscriptions.subscription')),
+                ('user', models.ForeignKey(db_column='user_id', on_delete=django.db.models.deletion.CASCADE, related_name='payment_notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'payment_notification',
+                'constraints': [models.UniqueConstraint(fields=('subscription', 'payment_date'), name='payment_notification_unique')],
+            },
+        ),
+    ]
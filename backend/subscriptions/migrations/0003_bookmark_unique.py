@@ -0,0 +1,77 @@
+import logging
+
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+# bookmark는 managed=False 테이블이라 Django가 제약을 만들지 않으므로 직접 적용합니다.
+# 고유 인덱스는 MySQL/SQLite 모두 같은 문법이고, MySQL에서는 UNIQUE 제약과 같습니다.
+# 테이블이 없는 DB(새로 만든 테스트 DB 등)에서는 아무것도 하지 않습니다.
+INDEX_NAME = 'bookmark_user_service_unique'
+
+
+def _has_bookmark_table(schema_editor):
+    return 'bookmark' in schema_editor.connection.introspection.table_names()
+
+
+def merge_duplicates(apps, schema_editor):
+    """
+    (user_id, service_id)마다 가장 먼저 만든 북마크 한 건만 남깁니다.
+    지우는 북마크의 메모는 남기는 북마크 메모 뒤에 줄바꿈으로 이어 붙이고, 정리한 내역은 로그로 남깁니다.
+    """
+    if not _has_bookmark_table(schema_editor):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT user_id, service_id FROM bookmark "
+            "GROUP BY user_id, service_id HAVING COUNT(*) > 1"
+        )
+        groups = cursor.fetchall()
+        for user_id, service_id in groups:
+            cursor.execute(
+                "SELECT bookmark_id, memo FROM bookmark WHERE user_id = %s AND service_id = %s "
+                "ORDER BY bookmark_id",
+                (user_id, service_id),
+            )
+            rows = cursor.fetchall()
+            keep_id = rows[0][0]
+            memos = []
+            for _, memo in rows:
+                memo = (memo or '').strip()
+                if memo and memo not in memos:
+                    memos.append(memo)
+            removed = [bookmark_id for bookmark_id, _ in rows[1:]]
+            logger.warning("중복 북마크 정리 user=%s service=%s 유지=%s 삭제=%s 메모=%r",
+                           user_id, service_id, keep_id, removed, [memo for _, memo in rows])
+            schema_editor.execute("UPDATE bookmark SET memo = %s WHERE bookmark_id = %s",
+                                  ('\n'.join(memos), keep_id))
+            schema_editor.execute(
+                "DELETE FROM bookmark WHERE user_id = %s AND service_id = %s AND bookmark_id <> %s",
+                (user_id, service_id, keep_id),
+            )
+
+
+def add_unique_index(apps, schema_editor):
+    if _has_bookmark_table(schema_editor):
+        schema_editor.execute(f"CREATE UNIQUE INDEX {INDEX_NAME} ON bookmark (user_id, service_id)")
+
+
+def drop_unique_index(apps, schema_editor):
+    if not _has_bookmark_table(schema_editor):
+        return
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute(f"DROP INDEX {INDEX_NAME} ON bookmark")
+    else:
+        schema_editor.execute(f"DROP INDEX {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0002_paymentnotification'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.RunPython(add_unique_index, drop_unique_index),
+    ]
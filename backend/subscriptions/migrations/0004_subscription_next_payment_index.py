@@ -0,0 +1,43 @@
+from django.db import migrations
+
+# subscription은 managed=False 테이블이라 Django가 인덱스를 만들지 않으므로 직접 적용합니다.
+# advance_renewals(subscriptions/renewals.py)의 (next_payment_date, subscription_id) 키셋 조회용입니다.
+# 테이블이 없는 DB(새로 만든 테스트 DB 등)나 이미 같은 이름의 인덱스를 만들어 둔 DB에서는 아무것도 하지 않습니다.
+INDEX_NAME = 'subscription_next_payment_idx'
+
+
+def _index_state(schema_editor):
+    """(테이블 존재 여부, 인덱스 존재 여부)"""
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if 'subscription' not in connection.introspection.table_names(cursor):
+            return False, False
+        return True, INDEX_NAME in connection.introspection.get_constraints(cursor, 'subscription')
+
+
+def add_index(apps, schema_editor):
+    has_table, has_index = _index_state(schema_editor)
+    if has_table and not has_index:
+        schema_editor.execute(
+            f"CREATE INDEX {INDEX_NAME} ON subscription (next_payment_date, subscription_id)")
+
+
+def drop_index(apps, schema_editor):
+    _, has_index = _index_state(schema_editor)
+    if not has_index:
+        return
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute(f"DROP INDEX {INDEX_NAME} ON subscription")
+    else:
+        schema_editor.execute(f"DROP INDEX {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0003_bookmark_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, drop_index),
+    ]
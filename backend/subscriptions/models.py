@@ -38,8 +38,32 @@ class Bookmark(models.Model):
     class Meta:
         db_table = 'bookmark'   # 실제 테이블명 그대로
         managed = False         # Django가 테이블을 만들거나 변경하지 않음
+        # 같은 서비스 중복 북마크 방지. managed=False라 Django가 만들지 않으므로
+        # subscriptions/migrations/0003_bookmark_unique.py 가 기존 중복을 지우고 고유 인덱스를 만듭니다.
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'service'], name='bookmark_user_service_unique'),
+        ]
 
     def __str__(self):
         service_name = getattr(self.service, "name", "Unknown")
         username = getattr(self.user, "username", "Unknown")
-        return f"{username}의 {service_name} 북마크"
\ No newline at end of file
+        return f"{username}의 {service_name} 북마크"
+
+# 결제 예정 알림 발송 기록 (같은 구독·같은 결제일로는 한 번만 보냅니다)
+class PaymentNotification(models.Model):
+    subscription = models.ForeignKey(Subscription, db_column="subscription_id", on_delete=models.CASCADE,
+                                     related_name='payment_notifications')
+    user = models.ForeignKey(to=settings.AUTH_USER_MODEL, db_column="user_id", on_delete=models.CASCADE,
+                             related_name='payment_notifications')
+    payment_date = models.DateField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'payment_notification'
+        constraints = [
+            models.UniqueConstraint(fields=['subscription', 'payment_date'],
+                                    name='payment_notification_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.subscription_id} {self.payment_date} 알림"
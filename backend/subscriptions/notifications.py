@@ -0,0 +1,213 @@
+# subscriptions/notifications.py
+"""
+결제 예정 알림 (manage.py send_payment_notifications)
+
+- 사용 중인 구독 중 next_payment_date가 [기준일, 기준일 + days] 안에 있는 것을 사용자별로 묶어
+  메일 한 통(다이제스트)으로 보냅니다. 이메일이 없는 사용자는 건너뜁니다.
+- 발송 수단은 Django 메일 백엔드(settings.EMAIL_BACKEND)를 그대로 사용합니다.
+    로컬: console / 테스트: locmem(테스트 러너가 자동 설정) / 파일: filebased / 운영: smtp
+- 사용자 id 순서의 키셋으로 batch_size명씩 읽고, 한 배치의 메일은 max_workers개 스레드가 나눠 보냅니다.
+  DB 읽기/쓰기는 모두 메인 스레드에서만 합니다.
+- 보낸 구독은 (subscription, payment_date) 고유 제약이 있는 payment_notification 에 기록하고
+  다음 실행에서 제외하므로 다시 실행해도 같은 결제일로 두 번 보내지 않습니다.
+  결제일이 넘어가면(advance_renewals) 새 결제일로 다시 알림 대상이 됩니다.
+  테이블은 subscriptions/migrations/0002_paymentnotification.py 로 만듭니다. (배포 시 migrate)
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from math import ceil
+from time import perf_counter
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Exists, OuterRef
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Subscription, PaymentNotification
+from .pricing import effective_price_expression
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_NAME = 'notifications/upcoming_payments.txt'
+
+_config = getattr(settings, 'SUBSCRIPTION_NOTIFICATIONS', {})
+DAYS_AHEAD = _config.get('DAYS_AHEAD', 3)
+BATCH_SIZE = _config.get('BATCH_SIZE', 500)
+MAX_WORKERS = _config.get('MAX_WORKERS', 4)
+
+
+class NotificationStats:
+    def __init__(self):
+        self.users = 0
+        self.subscriptions = 0
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self.started = perf_counter()
+
+    @property
+    def elapsed(self):
+        return perf_counter() - self.started
+
+    def as_dict(self):
+        return {'users': self.users, 'subscriptions': self.subscriptions, 'sent': self.sent,
+                'failed': self.failed, 'batches': self.batches, 'elapsed_seconds': round(self.elapsed, 3)}
+
+
+def pending_subscriptions(start, end):
+    """알림 대상 구독: 사용 중 + 결제일이 기간 안 + 이메일 있음 + 같은 결제일로 아직 안 보냄"""
+    already_sent = PaymentNotification.objects.filter(
+        subscription=OuterRef('pk'), payment_date=OuterRef('next_payment_date'))
+    return (
+        Subscription.objects
+        .filter(status=True, next_payment_date__range=(start, end), user__email__isnull=False)
+        .exclude(user__email='')
+        .filter(~Exists(already_sent))
+    )
+
+
+def _user_batches(queryset, batch_size):
+    """알림 대상이 있는 사용자 id를 user_id 순서로 batch_size명씩 내보냅니다."""
+    last_id = None
+    while True:
+        batch = queryset if last_id is None else queryset.filter(user_id__gt=last_id)
+        user_ids = list(batch.order_by('user_id').values_list('user_id', flat=True).distinct()[:batch_size])
+        if not user_ids:
+            return
+        last_id = user_ids[-1]
+        yield user_ids
+
+
+def build_digests(queryset, user_ids):
+    """사용자별 다이제스트 목록. 구독/요금제/서비스/사용자 값을 JOIN 한 번으로 읽습니다."""
+    rows = (
+        queryset.filter(user_id__in=user_ids)
+        .annotate(price=effective_price_expression())
+        .order_by('user_id', 'next_payment_date', 'pk')
+        .values('pk', 'user_id', 'user__email', 'user__display_name', 'user__username',
+                'plan__service__name', 'plan__plan_name', 'plan__billing_cycle', 'price', 'next_payment_date')
+    )
+    digests = {}
+    for row in rows:
+        digest = digests.get(row['user_id'])
+        if digest is None:
+            digest = digests[row['user_id']] = {
+                'user_id': row['user_id'],
+                'email': row['user__email'],
+                'name': row['user__display_name'] or row['user__username'],
+                'items': [],
+            }
+        digest['items'].append({
+            'subscription_id': row['pk'],
+            'service_name': row['plan__service__name'],
+            'plan_name': row['plan__plan_name'],
+            'billing_cycle': row['plan__billing_cycle'],
+            'price': row['price'],
+            'payment_date': row['next_payment_date'],
+        })
+    for digest in digests.values():
+        digest['total_price'] = ceil(sum(item['price'] or 0 for item in digest['items']))
+    return list(digests.values())
+
+
+def render_digest(digest, days):
+    subject = f"[Guava] {days}일 안에 결제 예정인 구독 {len(digest['items'])}건"
+    body = render_to_string(TEMPLATE_NAME, {**digest, 'days': days})
+    return subject, body
+
+
+class DigestSender:
+    """
+    스레드마다 메일 백엔드 연결을 하나씩 열어 재사용합니다. (SMTP 연결은 스레드 간 공유하면 안 됩니다)
+    close()에서 열어 둔 연결을 모두 닫습니다.
+    """
+
+    def __init__(self, days, backend=None):
+        self.days = days
+        self.backend = backend
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = get_connection(self.backend, fail_silently=False)
+            connection.open()
+            with self.lock:
+                self.connections.append(connection)
+        return connection
+
+    def send(self, digest):
+        """
+        (다이제스트, 오류 또는 None)을 반환합니다. 한 사용자의 실패가 배치 전체를 멈추지 않도록
+        연결 열기(SMTP 접속/인증) 실패까지 포함해 예외를 돌려줍니다.
+        """
+        subject, body = render_digest(digest, self.days)
+        try:
+            message = EmailMessage(subject, body, to=[digest['email']], connection=self._connection())
+            message.send()
+        except Exception as e:
+            # 연결이 끊겼을 수 있으므로 다음 메일은 새 연결로 보냅니다.
+            self.local.connection = None
+            return digest, e
+        return digest, None
+
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.close()
+            except Exception:
+                logger.warning("메일 연결 종료 실패", exc_info=True)
+
+
+def send_payment_notifications(as_of=None, days=DAYS_AHEAD, batch_size=BATCH_SIZE, max_workers=MAX_WORKERS,
+                               dry_run=False, backend=None, on_progress=None):
+    """
+    결제 예정 알림을 보내고 NotificationStats를 반환합니다.
+    backend에 메일 백엔드 경로를 넘기면 settings.EMAIL_BACKEND 대신 사용합니다.
+    """
+    as_of = as_of or timezone.localdate()
+    stats = NotificationStats()
+    queryset = pending_subscriptions(as_of, as_of + timedelta(days=days))
+    sender = DigestSender(days, backend=backend)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='payment-notify') as executor:
+        try:
+            for user_ids in _user_batches(queryset, batch_size):
+                digests = build_digests(queryset, user_ids)
+                stats.batches += 1
+                stats.users += len(digests)
+                stats.subscriptions += sum(len(digest['items']) for digest in digests)
+                if not dry_run:
+                    # 배치 단위로 기다리므로 동시에 메모리에 올라가는 메일은 batch_size개를 넘지 않습니다.
+                    # 보낸 메일은 끝나는 대로 바로 기록해, 중간에 실행이 멈춰도 다음 실행에서 다시 보내지 않습니다.
+                    for digest, error in executor.map(sender.send, digests):
+                        if error is not None:
+                            stats.failed += 1
+                            logger.warning("결제 예정 알림 발송 실패 user=%s: %s", digest['user_id'], error)
+                        else:
+                            _record_sent([digest])
+                            stats.sent += 1
+                if on_progress is not None:
+                    on_progress(stats)
+        finally:
+            sender.close()
+
+    logger.info("결제 예정 알림 완료 as_of=%s days=%s %s", as_of, days, stats.as_dict())
+    return stats
+
+
+def _record_sent(digests):
+    records = [
+        PaymentNotification(subscription_id=item['subscription_id'], user_id=digest['user_id'],
+                            payment_date=item['payment_date'])
+        for digest in digests
+        for item in digest['items']
+    ]
+    if records:
+        # 동시에 다른 실행이 먼저 기록했더라도 오류 없이 넘어갑니다.
+        PaymentNotification.objects.bulk_create(records, ignore_conflicts=True)
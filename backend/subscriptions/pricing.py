@@ -0,0 +1,65 @@
+# subscriptions/pricing.py
+from decimal import Decimal
+
+from django.db.models import Count, Sum, Value, CharField, F
+from django.db.models.functions import Coalesce
+
+from services.pricing import PRICE_FIELD, monthly_price_expression
+
+DEFAULT_CATEGORY = '기타'
+
+
+def effective_price_expression():
+    """구독에 직접 입력한 가격(price_override)이 있으면 그 값을, 없으면 요금제 가격을 사용합니다."""
+    return Coalesce('price_override', 'plan__price', output_field=PRICE_FIELD)
+
+
+def monthly_subscription_price():
+    """구독 1건의 월 환산 가격 (연간 요금제는 12로 나눔)"""
+    return monthly_price_expression(effective_price_expression(), 'plan__billing_cycle')
+
+
+def annotate_plan_fields(queryset):
+    """목록/상세 직렬화에 필요한 요금제·서비스 값을 JOIN 한 번으로 함께 가져옵니다."""
+    return queryset.annotate(
+        plan_service_name=F('plan__service__name'),
+        plan_service_category=Coalesce('plan__service__category', Value(DEFAULT_CATEGORY),
+                                       output_field=CharField()),
+        plan_name=F('plan__plan_name'),
+        plan_price=F('plan__price'),
+        plan_billing_cycle=F('plan__billing_cycle'),
+    )
+
+
+def annotate_bookmark_fields(queryset):
+    """북마크 목록에 서비스 이름/카테고리와 요금 요약(service_price_summary)을 LEFT JOIN 한 번으로 붙입니다."""
+    return queryset.annotate(
+        service_name=F('service__name'),
+        service_category=Coalesce('service__category', Value(DEFAULT_CATEGORY), output_field=CharField()),
+        min_monthly_price=F('service__price_summary__min_monthly_price'),
+        max_monthly_price=F('service__price_summary__max_monthly_price'),
+        plan_count=Coalesce('service__price_summary__plan_count', Value(0)),
+    )
+
+
+def summarize_by_category(queryset):
+    """
+    카테고리별 구독 개수와 월 환산 합계를 GROUP BY 한 번으로 계산합니다.
+    전체 개수/합계는 카테고리 행을 더해서 구하므로 추가 쿼리가 없습니다.
+    반환값: (전체 개수, 전체 월 합계, [{'category', 'count', 'total_price'}, ...])
+    """
+    rows = (
+        queryset.order_by()
+        .values(category=Coalesce('plan__service__category', Value(DEFAULT_CATEGORY),
+                                  output_field=CharField()))
+        .annotate(count=Count('pk'), total_price=Sum(monthly_subscription_price()))
+        .order_by('category')
+    )
+    categories = [
+        {'category': row['category'], 'count': row['count'],
+         'total_price': row['total_price'] or Decimal('0')}
+        for row in rows
+    ]
+    count = sum(row['count'] for row in categories)
+    total = sum((row['total_price'] for row in categories), Decimal('0'))
+    return count, total, categories
@@ -0,0 +1,81 @@
+# subscriptions/renderer.py
+"""
+PDF 렌더링 전용 모듈입니다.
+리포트 워커 프로세스(spawn)에서 import 되므로 Django 설정/모델을 import 하지 않습니다.
+
+스타일시트 파싱과 폰트 설정은 비용이 크므로 프로세스당 한 번만 만들고 재사용합니다.
+출력 PDF에는 생성 시각/랜덤 식별자를 넣지 않으므로 같은 입력이면 바이트 단위로 같은 결과가 나옵니다.
+"""
+import os
+import tempfile
+import threading
+from time import perf_counter
+
+
+class ReportRenderer:
+    def __init__(self, stylesheet_paths=()):
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        self.font_config = FontConfiguration()
+        self.stylesheets = [CSS(filename=path, font_config=self.font_config) for path in stylesheet_paths]
+        # 템플릿에 이미지가 들어가도 프로세스 안에서는 한 번만 불러오도록 캐시
+        self.image_cache = {}
+
+    def render(self, html):
+        """HTML 문자열을 PDF 바이트로 변환하고 (pdf, 단계별 소요 시간)을 반환합니다."""
+        from weasyprint import HTML
+
+        started = perf_counter()
+        document = HTML(string=html)
+        parsed = perf_counter()
+        rendered = document.render(stylesheets=self.stylesheets, font_config=self.font_config,
+                                   cache=self.image_cache)
+        laid_out = perf_counter()
+        pdf = rendered.write_pdf()
+        written = perf_counter()
+
+        timings = {
+            'parse_seconds': parsed - started,
+            'layout_seconds': laid_out - parsed,
+            'write_seconds': written - laid_out,
+            'total_seconds': written - started,
+        }
+        return pdf, timings
+
+
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+
+def get_renderer(stylesheet_paths=()):
+    """
+    스타일시트 경로(+수정 시각)별로 렌더러를 하나씩 만들어 둡니다.
+    CSS 파일이 배포로 바뀌면 수정 시각이 달라지므로 새 렌더러가 만들어집니다.
+    """
+    key = tuple((path, os.path.getmtime(path)) for path in stylesheet_paths)
+    with _renderers_lock:
+        renderer = _renderers.get(key)
+        if renderer is None:
+            renderer = _renderers[key] = ReportRenderer(stylesheet_paths)
+        return renderer
+
+
+def render_pdf_to_file(html, target_path, stylesheet_paths=()):
+    """
+    HTML 문자열을 PDF로 렌더링해 target_path에 원자적으로(임시 파일 → rename) 저장합니다.
+    반환값: 단계별 렌더링 소요 시간(dict)
+    """
+    pdf, timings = get_renderer(tuple(stylesheet_paths)).render(html)
+
+    directory = os.path.dirname(target_path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(pdf)
+        os.replace(tmp_path, target_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return timings
@@ -0,0 +1,128 @@
+# subscriptions/renewals.py
+"""
+결제일이 지난 구독의 next_payment_date를 다음 결제일로 넘깁니다. (manage.py advance_renewals)
+
+- 대상은 사용 중(status=True)이고 next_payment_date <= 기준일인 구독입니다.
+  (next_payment_date, subscription_id) 순서의 키셋으로 chunk_size개씩 읽고, 같은 순서의 인덱스
+  subscription_next_payment_idx(subscriptions/migrations/0004)가 있어 범위 스캔만 합니다. (배포 시 migrate)
+- 다음 결제일은 항상 기준일 이후로 계산하므로 같은 날 여러 번 실행해도 결과가 같고(멱등),
+  중간에 멈췄다가 다시 실행하면 아직 넘기지 못한 구독부터 이어서 처리됩니다.
+- 월말 보정: 1월 31일 가입 → 2월 28일 → 3월 31일 처럼 가입일의 "일"을 기준으로 맞춥니다.
+"""
+import calendar
+import logging
+from datetime import date
+from time import perf_counter
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import bump_user_version
+from .models import Subscription
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 2000
+PERIOD_MONTHS = {'month': 1, 'year': 12}
+
+
+def _last_day(year, month):
+    return calendar.monthrange(year, month)[1]
+
+
+def add_months(day, months, anchor_day):
+    """day에서 months개월 뒤 날짜. 일(day)은 anchor_day로 맞추되 그 달의 마지막 날을 넘지 않습니다."""
+    years, month_index = divmod(day.month - 1 + months, 12)
+    year, month = day.year + years, month_index + 1
+    return date(year, month, min(anchor_day, _last_day(year, month)))
+
+
+def next_payment_after(current, start_date, billing_cycle, as_of):
+    """
+    current(지난 결제일)에서 결제 주기만큼씩 넘겨 as_of 다음의 첫 결제일을 구합니다.
+    current가 월말로 보정된 날짜(예: 2월 28일)이고 가입일이 더 뒤의 날(31일)이면 가입일의 일을 따릅니다.
+    """
+    step = PERIOD_MONTHS.get(billing_cycle, 1)
+    anchor_day = current.day
+    if start_date and current.day == _last_day(current.year, current.month) and start_date.day > current.day:
+        anchor_day = start_date.day
+
+    # 몇 년 밀린 구독도 반복 없이 기준일 근처로 바로 이동
+    months_behind = (as_of.year - current.year) * 12 + as_of.month - current.month
+    periods = max(months_behind // step, 1)
+    candidate = add_months(current, periods * step, anchor_day)
+    while candidate <= as_of:
+        periods += 1
+        candidate = add_months(current, periods * step, anchor_day)
+    return candidate
+
+
+class RenewalProgress:
+    def __init__(self):
+        self.scanned = 0
+        self.advanced = 0
+        self.chunks = 0
+        self.started = perf_counter()
+
+    @property
+    def elapsed(self):
+        return perf_counter() - self.started
+
+    @property
+    def rate(self):
+        return self.advanced / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {'scanned': self.scanned, 'advanced': self.advanced, 'chunks': self.chunks,
+                'elapsed_seconds': round(self.elapsed, 3), 'rows_per_second': round(self.rate, 1)}
+
+
+def due_subscriptions(as_of):
+    return Subscription.objects.filter(status=True, next_payment_date__lte=as_of)
+
+
+def advance_renewals(as_of=None, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, limit=None, on_progress=None):
+    """
+    결제일이 지난 구독을 chunk_size개씩 다음 결제일로 넘깁니다. 청크마다 한 트랜잭션입니다.
+    bulk_update는 시그널을 보내지 않으므로 청크마다 해당 사용자들의 캐시 버전을 직접 올립니다.
+    반환값: RenewalProgress
+    """
+    as_of = as_of or timezone.localdate()
+    progress = RenewalProgress()
+    queryset = due_subscriptions(as_of).order_by('next_payment_date', 'pk')
+    last = None
+
+    while limit is None or progress.scanned < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - progress.scanned)
+        chunk = queryset
+        if last is not None:
+            last_date, last_pk = last
+            chunk = chunk.filter(Q(next_payment_date__gt=last_date) | Q(next_payment_date=last_date, pk__gt=last_pk))
+        rows = list(chunk.values_list('pk', 'user_id', 'start_date', 'next_payment_date',
+                                      'plan__billing_cycle')[:size])
+        if not rows:
+            break
+        last = (rows[-1][3], rows[-1][0])
+
+        now = timezone.now()
+        updates = [
+            Subscription(pk=pk, next_payment_date=next_payment_after(current, start_date, cycle, as_of),
+                         updated_at=now)
+            for pk, _, start_date, current, cycle in rows
+        ]
+        user_ids = {row[1] for row in rows}
+        if not dry_run:
+            with transaction.atomic():
+                Subscription.objects.bulk_update(updates, ['next_payment_date', 'updated_at'])
+                for user_id in user_ids:
+                    transaction.on_commit(lambda user_id=user_id: bump_user_version(user_id))
+
+        progress.scanned += len(rows)
+        progress.advanced += len(updates)
+        progress.chunks += 1
+        if on_progress is not None:
+            on_progress(progress)
+
+    logger.info("구독 결제일 갱신 완료 as_of=%s %s", as_of, progress.as_dict())
+    return progress
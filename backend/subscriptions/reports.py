@@ -0,0 +1,252 @@
+# subscriptions/reports.py
+import functools
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from math import ceil
+
+from django.conf import settings
+from django.template.loader import get_template, render_to_string
+
+from .pricing import effective_price_expression, monthly_subscription_price
+from .renderer import render_pdf_to_file
+
+logger = logging.getLogger(__name__)
+
+# 템플릿/계산 방식이 바뀌면 올려서 예전 캐시 파일을 쓰지 않도록 합니다.
+REPORT_FORMAT_VERSION = 2
+TEMPLATE_NAME = 'pdf/subscription_report.html'
+STYLESHEET_NAME = 'pdf/subscription_report.css'
+
+STATUS_DONE = 'done'
+STATUS_PENDING = 'pending'
+STATUS_FAILED = 'failed'
+
+_config = getattr(settings, 'SUBSCRIPTION_REPORTS', {})
+REPORTS_DIR = str(_config.get('DIR', os.path.join(settings.BASE_DIR, 'var', 'reports')))
+MAX_WORKERS = _config.get('MAX_WORKERS', 2)
+STALE_SECONDS = _config.get('STALE_SECONDS', 300)
+RETENTION_SECONDS = _config.get('RETENTION_SECONDS', 60 * 60 * 24 * 7)
+# export_pdf가 요청 스레드에서 렌더링 완료를 기다리는 최대 시간(초). 동기 워커를 붙잡으므로 짧게 둡니다.
+MAX_WAIT_SECONDS = 1
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """
+    워커(프로세스)마다 하나의 렌더링 프로세스 풀을 지연 생성합니다.
+    gunicorn 워커를 fork 한 상태 그대로 복제하지 않도록 spawn 방식을 사용합니다.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def _discard_executor(executor):
+    """렌더링 프로세스가 죽어(OOM 등) 깨진 풀은 버리고 다음 작업에서 새로 만듭니다."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(*args):
+    """(풀, future)를 반환합니다. 풀이 깨져 있으면 새로 만들어 한 번 더 넣습니다."""
+    executor = _get_executor()
+    try:
+        return executor, executor.submit(*args)
+    except BrokenProcessPool:
+        logger.warning("리포트 렌더링 풀이 깨져 다시 만듭니다.")
+        _discard_executor(executor)
+        executor = _get_executor()
+        return executor, executor.submit(*args)
+
+
+def stylesheet_paths():
+    """템플릿 디렉터리에서 리포트 CSS의 실제 경로를 찾습니다. (렌더러 프로세스에는 경로만 넘김)"""
+    return (get_template(STYLESHEET_NAME).origin.name,)
+
+
+def _path(job_id, suffix):
+    return os.path.join(REPORTS_DIR, f'{job_id}{suffix}')
+
+
+def build_report_context(user, queryset):
+    """리포트에 들어갈 값만 한 번에 조회합니다. (해시 계산과 템플릿 렌더링에 함께 사용)"""
+    rows = list(
+        queryset.annotate(price=effective_price_expression(), monthly_price=monthly_subscription_price())
+        .order_by('next_payment_date', 'pk')
+        .values('pk', 'updated_at', 'plan__service__name', 'plan__plan_name',
+                'plan__billing_cycle', 'price', 'monthly_price', 'next_payment_date')
+    )
+    subscriptions = [
+        {
+            'service_name': row['plan__service__name'],
+            'plan_name': row['plan__plan_name'],
+            'billing_cycle': row['plan__billing_cycle'],
+            'price': row['price'],
+            'next_payment_date': row['next_payment_date'],
+        }
+        for row in rows
+    ]
+    total_price = ceil(sum(row['monthly_price'] or 0 for row in rows))
+    state = {
+        'version': REPORT_FORMAT_VERSION,
+        'user': [user.pk, user.username],
+        'rows': [[row['pk'], str(row['updated_at']), row['plan__service__name'], row['plan__plan_name'],
+                  row['plan__billing_cycle'], str(row['price']), str(row['next_payment_date'])]
+                 for row in rows],
+    }
+    job_id = hashlib.sha256(json.dumps(state, sort_keys=True).encode('utf-8')).hexdigest()
+    context = {'user': user, 'subscriptions': subscriptions, 'total_price': total_price}
+    return job_id, context
+
+
+def get_report_status(job_id):
+    """디스크 상태만 보고 판단하므로 어느 gunicorn 워커에서 조회해도 같은 결과가 나옵니다."""
+    if os.path.exists(_path(job_id, '.pdf')):
+        return STATUS_DONE
+    if os.path.exists(_path(job_id, '.error')):
+        return STATUS_FAILED
+    pending = _path(job_id, '.pending')
+    if os.path.exists(pending) and time.time() - os.path.getmtime(pending) < STALE_SECONDS:
+        return STATUS_PENDING
+    return None
+
+
+def get_report_owner(job_id):
+    return get_report_meta(job_id).get('user_id')
+
+
+def get_report_path(job_id):
+    return _path(job_id, '.pdf')
+
+
+def get_report_meta(job_id):
+    return _read_meta(_path(job_id, '.json'))
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = f'{meta_path}.{os.getpid()}.{threading.get_ident()}'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def _remove_pending(pending_path):
+    try:
+        os.remove(pending_path)
+    except FileNotFoundError:
+        pass
+
+
+def _job_paths(job_id):
+    """작업 파일 경로. 콜백에는 제출 시점에 정한 경로를 넘겨, 나중에 REPORTS_DIR 설정이 바뀌어도 같은 곳에 씁니다."""
+    return {name: _path(job_id, suffix)
+            for name, suffix in (('pdf', '.pdf'), ('error', '.error'), ('pending', '.pending'), ('meta', '.json'))}
+
+
+def _on_done(job_id, paths, executor, future):
+    """렌더링 future의 완료 콜백. functools.partial로 job_id, 경로, 풀을 묶어 등록합니다."""
+    error = future.exception()
+    if isinstance(error, BrokenProcessPool):
+        _discard_executor(executor)
+    if error is not None:
+        logger.error("리포트 렌더링 실패 job=%s: %s", job_id, error)
+        with open(paths['error'], 'w', encoding='utf-8') as f:
+            f.write(str(error))
+    else:
+        timings = future.result()
+        logger.info("리포트 렌더링 완료 job=%s timings=%s", job_id, timings)
+        _write_meta(paths['meta'], {**_read_meta(paths['meta']), 'timings': timings})
+    _remove_pending(paths['pending'])
+
+
+def _claim(job_id):
+    """pending 표식을 O_EXCL로 만들어 여러 워커가 같은 리포트를 중복 렌더링하지 않게 합니다."""
+    pending = _path(job_id, '.pending')
+    if os.path.exists(pending) and time.time() - os.path.getmtime(pending) >= STALE_SECONDS:
+        os.remove(pending)  # 렌더링하던 워커가 죽은 경우
+    try:
+        os.close(os.open(pending, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        return False
+
+
+def prune_reports(now=None):
+    """보관 기간이 지난 리포트 파일을 정리합니다."""
+    now = now or time.time()
+    with os.scandir(REPORTS_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and now - entry.stat().st_mtime > RETENTION_SECONDS:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
+def enqueue_report(user, queryset):
+    """
+    사용자 구독 상태로 리포트 작업을 만들고, 이미 같은 상태의 PDF가 있으면 그대로 재사용합니다.
+    반환값: (job_id, status)
+    """
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    job_id, context = build_report_context(user, queryset)
+
+    status = get_report_status(job_id)
+    if status in (STATUS_DONE, STATUS_PENDING):
+        return job_id, status
+
+    if not _claim(job_id):
+        return job_id, STATUS_PENDING
+
+    paths = _job_paths(job_id)
+    try:
+        os.remove(paths['error'])
+    except FileNotFoundError:
+        pass
+    _write_meta(paths['meta'], {'user_id': user.pk, 'created_at': time.time()})
+
+    try:
+        html = render_to_string(TEMPLATE_NAME, context)
+        executor, future = _submit(render_pdf_to_file, html, paths['pdf'], stylesheet_paths())
+    except BaseException:
+        # 작업을 넣지 못했으면 pending 표식을 지워 다음 요청이 다시 시도할 수 있게 합니다.
+        _remove_pending(paths['pending'])
+        raise
+    future.add_done_callback(functools.partial(_on_done, job_id, paths, executor))
+    prune_reports()
+    return job_id, STATUS_PENDING
+
+
+def wait_for_report(job_id, timeout, interval=0.2):
+    """timeout 초 동안 완료를 기다립니다. 완료/실패 상태가 되면 바로 반환합니다."""
+    deadline = time.monotonic() + timeout
+    status = get_report_status(job_id)
+    while status == STATUS_PENDING and time.monotonic() < deadline:
+        time.sleep(interval)
+        status = get_report_status(job_id)
+    return status
@@ -1,59 +1,17 @@
 from rest_framework import serializers
 from .models import Subscription, Bookmark
-from services.models import Plan
 
 
 class SubscriptionSerializer(serializers.ModelSerializer):
-    plan_service_category = serializers.SerializerMethodField()
-    plan_service_name = serializers.SerializerMethodField()
-    plan_name = serializers.SerializerMethodField()
-    plan_price = serializers.SerializerMethodField()
-    plan_billing_cycle = serializers.SerializerMethodField()
-
-    def get_plan_service_category(self, obj):
-        """안전하게 category 반환"""
-        try:
-            if obj.plan and obj.plan.service:
-                return obj.plan.service.category
-        except Exception as e:
-            print(f"⚠️ Error getting category for subscription {obj.id}: {e}")
-        return "기타"
-
-    def get_plan_service_name(self, obj):
-        """안전하게 service name 반환"""
-        try:
-            if obj.plan and obj.plan.service:
-                return obj.plan.service.name
-        except Exception as e:
-            print(f"⚠️ Error getting service name for subscription {obj.id}: {e}")
-        return ""
-
-    def get_plan_name(self, obj):
-        """안전하게 plan name 반환"""
-        try:
-            if obj.plan_name:
-                return obj.plan.name
-        except Exception as e:
-            print(f"⚠️ Error getting plan name for subscription {obj.id}: {e}")
-        return ""
-
-    def get_plan_price(self, obj):
-        """안전하게 plan price 반환"""
-        try:
-            if obj.plan:
-                return obj.plan.price
-        except Exception as e:
-            print(f"⚠️ Error getting plan price for subscription {obj.id}: {e}")
-        return 0
-    
-    def get_plan_billing_cycle(self, obj):
-        """안전하게 plan billing_cycle 반환"""
-        try:
-            if obj.plan:
-                return obj.plan.billing_cycle
-        except Exception as e:
-            print(f"⚠️ Error getting plan billing_cycle for subscription {obj.id}: {e}")
-        return 0
+    """
+    요금제/서비스 정보는 SubscriptionViewSet.get_queryset()에서 F()로 annotate 한 평평한 값을 읽습니다.
+    (행마다 plan → service 속성을 따라가지 않으므로 구독 수와 상관없이 쿼리 수가 일정합니다.)
+    """
+    plan_service_category = serializers.CharField(read_only=True)
+    plan_service_name = serializers.CharField(read_only=True)
+    plan_name = serializers.CharField(read_only=True)
+    plan_price = serializers.DecimalField(max_digits=10, decimal_places=2, coerce_to_string=False, read_only=True)
+    plan_billing_cycle = serializers.CharField(read_only=True)
 
     class Meta:
         model = Subscription
@@ -78,25 +36,50 @@ class SubscriptionSerializer(serializers.ModelSerializer):
         read_only_fields = ['user']
 
 class BookmarkSerializer(serializers.ModelSerializer):
+    """
+    서비스 이름/카테고리와 월 환산 최저·최고가는 BookmarkViewSet.get_queryset()에서
+    service_price_summary 를 JOIN 해 annotate 한 값을 읽습니다.
+    중복 북마크는 여기서 조회하지 않고 DB 고유 인덱스
+    (bookmark_user_service_unique, subscriptions/migrations/0003)가 막습니다. (BookmarkViewSet.perform_create)
+    """
+    service_name = serializers.CharField(read_only=True)
+    service_category = serializers.CharField(read_only=True)
+    min_monthly_price = serializers.DecimalField(max_digits=10, decimal_places=2, coerce_to_string=False,
+                                                 read_only=True, allow_null=True)
+    max_monthly_price = serializers.DecimalField(max_digits=10, decimal_places=2, coerce_to_string=False,
+                                                 read_only=True, allow_null=True)
+    plan_count = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = Bookmark
-        fields = ['id', 'service', 'memo', 'created_at']
+        fields = ['id', 'service', 'memo', 'created_at',
+                  'service_name', 'service_category', 'min_monthly_price', 'max_monthly_price', 'plan_count']
         read_only_fields = ['user', 'created_at']
 
-
-    def validate(self, attrs):
-        request = self.context.get('request')
-        user = getattr(request, 'user', None)
-        service = attrs.get('service')
-
-        if user and service and Bookmark.objects.filter(user=user, service=service).exists():
-            raise serializers.ValidationError("이미 이 서비스는 북마크되어 있습니다.")
-        return attrs
-
-
     def create(self, validated_data):
         # user를 강제로 주입(클라이언트가 user를 못 바꾸게)
         validated_data['user'] = self.context['request'].user
         # memo None → '' 정리
         validated_data['memo'] = (validated_data.get('memo') or '').strip()
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+
+MAX_BULK_BOOKMARKS = 100
+
+
+class BookmarkBulkSerializer(serializers.Serializer):
+    """/api/my/bookmarks/bulk/ 요청 본문. 서비스 id 목록으로 북마크를 한 번에 추가/삭제/토글합니다."""
+    add = serializers.ListField(child=serializers.IntegerField(min_value=1), default=list,
+                                max_length=MAX_BULK_BOOKMARKS)
+    remove = serializers.ListField(child=serializers.IntegerField(min_value=1), default=list,
+                                   max_length=MAX_BULK_BOOKMARKS)
+    toggle = serializers.ListField(child=serializers.IntegerField(min_value=1), default=list,
+                                   max_length=MAX_BULK_BOOKMARKS)
+
+    def validate(self, attrs):
+        add, remove, toggle = (set(attrs[name]) for name in ('add', 'remove', 'toggle'))
+        if not (add or remove or toggle):
+            raise serializers.ValidationError("add, remove, toggle 중 하나 이상에 서비스 id를 넣어 주세요.")
+        if (add & remove) or (add & toggle) or (remove & toggle):
+            raise serializers.ValidationError("같은 서비스를 add/remove/toggle에 함께 넣을 수 없습니다.")
+        return {'add': add, 'remove': remove, 'toggle': toggle}
@@ -0,0 +1,17 @@
+# subscriptions/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import bump_user_version
+from .models import Subscription, Bookmark
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+@receiver(post_save, sender=Bookmark)
+@receiver(post_delete, sender=Bookmark)
+def invalidate_user_subscription_cache(sender, instance, **kwargs):
+    """구독/북마크가 생성/수정/삭제되면 해당 사용자의 캐시 버전을 올립니다. (커밋 후 한 번 더)"""
+    bump_user_version(instance.user_id)
+    transaction.on_commit(lambda: bump_user_version(instance.user_id))
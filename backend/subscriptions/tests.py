@@ -1,15 +1,32 @@
 # tests/test_subscriptions_api.py
+from datetime import date
+from io import StringIO
 from decimal import Decimal
+import os
+import tempfile
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional
+from unittest import mock
 
-from django.test import TestCase
+from dateutil.relativedelta import relativedelta
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
 from django.db import connection
+from django.template.loader import render_to_string
 from rest_framework.test import APIClient
 from rest_framework import status
 
-from services.models import Plan
-from subscriptions.models import Subscription
+from services.models import Service, Plan
+from subscriptions import reports
+from subscriptions.models import Subscription, Bookmark, PaymentNotification
+from subscriptions.notifications import send_payment_notifications
+from subscriptions.renderer import get_renderer
+from subscriptions.renewals import advance_renewals, next_payment_after
 
 
 LOGIN_URL = "/api/auth/login/"
@@ -152,3 +169,538 @@ class SubscriptionFlowTests(TestCase):
         """비인증 사용자는 401을 받아야 한다."""
         res = self.client.get(SUBSCRIPTIONS_URL)
         assert res.status_code == status.HTTP_401_UNAUTHORIZED, res.content
+
+
+class SubscriptionListAggregateTests(TestCase):
+    """목록 API가 구독 수와 상관없이 같은 개수의 쿼리로 합계/소계를 계산하는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="aggregate", password="pw1234")
+        cls.video = Service.objects.create(name="Netflix", category="video")
+        cls.music = Service.objects.create(name="Melon", category="music")
+        cls.monthly = Plan.objects.create(service=cls.video, plan_name="Basic", price=Decimal("9500"))
+        cls.yearly = Plan.objects.create(service=cls.music, plan_name="Yearly",
+                                         billing_cycle="year", price=Decimal("120000"))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _subscribe(self, plan, price_override=None):
+        return Subscription.objects.create(
+            user=self.user, plan=plan, start_date="2025-01-01",
+            next_payment_date="2025-02-01", price_override=price_override,
+        )
+
+    def test_totals_are_monthly_normalized(self):
+        self._subscribe(self.monthly)
+        self._subscribe(self.monthly, price_override=Decimal("5000"))
+        self._subscribe(self.yearly)
+
+        data = self.client.get(SUBSCRIPTIONS_URL).json()
+
+        assert data["count"] == 3
+        # 9500 + 5000 + 120000/12
+        assert data["total_price"] == 24500
+        totals = {row["category"]: row for row in data["category_totals"]}
+        assert totals["video"]["count"] == 2 and totals["video"]["total_price"] == 14500
+        assert totals["music"]["count"] == 1 and totals["music"]["total_price"] == 10000
+
+    def test_query_count_is_constant(self):
+        """구독이 1건이든 30건이든 쿼리 수가 같아야 함 (집계 1 + 목록 1)"""
+        self._subscribe(self.monthly)
+        with self.assertNumQueries(2):
+            self.client.get(SUBSCRIPTIONS_URL)
+
+        for _ in range(29):
+            self._subscribe(self.yearly)
+        with self.assertNumQueries(2):
+            res = self.client.get(SUBSCRIPTIONS_URL)
+
+        assert res.json()["count"] == 30
+
+    def test_results_read_annotated_plan_fields(self):
+        """요금제/서비스 값은 annotate 된 컬럼에서 읽고, 생성 응답에도 같은 값이 들어가야 함"""
+        self._subscribe(self.yearly)
+        with self.assertNumQueries(2):
+            row = self.client.get(SUBSCRIPTIONS_URL).json()["results"][0]
+
+        assert row["plan_name"] == "Yearly"
+        assert row["plan_service_name"] == "Melon"
+        assert row["plan_service_category"] == "music"
+        assert row["plan_price"] == 120000
+        assert row["plan_billing_cycle"] == "year"
+
+        res = self.client.post(SUBSCRIPTIONS_URL, {"plan": self.monthly.pk, "start_date": "2025-01-01",
+                                                   "next_payment_date": "2025-02-01"}, format="json")
+        assert res.status_code == status.HTTP_201_CREATED, res.content
+        assert res.json()["plan_name"] == "Basic"
+        assert res.json()["plan_service_name"] == "Netflix"
+
+
+SUMMARY_URL = "/api/my/subscriptions/summary/"
+
+
+class SubscriptionSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="summary", password="pw1234")
+        cls.video = Service.objects.create(name="Netflix", category="video")
+        cls.music = Service.objects.create(name="Melon", category="music")
+        cls.monthly = Plan.objects.create(service=cls.video, plan_name="Basic", price=Decimal("9500"))
+        cls.yearly = Plan.objects.create(service=cls.music, plan_name="Yearly",
+                                         billing_cycle="year", price=Decimal("120000"))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        today = date.today().replace(day=1)
+        self.next_month = today + relativedelta(months=1)
+        Subscription.objects.create(user=self.user, plan=self.monthly, start_date=today,
+                                    next_payment_date=today)
+        Subscription.objects.create(user=self.user, plan=self.yearly, start_date=today,
+                                    next_payment_date=self.next_month)
+
+    def test_summary_groups_and_projects_spend(self):
+        data = self.client.get(SUMMARY_URL).json()
+
+        assert data["total_price"] == 19500
+        assert {row["category"] for row in data["by_category"]} == {"video", "music"}
+        assert data["by_service"][0]["service_name"] == "Melon"
+
+        projection = data["projection"]
+        assert len(projection) == 12
+        # 이번 달: 월간 9500 / 다음 달: 월간 9500 + 연간 120000 / 그 다음 달: 월간만
+        assert [row["total_price"] for row in projection[:3]] == [9500, 129500, 9500]
+
+    def test_summary_is_cached_until_subscriptions_change(self):
+        self.client.get(SUMMARY_URL)
+        with self.assertNumQueries(0):
+            self.client.get(SUMMARY_URL)
+
+        Subscription.objects.create(user=self.user, plan=self.monthly, start_date=self.next_month,
+                                    next_payment_date=self.next_month,
+                                    price_override=Decimal("500"))
+
+        assert self.client.get(SUMMARY_URL).json()["total_price"] == 20000
+
+
+class SubscriptionCsvExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="csv", password="pw1234")
+        cls.admin = User.objects.create_user(username="finance", password="pw1234", is_staff=True)
+        service = Service.objects.create(name="Melon", category="music")
+        yearly = Plan.objects.create(service=service, plan_name="Yearly",
+                                     billing_cycle="year", price=Decimal("120000"))
+        Subscription.objects.create(user=cls.user, plan=yearly, start_date="2025-01-01",
+                                    next_payment_date="2026-01-01")
+        Subscription.objects.create(user=cls.admin, plan=yearly, start_date="2025-01-01",
+                                    next_payment_date="2026-01-01", price_override=Decimal("60000"))
+
+    def _read(self, response):
+        assert response.streaming
+        return b"".join(response.streaming_content).decode("utf-8").lstrip("\ufeff").splitlines()
+
+    def test_user_export_streams_monthly_prices(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        lines = self._read(client.get("/api/my/subscriptions/export_csv/"))
+
+        assert lines == ["서비스명,요금제,월 가격,다음 결제일", "Melon,Yearly,10000,2026-01-01"]
+
+    def test_admin_export_includes_all_users(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        assert client.get("/api/my/subscriptions/export_all_csv/").status_code == status.HTTP_403_FORBIDDEN
+
+        client.force_authenticate(user=self.admin)
+        lines = self._read(client.get("/api/my/subscriptions/export_all_csv/"))
+
+        assert len(lines) == 3
+        assert lines[2].endswith("finance,Melon,Yearly,year,5000,사용,2026-01-01")
+
+
+class SubscriptionReportTests(TestCase):
+    """PDF 리포트가 작업 큐에서 렌더링되고, 상태가 같으면 저장된 파일을 재사용하는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="report", password="pw1234")
+        cls.other = User.objects.create_user(username="report2", password="pw1234")
+        service = Service.objects.create(name="Netflix", category="video")
+        cls.plan = Plan.objects.create(service=service, plan_name="Basic", price=Decimal("9500"))
+        Subscription.objects.create(user=cls.user, plan=cls.plan, start_date="2025-01-01",
+                                    next_payment_date="2025-02-01")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(reports, "REPORTS_DIR", tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_report_job_lifecycle(self):
+        res = self.client.post("/api/my/subscriptions/reports/")
+        assert res.status_code == status.HTTP_202_ACCEPTED, res.content
+        job_id = res.json()["job_id"]
+
+        assert reports.wait_for_report(job_id, timeout=30) == reports.STATUS_DONE
+        res = self.client.get(f"/api/my/subscriptions/reports/{job_id}/")
+        assert res.status_code == status.HTTP_200_OK
+        assert res["Content-Type"] == "application/pdf"
+
+        # 구독 상태가 그대로면 같은 작업 ID로 저장된 PDF를 바로 반환
+        with mock.patch.object(reports, "_get_executor") as executor:
+            res = self.client.get("/api/my/subscriptions/export_pdf/")
+        executor.assert_not_called()
+        assert res.status_code == status.HTTP_200_OK
+
+        other = APIClient()
+        other.force_authenticate(user=self.other)
+        assert other.get(f"/api/my/subscriptions/reports/{job_id}/").status_code == status.HTTP_404_NOT_FOUND
+
+    def test_subscription_change_creates_new_job(self):
+        first = self.client.post("/api/my/subscriptions/reports/").json()["job_id"]
+
+        Subscription.objects.create(user=self.user, plan=self.plan, start_date="2025-03-01",
+                                    next_payment_date="2025-04-01")
+        second = self.client.post("/api/my/subscriptions/reports/").json()["job_id"]
+
+        assert first != second
+        for job_id in (first, second):
+            assert reports.wait_for_report(job_id, timeout=30) == reports.STATUS_DONE
+
+
+    def test_export_pdf_waits_at_most_one_second(self):
+        never_done = mock.Mock()
+        never_done.submit.return_value = Future()
+        with mock.patch.object(reports, "_get_executor", return_value=never_done), \
+                override_settings(SUBSCRIPTION_REPORTS={"WAIT_SECONDS": 15}):
+            started = time.monotonic()
+            res = self.client.get("/api/my/subscriptions/export_pdf/")
+        assert res.status_code == status.HTTP_202_ACCEPTED
+        assert time.monotonic() - started < 2
+        assert res.json()["status_url"].endswith(f"/reports/{res.json()['job_id']}/")
+
+    def test_callback_writes_to_paths_resolved_at_submit(self):
+        future = Future()
+        pending_pool = mock.Mock()
+        pending_pool.submit.return_value = future
+        with mock.patch.object(reports, "_get_executor", return_value=pending_pool):
+            job_id = self.client.post("/api/my/subscriptions/reports/").json()["job_id"]
+
+        moved = tempfile.TemporaryDirectory()
+        self.addCleanup(moved.cleanup)
+        with mock.patch.object(reports, "REPORTS_DIR", moved.name):
+            future.set_result({"render_ms": 1.0})
+        assert reports.get_report_meta(job_id)["timings"] == {"render_ms": 1.0}
+        assert reports.get_report_meta(job_id)["user_id"] == self.user.pk
+        assert not os.path.exists(reports._path(job_id, ".pending"))
+        assert os.listdir(moved.name) == []
+
+    def test_failed_submit_releases_pending_marker(self):
+        failing = mock.Mock()
+        failing.submit.side_effect = RuntimeError("cannot start renderer")
+        with mock.patch.object(reports, "_get_executor", return_value=failing):
+            with self.assertRaises(RuntimeError):
+                self.client.post("/api/my/subscriptions/reports/")
+        job_id, _ = reports.build_report_context(self.user, Subscription.objects.filter(user=self.user))
+        assert reports.get_report_status(job_id) is None
+
+    def test_broken_pool_is_rebuilt(self):
+        broken = mock.Mock()
+        broken.submit.side_effect = BrokenProcessPool("renderer died")
+        with mock.patch.object(reports, "_executor", broken):
+            res = self.client.post("/api/my/subscriptions/reports/")
+            assert res.status_code == status.HTTP_202_ACCEPTED, res.content
+            rebuilt = reports._executor
+            assert rebuilt is not broken
+        self.addCleanup(rebuilt.shutdown)
+        broken.shutdown.assert_called_once()
+        assert reports.wait_for_report(res.json()["job_id"], timeout=30) == reports.STATUS_DONE
+
+
+class ReportRendererTests(TestCase):
+    def test_renderer_is_reused_and_output_is_byte_stable(self):
+        paths = reports.stylesheet_paths()
+        renderer = get_renderer(paths)
+        assert get_renderer(paths) is renderer
+
+        html = render_to_string(reports.TEMPLATE_NAME, {
+            "user": {"username": "renderer"},
+            "subscriptions": [{"service_name": "Netflix", "plan_name": "Basic", "price": 9500,
+                               "billing_cycle": "month", "next_payment_date": "2025-02-01"}],
+            "total_price": 9500,
+        })
+        first, timings = renderer.render(html)
+        second, _ = renderer.render(html)
+
+        assert first == second
+        assert {"parse_seconds", "layout_seconds", "write_seconds", "total_seconds"} <= set(timings)
+
+
+BOOKMARKS_URL = "/api/my/bookmarks/"
+
+
+class UserDataCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="cached", password="pw1234")
+        cls.other = User.objects.create_user(username="other", password="pw1234")
+        cls.service = Service.objects.create(name="Netflix", category="video")
+        cls.plan = Plan.objects.create(service=cls.service, plan_name="Basic", price=Decimal("9500"))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.subscription = Subscription.objects.create(
+            user=self.user, plan=self.plan, start_date="2025-01-01", next_payment_date="2025-02-01")
+
+    def test_list_is_served_from_cache_until_subscription_changes(self):
+        first = self.client.get(SUBSCRIPTIONS_URL).json()
+        with self.assertNumQueries(0):
+            assert self.client.get(SUBSCRIPTIONS_URL).json() == first
+
+        # 다른 사용자의 구독 변경은 영향 없음
+        Subscription.objects.create(user=self.other, plan=self.plan, start_date="2025-01-01",
+                                    next_payment_date="2025-02-01")
+        with self.assertNumQueries(0):
+            self.client.get(SUBSCRIPTIONS_URL)
+
+        self.client.patch(f"{SUBSCRIPTIONS_URL}{self.subscription.pk}/", {"price_override": "5000"}, format="json")
+        assert self.client.get(SUBSCRIPTIONS_URL).json()["total_price"] == 5000
+
+        self.client.delete(f"{SUBSCRIPTIONS_URL}{self.subscription.pk}/")
+        assert self.client.get(SUBSCRIPTIONS_URL).json()["count"] == 0
+
+    def test_plan_price_change_invalidates_list(self):
+        assert self.client.get(SUBSCRIPTIONS_URL).json()["total_price"] == 9500
+
+        self.plan.price = Decimal("10500")
+        self.plan.save()
+
+        assert self.client.get(SUBSCRIPTIONS_URL).json()["total_price"] == 10500
+
+    def test_bookmarks_are_cached_per_user(self):
+        assert self.client.get(BOOKMARKS_URL).json() == []
+        with self.assertNumQueries(0):
+            self.client.get(BOOKMARKS_URL)
+
+        res = self.client.post(BOOKMARKS_URL, {"service": self.service.pk}, format="json")
+        assert res.status_code == status.HTTP_201_CREATED, res.content
+        assert [row["service"] for row in self.client.get(BOOKMARKS_URL).json()] == [self.service.pk]
+
+        other_client = APIClient()
+        other_client.force_authenticate(user=self.other)
+        assert other_client.get(BOOKMARKS_URL).json() == []
+
+
+class RenewalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="renewal", password="pw1234")
+        service = Service.objects.create(name="Netflix", category="video")
+        cls.monthly = Plan.objects.create(service=service, plan_name="Basic", price=Decimal("9500"))
+        cls.yearly = Plan.objects.create(service=service, plan_name="Yearly", billing_cycle="year",
+                                         price=Decimal("99000"))
+
+    def _subscribe(self, plan, start, next_payment, status=True):
+        return Subscription.objects.create(user=self.user, plan=plan, start_date=start,
+                                           next_payment_date=next_payment, status=status)
+
+    def test_next_payment_clamps_to_month_end_without_drift(self):
+        start = date(2025, 1, 31)
+        assert next_payment_after(date(2025, 1, 31), start, "month", date(2025, 1, 31)) == date(2025, 2, 28)
+        assert next_payment_after(date(2025, 2, 28), start, "month", date(2025, 3, 1)) == date(2025, 3, 31)
+        assert next_payment_after(date(2025, 2, 28), start, "month", date(2025, 6, 15)) == date(2025, 6, 30)
+        leap = date(2024, 2, 29)
+        assert next_payment_after(date(2025, 2, 28), leap, "year", date(2028, 3, 1)) == date(2029, 2, 28)
+        assert next_payment_after(date(2025, 2, 28), leap, "year", date(2028, 2, 1)) == date(2028, 2, 29)
+
+    def test_command_advances_due_rows_in_chunks_and_is_idempotent(self):
+        due = [self._subscribe(self.monthly, date(2025, 1, 10), date(2025, 3, 10)) for _ in range(5)]
+        yearly = self._subscribe(self.yearly, date(2024, 3, 1), date(2025, 3, 1))
+        future = self._subscribe(self.monthly, date(2025, 3, 1), date(2025, 4, 1))
+        paused = self._subscribe(self.monthly, date(2025, 1, 10), date(2025, 2, 10), status=False)
+
+        out = StringIO()
+        call_command("advance_renewals", date="2025-03-20", chunk_size=2, stdout=out)
+        assert "6건" in out.getvalue() and "청크 3개" in out.getvalue()
+
+        for subscription in due:
+            subscription.refresh_from_db()
+            assert subscription.next_payment_date == date(2025, 4, 10)
+        for subscription, expected in ((yearly, date(2026, 3, 1)), (future, date(2025, 4, 1)),
+                                       (paused, date(2025, 2, 10))):
+            subscription.refresh_from_db()
+            assert subscription.next_payment_date == expected
+
+        out = StringIO()
+        call_command("advance_renewals", date="2025-03-20", stdout=out)
+        assert "0건" in out.getvalue()
+
+    def test_limit_allows_resuming(self):
+        for _ in range(3):
+            self._subscribe(self.monthly, date(2025, 1, 10), date(2025, 2, 10))
+
+        assert advance_renewals(as_of=date(2025, 2, 20), limit=2).advanced == 2
+        assert advance_renewals(as_of=date(2025, 2, 20)).advanced == 1
+        assert not Subscription.objects.filter(next_payment_date__lte=date(2025, 2, 20)).exists()
+
+
+class PaymentNotificationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.alice = User.objects.create_user(username="alice", password="pw1234", email="alice@example.com",
+                                             display_name="앨리스")
+        cls.bob = User.objects.create_user(username="bob", password="pw1234", email="bob@example.com")
+        cls.no_email = User.objects.create_user(username="noemail", password="pw1234")
+        service = Service.objects.create(name="Netflix", category="video")
+        plan = Plan.objects.create(service=service, plan_name="Basic", price=Decimal("9500"))
+        cls.as_of = date(2025, 3, 10)
+
+        def subscribe(user, next_payment, status=True):
+            return Subscription.objects.create(user=user, plan=plan, start_date=date(2025, 1, 1),
+                                               next_payment_date=next_payment, status=status)
+
+        cls.alice_due = [subscribe(cls.alice, date(2025, 3, 11)), subscribe(cls.alice, date(2025, 3, 13))]
+        subscribe(cls.alice, date(2025, 3, 20))                     # 기간 밖
+        subscribe(cls.alice, date(2025, 3, 12), status=False)      # 해지
+        cls.bob_due = subscribe(cls.bob, date(2025, 3, 10))
+        subscribe(cls.no_email, date(2025, 3, 11))                  # 이메일 없음
+
+    def test_sends_one_digest_per_user_and_never_twice(self):
+        stats = send_payment_notifications(as_of=self.as_of, days=3, batch_size=1, max_workers=2)
+        assert (stats.users, stats.subscriptions, stats.sent, stats.batches) == (2, 3, 2, 2)
+        assert sorted(message.to[0] for message in mail.outbox) == ["alice@example.com", "bob@example.com"]
+        alice_mail = next(message for message in mail.outbox if message.to == ["alice@example.com"])
+        assert "2건" in alice_mail.subject
+        assert "앨리스님" in alice_mail.body and "2025-03-13" in alice_mail.body and "19000원" in alice_mail.body
+
+        stats = send_payment_notifications(as_of=self.as_of, days=3)
+        assert stats.sent == 0 and len(mail.outbox) == 2
+
+        # 결제일이 넘어가면 새 결제일로 다시 알림 대상이 됩니다.
+        Subscription.objects.filter(pk=self.bob_due.pk).update(next_payment_date=date(2025, 3, 12))
+        assert send_payment_notifications(as_of=self.as_of, days=3).sent == 1
+
+    def test_failed_send_is_retried_on_next_run(self):
+        with mock.patch("django.core.mail.EmailMessage.send", side_effect=OSError("smtp down")):
+            stats = send_payment_notifications(as_of=self.as_of, days=3)
+        assert (stats.sent, stats.failed) == (0, 2)
+
+        assert send_payment_notifications(as_of=self.as_of, days=3).sent == 2
+        assert len(mail.outbox) == 2
+
+    def test_connection_failure_is_counted_not_raised(self):
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.open",
+                        side_effect=ConnectionRefusedError("smtp down")):
+            stats = send_payment_notifications(as_of=self.as_of, days=3, max_workers=1)
+        assert (stats.sent, stats.failed) == (0, 2)
+        assert not PaymentNotification.objects.exists()
+
+    def test_sent_digests_are_recorded_even_if_the_run_stops(self):
+        original_send = EmailMessage.send
+
+        def send_then_stop(message, *args, **kwargs):
+            if message.to == ["bob@example.com"]:
+                raise KeyboardInterrupt
+            return original_send(message, *args, **kwargs)
+
+        with mock.patch("django.core.mail.EmailMessage.send", send_then_stop), \
+                self.assertRaises(KeyboardInterrupt):
+            send_payment_notifications(as_of=self.as_of, days=3, max_workers=1)
+        assert set(PaymentNotification.objects.values_list("subscription_id", flat=True)) == \
+            {subscription.pk for subscription in self.alice_due}
+
+    def test_command_dry_run_sends_nothing(self):
+        out = StringIO()
+        call_command("send_payment_notifications", date="2025-03-10", days=3, dry_run=True, stdout=out)
+        assert "사용자 2명 / 구독 3건" in out.getvalue()
+        assert mail.outbox == []
+
+
+class BookmarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="bookmarker", password="pw1234")
+        cls.netflix = Service.objects.create(name="Netflix", category="video")
+        Plan.objects.create(service=cls.netflix, plan_name="Basic", price=Decimal("9500"))
+        Plan.objects.create(service=cls.netflix, plan_name="Yearly", billing_cycle="year", price=Decimal("120000"))
+        cls.melon = Service.objects.create(name="Melon", category="music")
+        cls.empty = Service.objects.create(name="Empty")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_duplicate_is_rejected_by_unique_constraint(self):
+        res = self.client.post(BOOKMARKS_URL, {"service": self.netflix.pk, "memo": " 메모 "}, format="json")
+        assert res.status_code == status.HTTP_201_CREATED, res.content
+        assert res.json()["service_name"] == "Netflix" and res.json()["memo"] == "메모"
+
+        res = self.client.post(BOOKMARKS_URL, {"service": self.netflix.pk}, format="json")
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert Bookmark.objects.filter(user=self.user).count() == 1
+
+    def test_update_to_already_bookmarked_service_is_rejected(self):
+        Bookmark.objects.create(user=self.user, service=self.netflix, memo="")
+        melon = Bookmark.objects.create(user=self.user, service=self.melon, memo="")
+
+        res = self.client.patch(f"{BOOKMARKS_URL}{melon.pk}/", {"service": self.netflix.pk}, format="json")
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        res = self.client.patch(f"{BOOKMARKS_URL}{melon.pk}/", {"service": self.melon.pk, "memo": "유지"},
+                                format="json")
+        assert res.status_code == status.HTTP_200_OK, res.content
+
+    def test_list_includes_price_summary_in_one_query(self):
+        for service in (self.netflix, self.melon, self.empty):
+            Bookmark.objects.create(user=self.user, service=service, memo="")
+
+        with self.assertNumQueries(1):
+            rows = self.client.get(BOOKMARKS_URL).json()
+        by_name = {row["service_name"]: row for row in rows}
+        assert by_name["Netflix"]["min_monthly_price"] == 9500
+        assert by_name["Netflix"]["max_monthly_price"] == 10000
+        assert by_name["Netflix"]["plan_count"] == 2
+        assert by_name["Empty"]["service_category"] == "기타"
+        assert by_name["Empty"]["min_monthly_price"] is None
+
+    def test_bulk_add_remove_and_toggle(self):
+        Bookmark.objects.create(user=self.user, service=self.netflix, memo="남김")
+        self.client.get(BOOKMARKS_URL)  # 캐시 채우기
+
+        res = self.client.post(f"{BOOKMARKS_URL}bulk/",
+                               {"add": [self.netflix.pk, self.melon.pk], "toggle": [self.empty.pk]}, format="json")
+        assert res.status_code == status.HTTP_200_OK, res.content
+        assert res.json()["added"] == sorted([self.melon.pk, self.empty.pk])
+        assert res.json()["services"] == sorted([self.netflix.pk, self.melon.pk, self.empty.pk])
+        assert Bookmark.objects.get(user=self.user, service=self.netflix).memo == "남김"
+        assert len(self.client.get(BOOKMARKS_URL).json()) == 3
+
+        res = self.client.post(f"{BOOKMARKS_URL}bulk/",
+                               {"remove": [self.netflix.pk], "toggle": [self.empty.pk]}, format="json")
+        assert res.json()["removed"] == sorted([self.netflix.pk, self.empty.pk])
+        assert [row["service"] for row in self.client.get(BOOKMARKS_URL).json()] == [self.melon.pk]
+
+    def test_bulk_rejects_unknown_services_without_partial_writes(self):
+        res = self.client.post(f"{BOOKMARKS_URL}bulk/", {"add": [self.melon.pk, 999999]}, format="json")
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Bookmark.objects.filter(user=self.user).exists()
+
+        res = self.client.post(f"{BOOKMARKS_URL}bulk/", {"add": [self.melon.pk], "remove": [self.melon.pk]},
+                               format="json")
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,32 +1,41 @@
 # subscriptions/views.py
 from math import ceil
-import csv
 from datetime import date
 from dateutil.relativedelta import relativedelta
 
 
 from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticated # 로그인 권한
-from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated, IsAdminUser # 로그인 권한
+from rest_framework.exceptions import ValidationError, NotFound
 from .models import Subscription, models, Bookmark
-from .serializers import SubscriptionSerializer, BookmarkSerializer
+from services.models import Service
+from .serializers import SubscriptionSerializer, BookmarkSerializer, BookmarkBulkSerializer
 
 #list 메서드 커스터마이징을 위한 import
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.db.models.functions import Coalesce
+from rest_framework.reverse import reverse
 from decimal import Decimal
-from django.db.models import Sum
-from django.http import HttpResponse
-from django.template.loader import render_to_string
-from weasyprint import HTML, CSS
+from django.http import FileResponse, StreamingHttpResponse
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from backend.pagination import KeysetPagination
+from .pricing import annotate_plan_fields, annotate_bookmark_fields, summarize_by_category
+from .analytics import build_spending_summary
+from .cache import bump_user_version, cached_user_data, user_cache_key
+from .exports import stream_user_csv, stream_admin_csv
+from . import reports
+from django.core.cache import cache
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
 
 
 class SubscriptionViewSet(viewsets.ModelViewSet):
     serializer_class = SubscriptionSerializer
     # 이 API는 반드시 로그인한 사용자만 접근 가능
     permission_classes = [IsAuthenticated]
+    # ?cursor= / ?page_size= 를 보낸 경우에만 키셋 페이지네이션 적용 (backend/pagination.py)
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
@@ -38,10 +47,12 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
             # 스키마 생성 시에는 빈 쿼리셋 반환
             return Subscription.objects.none()
         # 로그인한 본인 것만
-        # Subscriptions 테이블과 plan 테이블을 JOIN해서 함께 가져옴
-        results = Subscription.objects.filter(user=self.request.user).select_related('plan', 'plan__service')
-        return results
-        # return Subscription.objects.filter(user=self.request.user)
+        # Subscriptions 테이블과 plan/service 테이블을 JOIN해서 직렬화에 필요한 값만 함께 가져옴
+        return annotate_plan_fields(Subscription.objects.filter(user=self.request.user))
+
+    def _reload(self, serializer):
+        """생성/수정 응답에도 annotate 된 요금제 값이 들어가도록 저장된 행을 다시 읽습니다."""
+        serializer.instance = self.get_queryset().get(pk=serializer.instance.pk)
 
     def perform_create(self, serializer):
         """
@@ -64,39 +75,55 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
             start_date=today,
             next_payment_date=next_payment,
             custom_memo=memo)
+        self._reload(serializer)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        self._reload(serializer)
 
     def list(self, request, *args, **kwargs):
         if getattr(self, 'swagger_fake_view', False):
-            return Response({'count': 0, 'results': [], 'total_price': Decimal('0')})
-
-        queryset = self.filter_queryset(self.get_queryset())
-        for sub in queryset:
-            print(f"=== Subscription {sub.id} ===")
-            print(f"Plan: {sub.plan}")
-            print(f"Service: {sub.plan.service if sub.plan else None}")
-            print(f"Category: {sub.plan.service.category if (sub.plan and sub.plan.service) else None}")
+            return Response({'count': 0, 'results': [], 'total_price': Decimal('0'), 'category_totals': []})
 
-        total_price = Decimal('0')  # ← 총합 초기화
+        # 구독/요금제가 바뀌기 전까지는 사용자별 캐시에서 바로 응답합니다. (subscriptions/cache.py)
+        return Response(cached_user_data(request, 'list', self._build_list_data))
 
-        for sub in queryset:
-            # 기본 가격 결정 (price_override > plan.price)
-            price = sub.price_override or (sub.plan.price if sub.plan else Decimal('0'))
+    def _build_list_data(self):
+        queryset = self.filter_queryset(self.get_queryset())
 
-            # billing_cycle이 year이면 월 단위 환산
-            if sub.plan and getattr(sub.plan, 'billing_cycle', None) == 'year':
-                price = price / Decimal('12')  # ← 수정된 핵심 부분
+        # 개수/월 환산 합계/카테고리별 소계를 GROUP BY 쿼리 한 번으로 계산 (subscriptions/pricing.py)
+        count, total_price, categories = summarize_by_category(queryset)
 
-            total_price += price  # 총합 누적
+        # 페이지네이션 요청이 있으면 현재 페이지만 직렬화 (합계/개수는 전체 기준)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page if page is not None else queryset, many=True)
+        data = {
+            'count': count,
+            'results': list(serializer.data),  # ReturnList는 직렬화기를 참조하므로 캐시에 넣기 전에 list로
+            'total_price': ceil(total_price),#121028은찬 : 소수점자리는 가독성을 떨어뜨리기 때문에 올림 처리
+            'category_totals': [
+                {**row, 'total_price': ceil(row['total_price'])} for row in categories
+            ],
+        }
+        if page is not None:
+            data['next'] = self.paginator.get_next_link()
+        return data
 
-        serializer = self.get_serializer(queryset, many=True)
-        # ⭐ Serializer 결과 확인
-        print(f"=== Serialized data ===")
-        print(serializer.data)
-        return Response({
-            'count': queryset.count(),
-            'results': serializer.data,
-            'total_price': ceil(total_price)#121028은찬 : 소수점자리는 가독성을 떨어뜨리기 때문에 올림 처리
-        })
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        현재 사용자의 지출 요약(카테고리별/서비스별 월 환산 지출, 12개월 결제 예상액)을 반환합니다.
+        URL: /api/my/subscriptions/summary/
+        구독이 바뀌기 전까지는 사용자별 캐시에서 바로 응답합니다.
+        """
+        today = date.today()
+        key = user_cache_key(request.user.pk, 'summary', today.isoformat())
+        data = cache.get(key)
+        if data is None:
+            data = build_spending_summary(self.get_queryset(), today=today)
+            cache.set(key, data, timeout=60 * 60)
+        return Response(data)
 
     # 💡 2. CSV 내보내기 '액션'을 추가합니다.
     @action(detail=False, methods=['get'])
@@ -104,27 +131,43 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         """
         현재 사용자의 구독 목록을 CSV 파일로 내보냅니다.
         URL: /api/my/subscriptions/export_csv/
+        월 가격은 목록 API와 같은 기준(price_override 우선, 연간은 12로 나눔)으로 계산합니다.
         """
         # 💡 3. self.get_queryset()을 재사용하여 '본인 것만' 가져옵니다.
-        queryset = self.get_queryset().select_related("plan__service")
-
-        response = HttpResponse(
-            content_type='text/csv',
+        return StreamingHttpResponse(
+            stream_user_csv(self.get_queryset()),
+            content_type='text/csv; charset=utf-8',
             headers={'Content-Disposition': 'attachment; filename="subscriptions.csv"'},
         )
-        response.write(u'\ufeff'.encode('utf8'))  # 한글 깨짐 방지 (BOM 추가)
 
-        writer = csv.writer(response)
-        writer.writerow(['서비스명', '요금제', '월 가격', '다음 결제일'])  # CSV 헤더
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export_all_csv(self, request):
+        """
+        (관리자 전용) 모든 사용자의 구독을 CSV로 내보냅니다. 재무팀 정산용.
+        URL: /api/my/subscriptions/export_all_csv/
+        전체를 메모리에 올리지 않고 청크 단위로 읽어 바로 스트리밍합니다.
+        """
+        return StreamingHttpResponse(
+            stream_admin_csv(Subscription.objects.all()),
+            content_type='text/csv; charset=utf-8',
+            headers={'Content-Disposition': 'attachment; filename="all_subscriptions.csv"'},
+        )
 
-        for sub in queryset:
-            writer.writerow([
-                sub.plan.service.name,
-                sub.plan.plan_name,
-                sub.plan.price,  # 또는 price_override
-                sub.next_payment_date
-            ])
+    def _report_response(self, request, job_id, status_name, code=202):
+        return Response({
+            'job_id': job_id,
+            'status': status_name,
+            'status_url': reverse('subscriptions-report-status', kwargs={'job_id': job_id}, request=request),
+        }, status=code)
 
+    def _report_file(self, job_id):
+        response = FileResponse(open(reports.get_report_path(job_id), 'rb'), as_attachment=True,
+                                filename='report.pdf', content_type='application/pdf')
+        # 렌더링 단계별 소요 시간(ms)을 Server-Timing 헤더로 노출 (브라우저 개발자도구에서 확인 가능)
+        timings = reports.get_report_meta(job_id).get('timings') or {}
+        if timings:
+            response['Server-Timing'] = ', '.join(
+                f"pdf-{name.replace('_seconds', '')};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
         return response
 
     @action(detail=False, methods=['get'])
@@ -132,35 +175,48 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         """
         현재 사용자의 구독 현황을 PDF 파일로 내보냅니다.
         URL: /api/my/subscriptions/export_pdf/
+        구독 상태가 그대로면 저장된 PDF를 다시 렌더링하지 않고 바로 반환합니다.
+        새로 만들어야 하면 렌더링 풀에 작업을 넣고 최대 1초(WAIT_SECONDS)만 기다린 뒤,
+        그래도 끝나지 않았으면 202와 함께 상태 조회 URL을 반환합니다. (동기 워커를 오래 붙잡지 않음)
         """
-        # 1. 쿼리셋과 총액 계산 (기존 list 뷰 로직 재사용)
-        queryset = self.get_queryset().select_related("plan__service")
-        
-        total_price = queryset.aggregate(
-            total=Sum(Coalesce('price_override', 'plan__price',
-                               output_field=models.DecimalField(max_digits=10, decimal_places=2)))
-        )['total'] or Decimal('0')
-
+        job_id, status_name = reports.enqueue_report(request.user, self.get_queryset())
+        if status_name == reports.STATUS_PENDING:
+            wait = getattr(settings, 'SUBSCRIPTION_REPORTS', {}).get('WAIT_SECONDS', reports.MAX_WAIT_SECONDS)
+            status_name = reports.wait_for_report(job_id, timeout=min(wait, reports.MAX_WAIT_SECONDS))
 
-        # 2. 템플릿에 전달할 데이터(context) 준비
-        context = {
-            'user': request.user,
-            'subscriptions': queryset,
-            'total_price': total_price
-        }
+        if status_name == reports.STATUS_DONE:
+            return self._report_file(job_id)
+        if status_name == reports.STATUS_FAILED:
+            return self._report_response(request, job_id, status_name, code=500)
+        return self._report_response(request, job_id, reports.STATUS_PENDING)
 
-        # 3. HTML 템플릿을 context 데이터와 "구워서" 문자열로 만듭니다.
-        html_string = render_to_string('pdf/subscription_report.html', context)
+    @action(detail=False, methods=['post'], url_path='reports')
+    def create_report(self, request):
+        """
+        PDF 리포트 생성 작업을 등록합니다. (렌더링을 기다리지 않음)
+        URL: /api/my/subscriptions/reports/
+        """
+        job_id, status_name = reports.enqueue_report(request.user, self.get_queryset())
+        code = 200 if status_name == reports.STATUS_DONE else 202
+        return self._report_response(request, job_id, status_name, code=code)
 
-        # 4. WeasyPrint를 사용해 HTML 문자열을 PDF로 변환
-        pdf = HTML(string=html_string).write_pdf()
+    @action(detail=False, methods=['get'], url_path=r'reports/(?P<job_id>[0-9a-f]{64})')
+    def report_status(self, request, job_id=None):
+        """
+        리포트 작업 상태를 조회합니다. 완료되었으면 PDF 파일을 바로 반환합니다.
+        URL: /api/my/subscriptions/reports/<job_id>/
+        """
+        if reports.get_report_owner(job_id) != request.user.pk:
+            raise NotFound()
 
-        # 5. PDF 파일을 HTTP 응답으로 반환
-        response = HttpResponse(pdf, content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="report.pdf"'
+        status_name = reports.get_report_status(job_id)
+        if status_name == reports.STATUS_DONE:
+            return self._report_file(job_id)
+        if status_name is None:
+            raise NotFound()
+        code = 500 if status_name == reports.STATUS_FAILED else 202
+        return self._report_response(request, job_id, status_name, code=code)
 
-        return response
-    
 
 class BookmarkViewSet(viewsets.ModelViewSet):
     serializer_class = BookmarkSerializer
@@ -176,21 +232,82 @@ class BookmarkViewSet(viewsets.ModelViewSet):
             # 스키마 생성 시에는 빈 쿼리셋 반환
             return Bookmark.objects.none()
         # 로그인한 본인 것만
-        return Bookmark.objects.filter(user=self.request.user)
+        # 서비스와 요금 요약(service_price_summary)을 JOIN 해서 목록을 쿼리 한 번으로 만듭니다.
+        return annotate_bookmark_fields(Bookmark.objects.filter(user=self.request.user))
+
+    def _reload(self, serializer):
+        """생성/수정 응답에도 annotate 된 서비스 값이 들어가도록 저장된 행을 다시 읽습니다."""
+        serializer.instance = self.get_queryset().get(pk=serializer.instance.pk)
+
+    def list(self, request, *args, **kwargs):
+        if getattr(self, 'swagger_fake_view', False):
+            return super().list(request, *args, **kwargs)
+        # 북마크가 바뀌기 전까지는 사용자별 캐시에서 바로 응답합니다. (subscriptions/cache.py)
+        return Response(cached_user_data(
+            request, 'bookmarks', lambda: list(super(BookmarkViewSet, self).list(request, *args, **kwargs).data)))
     
     def perform_create(self, serializer):
         """
         새로운 북마크 정보를 생성할 때, user 필드에 현재 로그인한 사용자를
         자동으로 할당해주는 함수입니다.
+        중복 여부는 미리 조회하지 않고 DB 고유 인덱스 위반(IntegrityError)으로 판단합니다.
+        (동시에 같은 요청이 두 번 와도 한 건만 저장됩니다)
         """
         memo = (serializer.validated_data.get('memo') or '').strip()
-        service = serializer.validated_data['service']
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user, memo=memo)
+        except IntegrityError:
+            raise ValidationError("이미 이 서비스는 북마크되어 있습니다.")
+        self._reload(serializer)
 
-        # 중복 북마크 방지
-        if Bookmark.objects.filter(user=self.request.user, service=service).exists():
+    def perform_update(self, serializer):
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
             raise ValidationError("이미 이 서비스는 북마크되어 있습니다.")
-        
-        serializer.save(
-            user=self.request.user,
-            memo=memo
-        )
\ No newline at end of file
+        self._reload(serializer)
+
+    @extend_schema(request=BookmarkBulkSerializer, responses=OpenApiTypes.OBJECT)
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        여러 서비스의 북마크를 한 트랜잭션에서 추가/삭제/토글합니다.
+        URL: /api/my/bookmarks/bulk/
+        요청: {"add": [서비스 id...], "remove": [...], "toggle": [...]}
+        이미 있는 북마크 추가, 없는 북마크 삭제는 조용히 넘어갑니다.
+        """
+        serializer = BookmarkBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        add, remove, toggle = (serializer.validated_data[name] for name in ('add', 'remove', 'toggle'))
+        user = request.user
+
+        with transaction.atomic():
+            existing = set(
+                Bookmark.objects.filter(user=user, service_id__in=add | remove | toggle)
+                .values_list('service_id', flat=True)
+            )
+            to_add = (add | toggle) - existing
+            to_remove = (remove | toggle) & existing
+
+            missing = to_add - set(Service.objects.filter(pk__in=to_add).values_list('pk', flat=True))
+            if missing:
+                raise ValidationError({'add': [f"존재하지 않는 서비스입니다: {sorted(missing)}"]})
+
+            if to_remove:
+                Bookmark.objects.filter(user=user, service_id__in=to_remove).delete()
+            if to_add:
+                # 동시에 같은 북마크가 먼저 저장됐어도 고유 제약 충돌은 무시합니다.
+                Bookmark.objects.bulk_create(
+                    [Bookmark(user=user, service_id=service_id, memo='') for service_id in sorted(to_add)],
+                    ignore_conflicts=True)
+                # bulk_create는 시그널을 보내지 않으므로 사용자 캐시 버전을 직접 올립니다.
+                bump_user_version(user.pk)
+                transaction.on_commit(lambda: bump_user_version(user.pk))
+
+        return Response({
+            'added': sorted(to_add),
+            'removed': sorted(to_remove),
+            'services': sorted((existing - to_remove) | to_add),
+        })
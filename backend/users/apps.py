@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # 사용자 변경 시 인증용 사용자 캐시를 무효화하는 시그널 등록
+        from . import signals  # noqa: F401
@@ -0,0 +1,104 @@
+# users/async_views.py
+"""
+소셜 로그인 비동기 뷰 (ASGI, uvicorn 워커에서 실행)
+
+제공자 토큰 검증은 외부 API 호출(수백 ms)이 대부분이라, 동기 워커에서는 그동안 워커 하나가 통째로 멈춥니다.
+여기서는 httpx 비동기 클라이언트(users/social_providers.py aget_profile)와 Django 비동기 ORM을 써서
+기다리는 동안 같은 워커가 다른 요청을 처리합니다.
+"""
+import json
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .social_providers import VERIFIERS, SocialAuthError
+from .tokens import RefreshToken
+
+User = get_user_model()
+
+
+def _error(detail, status):
+    return JsonResponse({"detail": detail}, status=status, json_dumps_params={'ensure_ascii': False})
+
+
+# username 충돌 시 붙이는 접미사 시도 횟수
+USERNAME_ATTEMPTS = 5
+
+
+def _username_candidates(provider, provider_user_id):
+    """username은 '<제공자>_<id>'를 먼저 쓰고, 이미 있는 아이디면(직접 가입한 사용자 등) 임의 접미사를 붙입니다."""
+    base = f"{provider}_{provider_user_id}"[:50]
+    yield base
+    for _ in range(USERNAME_ATTEMPTS - 1):
+        suffix = secrets.token_hex(3)
+        yield f"{base[:50 - len(suffix) - 1]}_{suffix}"
+
+
+def _insert_user(user):
+    # 실패해도 바깥 트랜잭션을 깨뜨리지 않도록 savepoint 안에서 저장합니다.
+    with transaction.atomic():
+        user.save()
+
+
+async def get_or_create_social_user(profile):
+    """social_id("<제공자>:<제공자 사용자 id>")로 사용자를 찾고 없으면 비밀번호 없는 계정을 만듭니다."""
+    social_id = f"{profile['provider']}:{profile['provider_user_id']}"
+    user = await User.objects.filter(social_id=social_id).afirst()
+    if user is not None:
+        return user, False
+
+    name = (profile.get("name") or "")[:50]
+    for username in _username_candidates(profile['provider'], profile['provider_user_id']):
+        if await User.objects.filter(username=username).aexists():
+            continue
+        user = User(username=username, social_id=social_id, email=profile.get("email"),
+                    name=name, display_name=name)
+        user.set_unusable_password()
+        try:
+            await sync_to_async(_insert_user)(user)
+        except IntegrityError:
+            # 같은 사용자의 동시 첫 로그인이면 먼저 저장된 계정을 쓰고,
+            # 아니면 그 사이 같은 username이 생긴 것이므로 다음 후보로 넘어갑니다.
+            existing = await User.objects.filter(social_id=social_id).afirst()
+            if existing is not None:
+                return existing, False
+            continue
+        return user, True
+    raise IntegrityError(f"사용할 수 있는 username을 찾지 못했습니다: {social_id}")
+
+
+@csrf_exempt
+@require_POST
+async def social_login(request, provider):
+    """
+    제공자 토큰을 검증하고 JWT를 발급합니다.
+    URL: /api/auth/social/<provider>/  (kakao, naver: access_token / google: id_token)
+    예: {"token": "<제공자 토큰>"}
+    """
+    verifier = VERIFIERS.get(provider)
+    if verifier is None:
+        return _error("지원하지 않는 소셜 로그인입니다.", 404)
+    try:
+        token = json.loads(request.body or b"{}").get("token")
+    except (ValueError, AttributeError):
+        token = None
+    if not token:
+        return _error("token이 필요합니다.", 400)
+
+    try:
+        profile = await verifier.aget_profile(token)
+    except (SocialAuthError, KeyError, TypeError):
+        return _error("소셜 로그인 토큰을 확인할 수 없습니다.", 401)
+
+    user, created = await get_or_create_social_user(profile)
+    if not user.is_active:
+        return _error("비활성화된 계정입니다.", 403)
+    # OutstandingToken 저장(DB)이 있어 스레드에서 발급합니다.
+    refresh = await sync_to_async(RefreshToken.for_user)(user)
+    return JsonResponse({"refresh": str(refresh), "access": str(refresh.access_token), "created": created},
+                        status=201 if created else 200)
@@ -0,0 +1,102 @@
+# users/authentication.py
+"""
+요청마다 user 테이블을 조회하지 않는 JWT 인증
+
+simplejwt의 JWTAuthentication은 토큰의 user_id로 매 요청 User를 SELECT 합니다.
+CachedJWTAuthentication은 같은 조회 결과를 워커 내부 LRU(backend.cache.LocalLRUCache)에 짧게 보관합니다.
+
+- 캐시 키에 사용자별 인증 버전(공유 캐시, 운영은 Redis)을 넣어, 사용자 저장(비밀번호 변경 포함)/삭제/로그아웃 시
+  invalidate_cached_user()로 버전을 올리면 모든 워커에서 바로 새로 읽습니다.
+- 비밀번호 해시는 캐시에 넣지 않습니다. (지연 로딩 필드로 남아 실제로 접근할 때만 조회)
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from backend.cache import LocalLRUCache, MISSING
+
+_config = getattr(settings, 'AUTH_USER_CACHE', {})
+local_users = LocalLRUCache(
+    maxsize=_config.get('LOCAL_MAXSIZE', 1024),
+    ttl=_config.get('LOCAL_TTL', 60),
+)
+
+# 캐시하지 않는 필드 (비밀번호 해시는 워커 메모리에 오래 두지 않습니다)
+EXCLUDED_FIELDS = ('password',)
+
+
+def _version_key(user_id):
+    return f'users:auth:{user_id}:version'
+
+
+def get_auth_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), int(time.time() * 1000), timeout=None)
+        version = cache.get(_version_key(user_id))
+    return version
+
+
+def _bump(user_id):
+    current = cache.get(_version_key(user_id)) or 0
+    cache.set(_version_key(user_id), max(int(time.time() * 1000), current + 1), timeout=None)
+
+
+def invalidate_cached_user(user_id):
+    """사용자 정보가 바뀌었을 때 호출합니다. 커밋 전에 다른 요청이 옛 값을 다시 채우지 않도록 커밋 후 한 번 더 올립니다."""
+    _bump(user_id)
+    transaction.on_commit(lambda: _bump(user_id))
+
+
+def _cached_field_names(model):
+    return [field.attname for field in model._meta.concrete_fields if field.attname not in EXCLUDED_FIELDS]
+
+
+def load_user(user_id):
+    """(버전 확인용 공유 캐시 조회 1회 +) 워커 캐시에 없을 때만 DB에서 읽습니다. 없는 사용자면 None"""
+    model = get_user_model()
+    key = (user_id, get_auth_version(user_id))
+    values = local_users.get(key)
+    if values is MISSING:
+        names = _cached_field_names(model)
+        values = (
+            model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values_list(*names).first()
+        )
+        local_users.set(key, values)
+    if values is None:
+        return None
+    # 요청마다 새 인스턴스를 만들어 요청 간에 같은 객체를 공유하지 않습니다.
+    return model.from_db(model.objects.db, _cached_field_names(model), values)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication과 같은 검증을 하되 사용자 조회만 load_user()로 바꿉니다."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = load_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # 비밀번호 해시가 필요한 설정이면 simplejwt 기본 동작(DB 조회)을 그대로 사용
+            return super().get_user(validated_token)
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """drf-spectacular 스키마에서 기본 JWT 인증과 같은 bearer 방식으로 표시합니다."""
+    target_class = 'users.authentication.CachedJWTAuthentication'
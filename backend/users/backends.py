@@ -1,16 +1,27 @@
 from django.contrib.auth.backends import BaseBackend
 from django.contrib.auth import get_user_model
+
+from .metrics import login_timings, measure
+from .passwords import run_dummy_hash, verify_password
+
 User = get_user_model()
 
 class UsernameBackend(BaseBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
+        """
+        로그인 단계별 시간(lookup/hash)을 users/metrics.py 에 남깁니다.
+        비밀번호 검증은 프로세스당 동시 해시 수 제한(users/passwords.py) 안에서 하고, 오래된 해시는 로그인 성공 시 다시 해시합니다.
+        """
         if not username or not password:
             return None
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            return None
-        return user if user.check_password(password) else None
+        timings = login_timings(request)
+        with measure(timings, 'lookup'):
+            user = User.objects.filter(username=username).first()
+        with measure(timings, 'hash'):
+            if user is None:
+                run_dummy_hash(password)
+                return None
+            return user if verify_password(user, password) else None
 
     def get_user(self, user_pk):
         try: return User.objects.get(pk=user_pk)
@@ -0,0 +1,217 @@
+# users/blacklist.py
+"""
+refresh 토큰 블랙리스트 조회 계층
+
+simplejwt는 토큰을 검증할 때마다 BlacklistedToken JOIN OutstandingToken 을 조회합니다.
+여기서는 아래 순서로 판단해 대부분의 요청(블랙리스트에 없는 토큰)이 DB까지 가지 않게 합니다.
+
+1. 워커별 블룸 필터에 없으면 → 확실히 블랙리스트 아님 (DB/공유 캐시 조회 없음)
+2. 블룸 필터에 있으면(또는 오탐이면) → 공유 캐시의 JTI 키 확인
+3. 공유 캐시에도 없으면 → DB 확인 후 결과를 공유 캐시에 남김
+
+워커 간 동기화: 로그아웃 등으로 블랙리스트에 추가할 때마다 공유 캐시의 버전을 incr 하고
+버전 번호별 로그 키에 JTI를 남깁니다. 각 워커는 조회 때 버전을 비교해 밀린 로그만 블룸 필터에 더하고,
+로그가 너무 많이 밀렸거나 만료되어 사라졌으면 DB에서 블룸 필터를 다시 만듭니다.
+버전 키는 임의의 epoch 값 아래에 두고, 캐시가 비워져(Redis 재시작/flush) 버전 키가 사라지면 새 epoch를 만듭니다.
+워커는 epoch가 바뀐 것을 보고 다시 만들므로, 처음부터 다시 센 버전이 우연히 같아도 동기화된 것으로 착각하지 않습니다.
+
+블룸 필터는 캐시가 모든 워커에 공유될 때만 믿습니다. 워커별 캐시(LocMemCache, REDIS_URL 미설정)에서는
+다른 워커의 로그아웃을 알 수 없으므로 매번 DB를 확인합니다.
+"""
+import hashlib
+import logging
+import math
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+logger = logging.getLogger(__name__)
+
+_config = getattr(settings, 'TOKEN_BLACKLIST_CACHE', {})
+BLOOM_CAPACITY = _config.get('BLOOM_CAPACITY', 100_000)
+ERROR_RATE = _config.get('ERROR_RATE', 0.001)
+LOG_TTL = _config.get('LOG_TTL', 60 * 60 * 24)
+MAX_LOG_GAP = _config.get('MAX_LOG_GAP', 1000)
+# None이면 캐시 백엔드로 판단합니다. (LocMemCache/DummyCache는 워커별이므로 공유 아님)
+SHARED_CACHE = _config.get('SHARED_CACHE')
+
+EPOCH_KEY = 'users:blacklist:epoch'
+
+
+def _version_key(epoch):
+    return f'users:blacklist:{epoch}:version'
+
+
+def _log_key(epoch, number):
+    return f'users:blacklist:{epoch}:log:{number}'
+
+
+def _jti_key(jti):
+    return f'users:blacklist:jti:{jti}'
+
+
+def cache_is_shared():
+    if SHARED_CACHE is not None:
+        return SHARED_CACHE
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def _shared_state():
+    """(epoch, 버전)을 반환합니다. 버전 키가 없으면(처음이거나 캐시가 비워짐) 새 epoch에서 0부터 시작합니다."""
+    epoch = cache.get(EPOCH_KEY)
+    if epoch is not None:
+        version = cache.get(_version_key(epoch))
+        if version is not None:
+            return epoch, version
+    new_epoch = secrets.token_hex(8)
+    cache.add(_version_key(new_epoch), 0, timeout=None)
+    if epoch is None:
+        cache.add(EPOCH_KEY, new_epoch, timeout=None)
+    else:
+        cache.set(EPOCH_KEY, new_epoch, timeout=None)
+    epoch = cache.get(EPOCH_KEY)
+    return epoch, cache.get(_version_key(epoch), 0)
+
+
+class BloomFilter:
+    """고정 크기 비트 배열 블룸 필터. 삭제는 지원하지 않으므로 만료된 JTI는 다시 만들 때 빠집니다."""
+
+    def __init__(self, capacity, error_rate=ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # 128비트 해시 하나를 둘로 나눠 k개 위치를 만듭니다. (double hashing)
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistIndex:
+    def __init__(self):
+        self.bloom = None
+        self.epoch = None
+        self.version = None
+        self.lock = threading.Lock()
+        self.stats = {'checks': 0, 'bloom_negatives': 0, 'cache_hits': 0, 'db_checks': 0, 'rebuilds': 0}
+
+    def rebuild(self, state=None):
+        """만료되지 않은 블랙리스트 JTI로 블룸 필터를 새로 만듭니다."""
+        started = time.perf_counter()
+        # DB를 읽기 전의 버전을 기록해, 읽는 동안 추가된 JTI는 다음 sync()에서 로그로 반영합니다.
+        epoch, version = state or _shared_state()
+        jtis = (
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .values_list('token__jti', flat=True)
+        )
+        count = jtis.count()
+        bloom = BloomFilter(max(BLOOM_CAPACITY, count * 2))
+        for jti in jtis.iterator(chunk_size=5000):
+            bloom.add(jti)
+        with self.lock:
+            self.bloom, self.epoch, self.version = bloom, epoch, version
+            self.stats['rebuilds'] += 1
+        logger.info("토큰 블랙리스트 블룸 필터 생성: %d건, %.1fms", count, (time.perf_counter() - started) * 1000)
+
+    def sync(self):
+        """공유 버전이 바뀌었으면 밀린 로그만 반영합니다. 반영할 수 없으면 다시 만듭니다."""
+        epoch, version = _shared_state()
+        if self.bloom is not None and epoch == self.epoch and version == self.version:
+            return
+        if (self.bloom is None or epoch != self.epoch or version < self.version
+                or version - self.version > MAX_LOG_GAP):
+            self.rebuild((epoch, version))
+            return
+        keys = [_log_key(epoch, number) for number in range(self.version + 1, version + 1)]
+        entries = cache.get_many(keys)
+        if len(entries) != len(keys) or self.bloom.count + len(entries) > self.bloom.capacity:
+            self.rebuild((epoch, version))
+            return
+        with self.lock:
+            for jti in entries.values():
+                self.bloom.add(jti)
+            self.version = max(self.version, version)
+
+    def contains(self, jti):
+        self.stats['checks'] += 1
+        if not cache_is_shared():
+            self.stats['db_checks'] += 1
+            return BlacklistedToken.objects.filter(token__jti=jti).exists()
+        self.sync()
+        if jti not in self.bloom:
+            self.stats['bloom_negatives'] += 1
+            return False
+        cached = cache.get(_jti_key(jti))
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return cached
+        self.stats['db_checks'] += 1
+        blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        cache.set(_jti_key(jti), blacklisted, timeout=LOG_TTL)
+        return blacklisted
+
+    def add(self, jti, expires_at=None):
+        """블랙리스트에 추가된 JTI를 공유 캐시와 이 워커의 블룸 필터에 반영합니다."""
+        timeout = LOG_TTL
+        if expires_at is not None:
+            timeout = max(1, min(LOG_TTL, int(expires_at - time.time())))
+        cache.set(_jti_key(jti), True, timeout=timeout)
+        epoch, _ = _shared_state()
+        try:
+            number = cache.incr(_version_key(epoch))
+        except ValueError:
+            # 그 사이 캐시가 비워졌으면 새 epoch에서 다시 셉니다.
+            epoch, _ = _shared_state()
+            number = cache.incr(_version_key(epoch))
+        cache.set(_log_key(epoch, number), jti, timeout=LOG_TTL)
+        if self.bloom is not None:
+            with self.lock:
+                self.bloom.add(jti)
+
+
+_index = BlacklistIndex()
+
+
+def is_blacklisted(jti):
+    return _index.contains(jti)
+
+
+def add_to_blacklist(jti, expires_at=None):
+    _index.add(jti, expires_at)
+
+
+def blacklist_stats():
+    """현재 워커의 블랙리스트 조회 통계 (블룸 필터에서 끝난 비율 확인용)"""
+    bloom = _index.bloom
+    return {**_index.stats, 'shared_cache': cache_is_shared(), 'epoch': _index.epoch, 'version': _index.version,
+            'bloom_items': bloom.count if bloom else 0, 'bloom_bytes': len(bloom.bits) if bloom else 0}
+
+
+def warm_up():
+    """워커 시작 시 블룸 필터를 미리 만들어 둡니다. (backend/wsgi.py) DB가 준비되지 않았으면 첫 조회 때 만듭니다."""
+    if not cache_is_shared():
+        return
+    try:
+        _index.rebuild()
+    except Exception:
+        logger.warning("토큰 블랙리스트 블룸 필터 준비 실패 (첫 조회 때 다시 시도)", exc_info=True)
@@ -0,0 +1,23 @@
+# users/hashers.py
+"""
+settings.PASSWORD_HASHING 값으로 비용을 조절하는 비밀번호 해셔
+
+알고리즘 이름은 Django 기본 해셔와 같으므로 기존 해시도 그대로 검증됩니다.
+비용(파라미터)을 바꾸면 must_update()가 참이 되어 다음 로그인 때 새 값으로 다시 해시됩니다.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+_config = getattr(settings, 'PASSWORD_HASHING', {})
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    time_cost = _config.get('ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+    memory_cost = _config.get('ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost)  # KiB
+    parallelism = _config.get('ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = _config.get('SCRYPT_WORK_FACTOR', ScryptPasswordHasher.work_factor)
+    block_size = _config.get('SCRYPT_BLOCK_SIZE', ScryptPasswordHasher.block_size)
+    parallelism = _config.get('SCRYPT_PARALLELISM', ScryptPasswordHasher.parallelism)
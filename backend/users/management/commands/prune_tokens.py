@@ -0,0 +1,45 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        "만료된 OutstandingToken(과 연결된 BlacklistedToken)을 청크 단위로 지웁니다. "
+        "simplejwt의 flushexpiredtokens와 달리 한 번에 큰 DELETE를 보내지 않으므로 운영 중에도 실행할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help="한 트랜잭션에서 지울 토큰 수 (기본 5000)")
+        parser.add_argument('--dry-run', action='store_true', help="지우지 않고 대상 수만 확인합니다.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now)
+        if options['dry_run']:
+            self.stdout.write(f"[dry-run] 만료된 토큰 {expired.count()}건")
+            return
+
+        started = perf_counter()
+        chunk_size = options['chunk_size']
+        deleted = blacklisted = chunks = 0
+        last_id = 0
+        while True:
+            ids = list(expired.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+            if not ids:
+                break
+            last_id = ids[-1]
+            with transaction.atomic():
+                # 블랙리스트 행을 먼저 지워 CASCADE 가 행을 하나씩 모으지 않게 합니다.
+                blacklisted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+                deleted += OutstandingToken.objects.filter(pk__in=ids).delete()[0]
+            chunks += 1
+            if options['verbosity'] >= 2:
+                self.stdout.write(f"  chunk {chunks}: {deleted}건")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"만료된 토큰 {deleted}건(블랙리스트 {blacklisted}건) 삭제 "
+            f"(청크 {chunks}개, {perf_counter() - started:.1f}s)"))
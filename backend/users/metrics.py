@@ -0,0 +1,87 @@
+# users/metrics.py
+"""
+로그인 단계별 소요 시간 (lookup: 사용자 조회 / hash: 비밀번호 검증 / token: 토큰 발급)
+
+요청마다 request.login_timings 에 단계별 시간을 남기고(로그인 응답의 Server-Timing 헤더),
+워커 전체로는 단계별 최근 SAMPLE_SIZE개 표본으로 평균/p50/p95/최댓값을 집계합니다. (/api/auth/metrics/login/)
+"""
+import threading
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+
+SAMPLE_SIZE = 1000
+STAGES = ('lookup', 'hash', 'token')
+
+
+class StageMetrics:
+    def __init__(self, sample_size=SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.counts = {}
+
+    def record(self, stage, seconds):
+        with self.lock:
+            if stage not in self.samples:
+                self.samples[stage] = deque(maxlen=self.sample_size)
+                self.counts[stage] = 0
+            self.samples[stage].append(seconds)
+            self.counts[stage] += 1
+
+    def snapshot(self):
+        with self.lock:
+            samples = {stage: sorted(values) for stage, values in self.samples.items()}
+            counts = dict(self.counts)
+        return {stage: _summarize(values, counts[stage]) for stage, values in samples.items()}
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.counts.clear()
+
+
+def _percentile(values, ratio):
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+def _summarize(values, count):
+    def ms(seconds):
+        return round(seconds * 1000, 2)
+
+    return {
+        'count': count,
+        'avg_ms': ms(sum(values) / len(values)),
+        'p50_ms': ms(_percentile(values, 0.5)),
+        'p95_ms': ms(_percentile(values, 0.95)),
+        'max_ms': ms(values[-1]),
+    }
+
+
+login_metrics = StageMetrics()
+
+
+def login_timings(request):
+    """요청별 단계 시간 dict. request가 없으면(관리 명령 등) 버리는 dict를 돌려줍니다."""
+    if request is None:
+        return {}
+    timings = getattr(request, 'login_timings', None)
+    if timings is None:
+        timings = {}
+        request.login_timings = timings
+    return timings
+
+
+@contextmanager
+def measure(timings, stage):
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        seconds = perf_counter() - started
+        timings[stage] = timings.get(stage, 0.0) + seconds
+        login_metrics.record(stage, seconds)
+
+
+def server_timing_header(timings):
+    return ', '.join(f"login-{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
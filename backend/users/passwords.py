@@ -0,0 +1,62 @@
+# users/passwords.py
+"""
+프로세스(워커)당 동시에 계산하는 비밀번호 해시 수를 제한합니다.
+
+argon2/scrypt 는 한 번에 수십 MB 메모리와 CPU를 쓰므로, 한 프로세스 안에서 동시에 도는 해시 계산을
+MAX_CONCURRENT개로 제한합니다. 해시는 요청 스레드에서 그대로 계산하고(풀에 넘기지 않음),
+ACQUIRE_TIMEOUT 안에 차례가 오지 않으면 계산을 시작하지 않고 429로 응답합니다.
+이미 시작한 해시는 중간에 멈출 수 없으므로, 시간 제한은 기다리는 단계에만 둡니다.
+
+이 제한은 프로세스 단위입니다. 요청을 여러 스레드로 처리하는 워커(gthread, ASGI의 sync_to_async 스레드)에서
+의미가 있고, 요청을 하나씩 처리하는 sync gunicorn 워커에서는 워커 수가 곧 동시 해시 수의 상한입니다.
+서버 전체의 해시 메모리는 (워커 수 × MAX_CONCURRENT × 해시 1회 메모리)로 계산해 워커 수를 정합니다.
+"""
+import threading
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from rest_framework.exceptions import Throttled
+
+_config = getattr(settings, 'PASSWORD_HASHING', {})
+MAX_CONCURRENT = _config.get('MAX_CONCURRENT', 2)
+ACQUIRE_TIMEOUT = _config.get('ACQUIRE_TIMEOUT', 0.5)
+
+_slots = threading.BoundedSemaphore(MAX_CONCURRENT)
+
+
+def _run(func, *args):
+    if not _slots.acquire(timeout=ACQUIRE_TIMEOUT):
+        raise Throttled(wait=1, detail="로그인 요청이 많습니다. 잠시 후 다시 시도해 주세요.")
+    try:
+        return func(*args)
+    finally:
+        _slots.release()
+
+
+def needs_rehash(encoded):
+    """기본 해셔가 아니거나 비용 설정이 바뀐 해시면 True"""
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    preferred = get_hasher('default')
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def verify_password(user, raw_password):
+    """
+    user.check_password()와 같은 결과를 반환합니다.
+    맞으면서 해시가 오래된 방식/비용이면 기본 해셔로 다시 해시해 password 컬럼만 저장합니다.
+    """
+    encoded = user.password
+    if not _run(check_password, raw_password, encoded):
+        return False
+    if needs_rehash(encoded):
+        user.password = _run(make_password, raw_password)
+        user.save(update_fields=['password'])
+    return True
+
+
+def run_dummy_hash(raw_password):
+    """없는 아이디로 로그인할 때도 해시 한 번만큼 시간을 써서 응답 시간으로 아이디 존재 여부를 알 수 없게 합니다."""
+    _run(make_password, raw_password)
@@ -1,6 +1,17 @@
 # users/serializers.py
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer as BaseTokenObtainPairSerializer,
+    TokenObtainSerializer,
+    TokenRefreshSerializer as BaseTokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import load_user
+from .metrics import login_timings, measure
+from .tokens import RefreshToken
 
 User = get_user_model()
 
@@ -30,3 +41,43 @@ class RegisterSerializer(serializers.ModelSerializer):
         user.set_password(password)
         user.save()
         return user
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """
+    /api/auth/refresh/ 직렬화기. 블랙리스트는 블룸 필터(users/tokens.py)로,
+    사용자는 인증용 사용자 캐시(users/authentication.py)로 확인하므로 보통 DB를 조회하지 않습니다.
+    """
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id:
+            user = load_user(user_id)
+            if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
+
+
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    """/api/auth/login/ 직렬화기. 토큰 발급 시간도 로그인 단계별 시간(token)에 남깁니다."""
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        data = TokenObtainSerializer.validate(self, attrs)  # 사용자 조회 + 비밀번호 검증 (UsernameBackend)
+        with measure(login_timings(self.context.get("request")), 'token'):
+            refresh = self.get_token(self.user)
+            data["refresh"] = str(refresh)
+            data["access"] = str(refresh.access_token)
+        return data
@@ -0,0 +1,13 @@
+# users/signals.py
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_user_cache(sender, instance, **kwargs):
+    """사용자 정보/비밀번호가 바뀌거나 삭제되면 인증용 사용자 캐시를 무효화합니다."""
+    invalidate_cached_user(instance.pk)
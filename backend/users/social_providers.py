@@ -1,15 +1,183 @@
+# users/social_providers.py
+"""
+소셜 로그인 토큰 검증
+
+- 모든 제공자 호출은 워커당 하나의 requests.Session(get_client())을 함께 씁니다.
+  연결 풀/keep-alive로 TLS 핸드셰이크를 재사용하고, 연결·읽기 타임아웃과
+  재시도(지수 백오프, 502/503/504·연결 오류)를 둡니다. 느린 제공자가 워커를 무한정 붙잡지 않습니다.
+- Google id_token은 JWKS(공개키)를 받아 로컬에서 서명/aud/iss/exp를 검증합니다.
+  JWKS는 응답의 Cache-Control max-age 동안 워커 메모리에 두고, 모르는 kid가 오면(키 교체) 한 번 다시 받습니다.
+  PyJWT 암호화 모듈(cryptography)이 없으면 tokeninfo API로 검증하고 결과를 토큰 만료 시각까지 캐시합니다.
+- 주소/타임아웃은 settings.SOCIAL_AUTH 로 바꿀 수 있습니다. (테스트는 로컬 스텁 서버 주소를 넣습니다)
+- 비동기 뷰(ASGI)용 aget_profile()은 이벤트 루프당 하나의 httpx.AsyncClient(get_async_client())로
+  같은 타임아웃/재시도/캐시 규칙을 따릅니다.
+"""
+import asyncio
+import hashlib
+import re
+import threading
+import time
+import weakref
+
 import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.cache import LocalLRUCache, MISSING
+
+DEFAULTS = {
+    'KAKAO_PROFILE_URL': "https://kapi.kakao.com/v2/user/me",
+    'NAVER_PROFILE_URL': "https://openapi.naver.com/v1/nid/me",
+    'GOOGLE_TOKENINFO_URL': "https://oauth2.googleapis.com/tokeninfo",
+    'GOOGLE_JWKS_URL': "https://www.googleapis.com/oauth2/v3/certs",
+    'GOOGLE_ISSUERS': ("accounts.google.com", "https://accounts.google.com"),
+    'GOOGLE_CLIENT_IDS': (),        # 비어 있으면 Google 로그인을 거부합니다. (다른 앱용 id_token 도용 방지)
+    'CONNECT_TIMEOUT': 3,
+    'READ_TIMEOUT': 5,
+    'RETRIES': 2,
+    'BACKOFF_FACTOR': 0.3,
+    'POOL_MAXSIZE': 10,
+    'JWKS_MAX_AGE': 60 * 60,        # Cache-Control이 없을 때 JWKS 보관 시간(초)
+}
+
+RETRY_STATUSES = (502, 503, 504)
+
+
+class SocialAuthError(Exception):
+    """제공자 호출 실패(타임아웃/HTTP 오류) 또는 토큰 검증 실패"""
+
+
+def social_config(name):
+    return getattr(settings, 'SOCIAL_AUTH', {}).get(name, DEFAULTS[name])
+
+
+class ProviderClient:
+    def __init__(self):
+        retry = Retry(
+            total=social_config('RETRIES'),
+            connect=social_config('RETRIES'),
+            read=social_config('RETRIES'),
+            status=social_config('RETRIES'),
+            backoff_factor=social_config('BACKOFF_FACTOR'),
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=social_config('POOL_MAXSIZE'), max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.timeout = (social_config('CONNECT_TIMEOUT'), social_config('READ_TIMEOUT'))
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self.session.get(url, **kwargs)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise SocialAuthError(f"제공자 호출 실패: {url} ({e.__class__.__name__})") from e
+        return response
+
+    def get_json(self, url, **kwargs):
+        try:
+            return self.get(url, **kwargs).json()
+        except ValueError as e:
+            raise SocialAuthError(f"제공자 응답이 JSON이 아닙니다: {url}") from e
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncProviderClient:
+    """ProviderClient의 httpx 비동기 버전. 연결 오류는 transport가, 502/503/504는 여기서 백오프 후 재시도합니다."""
+
+    def __init__(self):
+        import httpx
+
+        self.httpx = httpx
+        self.retries = social_config('RETRIES')
+        self.backoff_factor = social_config('BACKOFF_FACTOR')
+        limits = httpx.Limits(max_connections=social_config('POOL_MAXSIZE'),
+                              max_keepalive_connections=social_config('POOL_MAXSIZE'))
+        self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(retries=self.retries, limits=limits),
+            timeout=httpx.Timeout(social_config('READ_TIMEOUT'), connect=social_config('CONNECT_TIMEOUT')),
+        )
+
+    async def get(self, url, **kwargs):
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.client.get(url, **kwargs)
+            except self.httpx.HTTPError as e:
+                raise SocialAuthError(f"제공자 호출 실패: {url} ({e.__class__.__name__})") from e
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                break
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+        if response.is_error:
+            raise SocialAuthError(f"제공자 호출 실패: {url} (HTTP {response.status_code})")
+        return response
+
+    async def get_json(self, url, **kwargs):
+        try:
+            return (await self.get(url, **kwargs)).json()
+        except ValueError as e:
+            raise SocialAuthError(f"제공자 응답이 JSON이 아닙니다: {url}") from e
+
+
+_client = None
+_client_lock = threading.Lock()
+# httpx.AsyncClient는 만든 이벤트 루프에서만 쓸 수 있으므로 루프별로 하나씩 둡니다. (uvicorn 워커는 루프 1개)
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    """워커(프로세스)당 하나의 제공자 클라이언트를 지연 생성합니다."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ProviderClient()
+        return _client
+
+
+def get_async_client():
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncProviderClient()
+    return client
+
+
+def reset_client():
+    """설정이 바뀌었을 때(테스트 등) 연결 풀과 캐시를 버리고 다시 만듭니다."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _async_clients.clear()
+    _jwks.clear()
+    _tokeninfo_cache.clear()
+
+
+def _bearer(access_token):
+    return {"Authorization": f"Bearer {access_token}"}
+
 
 class KakaoVerifier:
     @staticmethod
     def get_profile(access_token: str) -> dict:
         # Kakao: Authorization: Bearer <access_token>
-        resp = requests.get(
-            "https://kapi.kakao.com/v2/user/me",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
-        resp.raise_for_status()
-        data = resp.json()
+        return KakaoVerifier.parse(
+            get_client().get_json(social_config('KAKAO_PROFILE_URL'), headers=_bearer(access_token)))
+
+    @staticmethod
+    async def aget_profile(access_token: str) -> dict:
+        return KakaoVerifier.parse(
+            await get_async_client().get_json(social_config('KAKAO_PROFILE_URL'), headers=_bearer(access_token)))
+
+    @staticmethod
+    def parse(data: dict) -> dict:
         kakao_id = str(data["id"])
         # 이메일이 동의항목일 수 있음(없을 수도 있음)
         email = (data.get("kakao_account") or {}).get("email")
@@ -20,26 +188,180 @@ class NaverVerifier:
     @staticmethod
     def get_profile(access_token: str) -> dict:
         # Naver: Authorization: Bearer <access_token>
-        resp = requests.get(
-            "https://openapi.naver.com/v1/nid/me",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
-        resp.raise_for_status()
-        data = resp.json()["response"]
+        return NaverVerifier.parse(
+            get_client().get_json(social_config('NAVER_PROFILE_URL'), headers=_bearer(access_token)))
+
+    @staticmethod
+    async def aget_profile(access_token: str) -> dict:
+        return NaverVerifier.parse(
+            await get_async_client().get_json(social_config('NAVER_PROFILE_URL'), headers=_bearer(access_token)))
+
+    @staticmethod
+    def parse(data: dict) -> dict:
+        data = data["response"]
         naver_id = str(data["id"])
         email = data.get("email")
         name = data.get("name") or data.get("nickname")
         return {"provider": "naver", "provider_user_id": naver_id, "email": email, "name": name}
 
+
+class JWKSCache:
+    """Google 공개키 목록. Cache-Control max-age 동안 재사용하고 모르는 kid면 한 번 다시 받습니다."""
+
+    # 모르는 kid로 JWKS를 계속 다시 받게 만드는 요청을 막기 위한 최소 간격(초)
+    MIN_REFRESH_INTERVAL = 60
+
+    def __init__(self):
+        self.keys = {}
+        self.expires_at = 0
+        self.fetched_at = None
+        self.lock = threading.Lock()
+
+    def _needs_fetch(self, kid):
+        now = time.monotonic()
+        if now >= self.expires_at:
+            return True
+        return kid not in self.keys and now - self.fetched_at >= self.MIN_REFRESH_INTERVAL
+
+    def _store(self, response):
+        """requests/httpx 응답 모두 받습니다. (headers, json()만 사용)"""
+        match = re.search(r'max-age=(\d+)', response.headers.get('Cache-Control', ''))
+        max_age = int(match.group(1)) if match else social_config('JWKS_MAX_AGE')
+        try:
+            keys = {key['kid']: key for key in response.json()['keys']}
+        except (ValueError, KeyError, TypeError) as e:
+            raise SocialAuthError("JWKS 응답 형식이 올바르지 않습니다.") from e
+        self.fetched_at = time.monotonic()
+        self.keys, self.expires_at = keys, self.fetched_at + max_age
+
+    def get(self, kid):
+        with self.lock:
+            if self._needs_fetch(kid):
+                self._store(get_client().get(social_config('GOOGLE_JWKS_URL')))
+            return self.keys.get(kid)
+
+    async def aget(self, kid):
+        # 이벤트 루프를 막지 않도록 스레드 락 없이 받습니다. (동시에 두 번 받아도 결과는 같음)
+        if self._needs_fetch(kid):
+            self._store(await get_async_client().get(social_config('GOOGLE_JWKS_URL')))
+        return self.keys.get(kid)
+
+    def clear(self):
+        with self.lock:
+            self.keys, self.expires_at, self.fetched_at = {}, 0, None
+
+
+_jwks = JWKSCache()
+# tokeninfo 결과 캐시 (로컬 검증을 못 할 때만 사용). 키는 토큰 해시
+_tokeninfo_cache = LocalLRUCache(maxsize=1024, ttl=60 * 5)
+
+
+def _local_verification_available():
+    try:
+        from jwt.algorithms import has_crypto
+    except ImportError:
+        return False
+    return has_crypto
+
+
+def _google_client_ids():
+    """aud를 확인할 수 없으면 다른 앱에 발급된 id_token으로도 로그인되므로 설정이 없으면 거부합니다."""
+    client_ids = social_config('GOOGLE_CLIENT_IDS')
+    if not client_ids:
+        raise SocialAuthError("GOOGLE_CLIENT_IDS가 설정되지 않아 Google id_token을 검증할 수 없습니다.")
+    return client_ids
+
+
+def _check_audience(claims):
+    if claims.get("aud") not in _google_client_ids():
+        raise SocialAuthError("id_token의 aud가 이 앱의 client_id가 아닙니다.")
+
+
+def _unverified_kid(id_token):
+    import jwt
+
+    try:
+        return jwt.get_unverified_header(id_token).get("kid")
+    except jwt.PyJWTError as e:
+        raise SocialAuthError("id_token 형식이 올바르지 않습니다.") from e
+
+
+def _decode_id_token(id_token, key):
+    import jwt
+
+    if key is None:
+        raise SocialAuthError("id_token 서명 키를 찾을 수 없습니다.")
+    try:
+        claims = jwt.decode(
+            id_token,
+            key=jwt.PyJWK(key).key,
+            algorithms=["RS256"],
+            issuer=list(social_config('GOOGLE_ISSUERS')),
+            options={"verify_aud": False},  # 여러 client_id 허용 → 아래에서 직접 확인
+        )
+    except jwt.PyJWTError as e:
+        raise SocialAuthError(f"id_token 검증 실패: {e}") from e
+    _check_audience(claims)
+    return claims
+
+
+def _tokeninfo_key(id_token):
+    return hashlib.sha256(id_token.encode('utf-8')).hexdigest()
+
+
+def _remember_tokeninfo(key, claims):
+    remaining = int(claims.get("exp", 0)) - time.time()
+    if remaining > 0:
+        _tokeninfo_cache.set(key, claims, ttl=min(remaining, _tokeninfo_cache.ttl))
+
+
+def _verify_with_tokeninfo(id_token):
+    key = _tokeninfo_key(id_token)
+    claims = _tokeninfo_cache.get(key)
+    if claims is MISSING:
+        claims = get_client().get_json(social_config('GOOGLE_TOKENINFO_URL'), params={"id_token": id_token})
+        _remember_tokeninfo(key, claims)
+    _check_audience(claims)
+    return claims
+
+
+async def _averify_with_tokeninfo(id_token):
+    key = _tokeninfo_key(id_token)
+    claims = _tokeninfo_cache.get(key)
+    if claims is MISSING:
+        claims = await get_async_client().get_json(social_config('GOOGLE_TOKENINFO_URL'),
+                                                   params={"id_token": id_token})
+        _remember_tokeninfo(key, claims)
+    _check_audience(claims)
+    return claims
+
+
 class GoogleVerifier:
     @staticmethod
     def get_profile(id_token: str) -> dict:
         # Google: ID 토큰 검증(백엔드 검증). access_token이 아니라 id_token을 권장.
-        resp = requests.get("https://oauth2.googleapis.com/tokeninfo", params={"id_token": id_token})
-        resp.raise_for_status()
-        data = resp.json()
+        _google_client_ids()  # 설정이 없으면 제공자를 호출하기 전에 거부
+        if _local_verification_available():
+            data = _decode_id_token(id_token, _jwks.get(_unverified_kid(id_token)))
+        else:
+            data = _verify_with_tokeninfo(id_token)
+        return GoogleVerifier.parse(data)
+
+    @staticmethod
+    async def aget_profile(id_token: str) -> dict:
+        _google_client_ids()
+        if _local_verification_available():
+            data = _decode_id_token(id_token, await _jwks.aget(_unverified_kid(id_token)))
+        else:
+            data = await _averify_with_tokeninfo(id_token)
+        return GoogleVerifier.parse(data)
+
+    @staticmethod
+    def parse(data: dict) -> dict:
         sub = str(data["sub"])            # 고유 사용자 ID
         email = data.get("email")
         name = data.get("name") or data.get("given_name")
-        # aud(클라이언트ID) 검증 필요: data["aud"]가 내 앱의 client_id인지 확인해야 안전
-        return {"provider": "google", "provider_user_id": sub, "email": email, "name": name}
\ No newline at end of file
+        return {"provider": "google", "provider_user_id": sub, "email": email, "name": name}
+
+
+VERIFIERS = {'kakao': KakaoVerifier, 'naver': NaverVerifier, 'google': GoogleVerifier}
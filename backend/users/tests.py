@@ -1,3 +1,467 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import jwt
+from asgiref.sync import async_to_sync
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from jwt.algorithms import RSAAlgorithm
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from users import async_views as users_async_views, blacklist, social_providers
+from users.authentication import local_users
+from users.metrics import login_metrics
+from users.tokens import RefreshToken
+
+BOOKMARKS_URL = "/api/my/bookmarks/"
+LOGOUT_URL = "/api/auth/logout/"
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="jwtuser", password="pw1234",
+                                                        display_name="처음")
+
+    def setUp(self):
+        local_users.clear()
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}")
+
+    def test_user_is_loaded_once_per_version(self):
+        self.client.get(BOOKMARKS_URL)  # 사용자 + 북마크 목록 캐시 채우기
+        with self.assertNumQueries(0):
+            res = self.client.get(BOOKMARKS_URL)
+        assert res.status_code == status.HTTP_200_OK
+        assert res.wsgi_request.user.pk == self.user.pk
+
+    def test_user_save_invalidates_cache(self):
+        self.client.get(BOOKMARKS_URL)
+
+        self.user.display_name = "바뀜"
+        self.user.save()
+
+        with self.assertNumQueries(1):  # 사용자만 다시 읽음 (북마크 목록은 그대로 캐시)
+            res = self.client.get(BOOKMARKS_URL)
+        assert res.wsgi_request.user.display_name == "바뀜"
+        # 비밀번호 해시는 캐시하지 않고 필요할 때만 읽습니다.
+        with self.assertNumQueries(1):
+            assert res.wsgi_request.user.check_password("pw1234")
+
+    def test_deleted_user_is_rejected(self):
+        self.client.get(BOOKMARKS_URL)
+        get_user_model().objects.filter(pk=self.user.pk).delete()
+        assert self.client.get(BOOKMARKS_URL).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_logout_blacklists_and_invalidates(self):
+        self.client.get(BOOKMARKS_URL)
+        res = self.client.post(LOGOUT_URL, {"refresh": str(self.refresh)}, format="json")
+        assert res.status_code == status.HTTP_205_RESET_CONTENT
+        with self.assertNumQueries(1):
+            self.client.get(BOOKMARKS_URL)
+
+
+REFRESH_URL = "/api/auth/refresh/"
+
+
+class TokenBlacklistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="blacklist", password="pw1234")
+
+    def setUp(self):
+        # 테스트의 LocMemCache는 한 프로세스 안에서 공유되므로 운영(Redis)과 같은 경로로 검사합니다.
+        patcher = mock.patch.object(blacklist, "SHARED_CACHE", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        local_users.clear()
+        blacklist.warm_up()
+        self.client = APIClient()
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = blacklist.BloomFilter(1000, error_rate=0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+    def test_refresh_skips_db_for_valid_token(self):
+        refresh = RefreshToken.for_user(self.user)
+        self.client.post(REFRESH_URL, {"refresh": str(refresh)}, format="json")  # 사용자 캐시 채우기
+        with self.assertNumQueries(0):
+            res = self.client.post(REFRESH_URL, {"refresh": str(refresh)}, format="json")
+        assert res.status_code == status.HTTP_200_OK and "access" in res.json()
+
+    def test_logout_is_seen_by_other_workers(self):
+        refresh = RefreshToken.for_user(self.user)
+        other_worker = blacklist.BlacklistIndex()
+        other_worker.rebuild()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        res = self.client.post(LOGOUT_URL, {"refresh": str(refresh)}, format="json")
+        assert res.status_code == status.HTTP_205_RESET_CONTENT
+
+        res = self.client.post(REFRESH_URL, {"refresh": str(refresh)}, format="json")
+        assert res.status_code == status.HTTP_401_UNAUTHORIZED
+        # 다른 워커는 공유 캐시의 로그만 반영하고 DB 없이 판단합니다.
+        with self.assertNumQueries(0):
+            assert other_worker.contains(refresh[api_settings.JTI_CLAIM])
+        assert other_worker.stats["rebuilds"] == 1
+
+    def test_cache_reset_starts_new_epoch(self):
+        """캐시가 비워진 뒤 버전이 다시 같은 숫자까지 올라와도 새 epoch를 보고 다시 만드는지 테스트"""
+        cache.clear()
+        worker = blacklist.BlacklistIndex()
+        worker.rebuild()
+        blacklist.add_to_blacklist("before-flush")
+        assert not worker.contains("unknown")
+        version = worker.version
+
+        cache.clear()
+        token = RefreshToken.for_user(self.user)
+        token.blacklist()
+        assert blacklist._shared_state()[1] == version  # 처음부터 다시 세어 같은 번호
+        assert worker.contains(token[api_settings.JTI_CLAIM])
+        assert worker.stats["rebuilds"] == 2
+
+    def test_per_worker_cache_always_checks_db(self):
+        refresh = RefreshToken.for_user(self.user)
+        worker = blacklist.BlacklistIndex()
+        with mock.patch.object(blacklist, "SHARED_CACHE", None):
+            assert not blacklist.cache_is_shared()
+            with self.assertNumQueries(1):
+                assert not worker.contains(refresh[api_settings.JTI_CLAIM])
+            # 다른 워커의 캐시에만 기록된 로그아웃도 DB로 확인합니다.
+            BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=refresh[api_settings.JTI_CLAIM]))
+            assert worker.contains(refresh[api_settings.JTI_CLAIM])
+        assert worker.bloom is None
+
+    def test_prune_tokens_deletes_expired_in_chunks(self):
+        now = timezone.now()
+        OutstandingToken.objects.bulk_create([
+            OutstandingToken(jti=f"expired-{i}", token="x", user=self.user,
+                             created_at=now - timedelta(days=10), expires_at=now - timedelta(days=1))
+            for i in range(5)
+        ] + [OutstandingToken(jti="alive", token="x", user=self.user, created_at=now,
+                              expires_at=now + timedelta(days=1))])
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti="expired-0"))
+
+        out = StringIO()
+        call_command("prune_tokens", chunk_size=2, stdout=out)
+        assert "5건(블랙리스트 1건)" in out.getvalue() and "청크 3개" in out.getvalue()
+        assert list(OutstandingToken.objects.values_list("jti", flat=True)) == ["alive"]
+
+
+LOGIN_URL = "/api/auth/login/"
+
+
+class LoginPipelineTests(TestCase):
+    def setUp(self):
+        login_metrics.reset()
+        self.client = APIClient()
+
+    def _create_user(self, hasher):
+        user = get_user_model().objects.create_user(username="login", password="pw1234")
+        user.password = make_password("pw1234", hasher=hasher)
+        user.save()
+        return user
+
+    def test_login_rehashes_legacy_hash_and_reports_stages(self):
+        user = self._create_user("pbkdf2_sha256")
+
+        res = self.client.post(LOGIN_URL, {"username": "login", "password": "pw1234"}, format="json")
+        assert res.status_code == status.HTTP_200_OK, res.content
+        assert {"access", "refresh"} <= res.json().keys()
+        for stage in ("lookup", "hash", "token"):
+            assert f"login-{stage};dur=" in res["Server-Timing"]
+
+        user.refresh_from_db()
+        assert user.password.startswith("argon2$")
+        encoded = user.password
+        self.client.post(LOGIN_URL, {"username": "login", "password": "pw1234"}, format="json")
+        user.refresh_from_db()
+        assert user.password == encoded  # 이미 기본 해셔면 다시 해시하지 않음
+
+        stages = login_metrics.snapshot()
+        assert stages["hash"]["count"] == 2 and stages["token"]["count"] == 2
+
+    def test_wrong_password_and_unknown_user_are_rejected(self):
+        self._create_user("argon2")
+        for username, password in (("login", "wrong"), ("nobody", "pw1234")):
+            res = self.client.post(LOGIN_URL, {"username": username, "password": password}, format="json")
+            assert res.status_code == status.HTTP_401_UNAUTHORIZED
+        # 없는 아이디도 해시 단계를 거칩니다.
+        assert login_metrics.snapshot()["hash"]["count"] == 2
+
+    def test_saturated_hash_slots_return_429_without_hashing(self):
+        self._create_user("argon2")
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()  # 다른 요청이 해시 중
+        with mock.patch("users.passwords._slots", slots), mock.patch("users.passwords.ACQUIRE_TIMEOUT", 0.01), \
+                mock.patch("users.passwords.check_password") as check:
+            res = self.client.post(LOGIN_URL, {"username": "login", "password": "pw1234"}, format="json")
+        assert res.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        check.assert_not_called()
+
+        slots.release()
+        with mock.patch("users.passwords._slots", slots):
+            res = self.client.post(LOGIN_URL, {"username": "login", "password": "pw1234"}, format="json")
+        assert res.status_code == status.HTTP_200_OK
+        assert slots.acquire(blocking=False)  # 계산이 끝나면 차례를 돌려줍니다.
+
+    def test_metrics_endpoint_is_admin_only(self):
+        admin = get_user_model().objects.create_superuser(username="admin", password="pw1234")
+        self.client.force_authenticate(user=self._create_user("argon2"))
+        assert self.client.get("/api/auth/metrics/login/").status_code == status.HTTP_403_FORBIDDEN
+
+        self.client.force_authenticate(user=admin)
+        res = self.client.get("/api/auth/metrics/login/")
+        assert res.status_code == status.HTTP_200_OK
+        assert res.json()["hasher"] == "argon2"
+
+
+class _StubProviderHandler(BaseHTTPRequestHandler):
+    """소셜 제공자 흉내를 내는 로컬 HTTP 서버 (keep-alive 지원)"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 타임아웃 테스트에서 클라이언트가 먼저 끊은 경우
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.split("?")[0]
+        server.hits[path] = server.hits.get(path, 0) + 1
+        server.connections.add(self.client_address)
+        if path == "/kakao":
+            self._send(200, {"id": 1, "kakao_account": {"email": "k@example.com", "profile": {"nickname": "카카오"}}})
+        elif path == "/naver":
+            self._send(200, {"response": {"id": "n1", "email": "n@example.com", "nickname": "네이버"}})
+        elif path == "/jwks":
+            self._send(200, {"keys": server.jwks}, headers={"Cache-Control": "public, max-age=300"})
+        elif path == "/tokeninfo":
+            self._send(200, {"sub": "g1", "aud": "client-1", "email": "g@example.com", "name": "구글",
+                             "exp": str(int(time.time()) + 600)})
+        elif path == "/flaky":
+            self._send(503 if server.hits[path] == 1 else 200, {"id": 2})
+        elif path == "/slow":
+            time.sleep(1)
+            self._send(200, {"id": 3})
+        else:
+            self._send(404, {})
+
+
+class SocialProviderClientTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = RSAAlgorithm.to_jwk(cls.private_key.public_key(), as_dict=True)
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubProviderHandler)
+        cls.server.jwks = [{**jwk, "kid": "k1", "alg": "RS256", "use": "sig"}]
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.settings_override = override_settings(SOCIAL_AUTH={
+            "KAKAO_PROFILE_URL": f"{base}/kakao",
+            "NAVER_PROFILE_URL": f"{base}/naver",
+            "GOOGLE_JWKS_URL": f"{base}/jwks",
+            "GOOGLE_TOKENINFO_URL": f"{base}/tokeninfo",
+            "GOOGLE_CLIENT_IDS": ["client-1"],
+            "CONNECT_TIMEOUT": 1, "READ_TIMEOUT": 0.3, "RETRIES": 1, "BACKOFF_FACTOR": 0,
+        })
+        cls.settings_override.enable()
+        cls.base = base
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        social_providers.reset_client()
+        super().tearDownClass()
+
+    def setUp(self):
+        social_providers.reset_client()
+        self.server.hits = {}
+        self.server.connections = set()
+
+    def _id_token(self, **claims):
+        now = int(time.time())
+        payload = {"iss": "https://accounts.google.com", "aud": "client-1", "sub": "g1", "email": "g@example.com",
+                   "name": "구글", "iat": now, "exp": now + 600, **claims}
+        return jwt.encode(payload, self.private_key, algorithm="RS256", headers={"kid": "k1"})
+
+    def test_profiles_share_one_keep_alive_connection(self):
+        assert social_providers.KakaoVerifier.get_profile("token")["name"] == "카카오"
+        assert social_providers.NaverVerifier.get_profile("token")["provider_user_id"] == "n1"
+        assert social_providers.KakaoVerifier.get_profile("token")["email"] == "k@example.com"
+        assert len(self.server.connections) == 1
+
+    def test_timeout_and_retry(self):
+        client = social_providers.get_client()
+        assert client.get_json(f"{self.base}/flaky") == {"id": 2}
+        assert self.server.hits["/flaky"] == 2
+
+        started = time.monotonic()
+        with self.assertRaises(social_providers.SocialAuthError):
+            client.get(f"{self.base}/slow")
+        assert time.monotonic() - started < 1.5  # 읽기 타임아웃 0.3s × (1 + 재시도 1회)
+
+    def test_google_id_token_is_verified_locally_with_cached_jwks(self):
+        profile = social_providers.GoogleVerifier.get_profile(self._id_token())
+        assert profile == {"provider": "google", "provider_user_id": "g1", "email": "g@example.com", "name": "구글"}
+        social_providers.GoogleVerifier.get_profile(self._id_token(sub="g2"))
+        assert self.server.hits == {"/jwks": 1}
+
+        for bad in (self._id_token(aud="other-app"), self._id_token(exp=int(time.time()) - 10),
+                    self._id_token(iss="https://evil.example.com")):
+            with self.assertRaises(social_providers.SocialAuthError):
+                social_providers.GoogleVerifier.get_profile(bad)
+
+        # 모르는 kid가 와도 최소 간격 안에서는 JWKS를 다시 받지 않습니다.
+        unknown = jwt.encode({"sub": "x"}, self.private_key, algorithm="RS256", headers={"kid": "k2"})
+        with self.assertRaises(social_providers.SocialAuthError):
+            social_providers.GoogleVerifier.get_profile(unknown)
+        assert self.server.hits == {"/jwks": 1}
+
+    def test_google_login_is_refused_without_client_ids(self):
+        with override_settings(SOCIAL_AUTH={**settings.SOCIAL_AUTH, "GOOGLE_CLIENT_IDS": []}):
+            for local in (True, False):
+                with mock.patch("users.social_providers._local_verification_available", return_value=local):
+                    with self.assertRaises(social_providers.SocialAuthError):
+                        social_providers.GoogleVerifier.get_profile(self._id_token())
+                    with self.assertRaises(social_providers.SocialAuthError):
+                        async_to_sync(social_providers.GoogleVerifier.aget_profile)(self._id_token())
+        assert self.server.hits == {}
+
+    def test_tokeninfo_fallback_is_cached(self):
+        with mock.patch("users.social_providers._local_verification_available", return_value=False):
+            for _ in range(2):
+                assert social_providers.GoogleVerifier.get_profile("opaque")["provider_user_id"] == "g1"
+        assert self.server.hits == {"/tokeninfo": 1}
+
+    def test_async_verifiers_follow_same_rules(self):
+        async def run():
+            client = social_providers.get_async_client()
+            assert (await social_providers.KakaoVerifier.aget_profile("token"))["name"] == "카카오"
+            assert (await social_providers.NaverVerifier.aget_profile("token"))["provider_user_id"] == "n1"
+            assert (await client.get_json(f"{self.base}/flaky")) == {"id": 2}
+            with self.assertRaises(social_providers.SocialAuthError):
+                await client.get(f"{self.base}/slow")
+
+            profile = await social_providers.GoogleVerifier.aget_profile(self._id_token())
+            assert profile["provider_user_id"] == "g1"
+            await social_providers.GoogleVerifier.aget_profile(self._id_token(sub="g2"))
+            with self.assertRaises(social_providers.SocialAuthError):
+                await social_providers.GoogleVerifier.aget_profile(self._id_token(aud="other-app"))
+            return client is social_providers.get_async_client()
+
+        assert async_to_sync(run)()
+        assert self.server.hits["/flaky"] == 2
+        assert self.server.hits["/jwks"] == 1
+        # 동기 경로와 JWKS 캐시를 함께 씁니다.
+        social_providers.GoogleVerifier.get_profile(self._id_token(sub="g3"))
+        assert self.server.hits["/jwks"] == 1
+
+
+class SocialLoginViewTests(TestCase):
+    URL = "/api/auth/social/{}/"
+    PROFILE = {"provider": "kakao", "provider_user_id": "123", "email": "k@example.com", "name": "카카오"}
+
+    def post(self, provider, payload):
+        return self.client.post(self.URL.format(provider), data=json.dumps(payload), content_type="application/json")
+
+    def test_first_login_creates_user_and_issues_tokens(self):
+        verify = mock.AsyncMock(return_value=self.PROFILE)
+        with mock.patch.object(social_providers.KakaoVerifier, "aget_profile", verify):
+            first = self.post("kakao", {"token": "kakao-access"})
+            second = self.post("kakao", {"token": "kakao-access"})
+
+        assert first.status_code == status.HTTP_201_CREATED and first.json()["created"] is True
+        assert second.status_code == status.HTTP_200_OK and second.json()["created"] is False
+        verify.assert_awaited_with("kakao-access")
+        user = get_user_model().objects.get(social_id="kakao:123")
+        assert (user.username, user.display_name, user.has_usable_password()) == ("kakao_123", "카카오", False)
+
+        refresh = RefreshToken(second.json()["refresh"])
+        assert str(refresh[api_settings.USER_ID_CLAIM]) == str(user.pk)
+        response = APIClient().get(BOOKMARKS_URL, HTTP_AUTHORIZATION=f"Bearer {second.json()['access']}")
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_taken_username_gets_a_suffix(self):
+        get_user_model().objects.create_user(username="kakao_123", password="pw1234")
+        with mock.patch.object(social_providers.KakaoVerifier, "aget_profile",
+                               mock.AsyncMock(return_value=self.PROFILE)):
+            first = self.post("kakao", {"token": "kakao-access"})
+            second = self.post("kakao", {"token": "kakao-access"})
+
+        assert first.status_code == status.HTTP_201_CREATED, first.content
+        assert second.status_code == status.HTTP_200_OK
+        user = get_user_model().objects.get(social_id="kakao:123")
+        assert user.username.startswith("kakao_123_") and len(user.username) <= 50
+        assert get_user_model().objects.get(username="kakao_123").social_id is None
+
+    def test_username_race_falls_through_to_next_candidate(self):
+        """exists() 확인 뒤 같은 username이 먼저 저장돼도 다음 후보로 만드는지 테스트"""
+        User = get_user_model()
+        real_insert = users_async_views._insert_user
+
+        def insert(user):
+            if user.username == "kakao_123":
+                User.objects.create_user(username="kakao_123", password="pw1234")
+            real_insert(user)
+
+        with mock.patch.object(users_async_views, "_insert_user", insert), \
+                mock.patch.object(social_providers.KakaoVerifier, "aget_profile",
+                                  mock.AsyncMock(return_value=self.PROFILE)):
+            response = self.post("kakao", {"token": "kakao-access"})
+        assert response.status_code == status.HTTP_201_CREATED, response.content
+        assert User.objects.get(social_id="kakao:123").username.startswith("kakao_123_")
+
+    def test_inactive_user_gets_no_tokens(self):
+        get_user_model().objects.create_user(username="kakao_123", password="pw1234", social_id="kakao:123")
+        with mock.patch.object(get_user_model(), "is_active", new_callable=mock.PropertyMock, return_value=False), \
+                mock.patch.object(social_providers.KakaoVerifier, "aget_profile",
+                                  mock.AsyncMock(return_value=self.PROFILE)):
+            response = self.post("kakao", {"token": "kakao-access"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert "refresh" not in response.json()
+
+    def test_rejected_token_and_bad_requests(self):
+        verify = mock.AsyncMock(side_effect=social_providers.SocialAuthError("invalid"))
+        with mock.patch.object(social_providers.NaverVerifier, "aget_profile", verify):
+            assert self.post("naver", {"token": "bad"}).status_code == status.HTTP_401_UNAUTHORIZED
+        assert self.post("naver", {}).status_code == status.HTTP_400_BAD_REQUEST
+        assert self.post("facebook", {"token": "x"}).status_code == status.HTTP_404_NOT_FOUND
+        assert self.client.get(self.URL.format("kakao")).status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+        assert not get_user_model().objects.filter(social_id__isnull=False).exists()
@@ -0,0 +1,20 @@
+# users/tokens.py
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from .blacklist import add_to_blacklist, is_blacklisted
+
+
+class RefreshToken(BaseRefreshToken):
+    """블랙리스트 확인/등록을 users/blacklist.py 의 블룸 필터 + 공유 캐시 계층으로 처리하는 refresh 토큰"""
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        add_to_blacklist(self.payload[api_settings.JTI_CLAIM], self.payload.get('exp'))
+        return result
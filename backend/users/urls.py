@@ -1,14 +1,16 @@
 # users/urls.py
 from django.urls import path
 from rest_framework_simplejwt.views import (
-    TokenObtainPairView,  # 로그인
     TokenRefreshView,     # 토큰 재발급
 )
-from .views import RegisterView, LogoutView
+from .views import RegisterView, LoginView, LoginMetricsView, LogoutView
+from .async_views import social_login
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
-    path("login/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("login/", LoginView.as_view(), name="token_obtain_pair"),  # 로그인 (단계별 시간 측정)
     path("refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("logout/", LogoutView.as_view(), name="logout"),
+    path("metrics/login/", LoginMetricsView.as_view(), name="login_metrics"),
+    path("social/<str:provider>/", social_login, name="social_login"),  # 비동기 뷰 (users/async_views.py)
 ]
@@ -4,7 +4,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from .serializers import RegisterSerializer
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from rest_framework_simplejwt.tokens import TokenError
+from .authentication import invalidate_cached_user
+from .tokens import RefreshToken
+from .metrics import login_metrics, server_timing_header
+from .passwords import ACQUIRE_TIMEOUT, MAX_CONCURRENT
+from django.contrib.auth.hashers import get_hasher
+from rest_framework_simplejwt.views import TokenObtainPairView
 
 
 User = get_user_model()
@@ -14,6 +20,33 @@ class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
 
+class LoginView(TokenObtainPairView):
+    """simplejwt 로그인 + 단계별 소요 시간(lookup/hash/token)을 Server-Timing 헤더로 노출"""
+
+    def post(self, request, *args, **kwargs):
+        response = super().post(request, *args, **kwargs)
+        timings = getattr(request, 'login_timings', None)
+        if timings:
+            response['Server-Timing'] = server_timing_header(timings)
+        return response
+
+
+class LoginMetricsView(APIView):
+    """
+    (관리자 전용) 이 워커의 로그인 단계별 소요 시간 집계
+    URL: /api/auth/metrics/login/
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'stages': login_metrics.snapshot(),
+            'hasher': get_hasher('default').algorithm,
+            'hash_concurrency_per_process': MAX_CONCURRENT,
+            'acquire_timeout_seconds': ACQUIRE_TIMEOUT,
+        })
+
+
 class LogoutView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -28,7 +61,8 @@ class LogoutView(APIView):
 
         try:
             token = RefreshToken(refresh_token)
-            token.blacklist()  # DB에 블랙리스트 등록
+            token.blacklist()  # DB + 블랙리스트 캐시에 등록 (users/blacklist.py)
+            invalidate_cached_user(request.user.pk)  # 워커별 인증 사용자 캐시도 비움
             return Response(status=status.HTTP_205_RESET_CONTENT)
         except TokenError:
             return Response({"detail": "유효하지 않은 토큰입니다."}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file